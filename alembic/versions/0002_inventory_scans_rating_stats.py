@@ -0,0 +1,81 @@
+"""inventory counters, scan devices, rating stats and listing indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 07:51:45.228232
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ticket_types', sa.Column('sold', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('tickets', sa.Column('scan_device_id', sa.String(length=100), nullable=True))
+    op.create_table('event_rating_stats',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('rating_count', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('score_1', sa.Integer(), nullable=False),
+    sa.Column('score_2', sa.Integer(), nullable=False),
+    sa.Column('score_3', sa.Integer(), nullable=False),
+    sa.Column('score_4', sa.Integer(), nullable=False),
+    sa.Column('score_5', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_index('ix_events_start_date_id', 'events', ['start_date', 'id'], unique=False)
+    op.create_index('ix_events_status_start_date', 'events', ['status', 'start_date'], unique=False)
+    op.create_index('ix_events_district_id_start_date', 'events', ['district_id', 'start_date'], unique=False)
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ix_events_fulltext', 'events', ['title', 'description', 'location_description'], unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ix_purchases_purchase_date_id', 'purchases', ['purchase_date', 'id'], unique=False)
+    op.create_index('ix_purchases_user_id_purchase_date_id', 'purchases', ['user_id', 'purchase_date', 'id'], unique=False)
+    op.create_index('ix_reports_created_at_id', 'reports', ['created_at', 'id'], unique=False)
+    op.create_index('ix_reports_user_id_created_at_id', 'reports', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_contact_us_created_at_id', 'contact_us', ['created_at', 'id'], unique=False)
+    op.create_index('ix_claims_created_at_id', 'claims', ['created_at', 'id'], unique=False)
+
+    # Backfill the counters from the rows written before they existed
+    op.execute(
+        "UPDATE ticket_types SET sold = ("
+        "SELECT COALESCE(SUM(purchase_details.quantity), 0) FROM purchase_details "
+        "WHERE purchase_details.ticket_type_id = ticket_types.id)"
+    )
+    op.execute(
+        "INSERT INTO event_rating_stats "
+        "(event_id, rating_count, rating_sum, score_1, score_2, score_3, score_4, score_5) "
+        "SELECT events.id, COUNT(ratings.id), COALESCE(SUM(ratings.score), 0), "
+        + ", ".join(f"COALESCE(SUM(CASE WHEN ratings.score = {score} THEN 1 ELSE 0 END), 0)" for score in range(1, 6))
+        + " FROM events LEFT OUTER JOIN ratings ON ratings.event_id = events.id GROUP BY events.id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_claims_created_at_id', table_name='claims')
+    op.drop_index('ix_contact_us_created_at_id', table_name='contact_us')
+    op.drop_index('ix_reports_user_id_created_at_id', table_name='reports')
+    op.drop_index('ix_reports_created_at_id', table_name='reports')
+    op.drop_index('ix_purchases_user_id_purchase_date_id', table_name='purchases')
+    op.drop_index('ix_purchases_purchase_date_id', table_name='purchases')
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ix_events_fulltext', table_name='events')
+    op.drop_index('ix_events_district_id_start_date', table_name='events')
+    op.drop_index('ix_events_status_start_date', table_name='events')
+    op.drop_index('ix_events_start_date_id', table_name='events')
+    op.drop_table('event_rating_stats')
+    with op.batch_alter_table('tickets') as batch_op:
+        batch_op.drop_column('scan_device_id')
+    with op.batch_alter_table('ticket_types') as batch_op:
+        batch_op.drop_column('sold')
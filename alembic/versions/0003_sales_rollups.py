@@ -0,0 +1,89 @@
+"""sales rollups for the organizer dashboard
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 08:01:40.282021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ticket_types', sa.Column('revenue', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+    op.create_table('event_sales_stats',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('organizer_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('purchases', sa.Integer(), nullable=False),
+    sa.Column('tickets_sold', sa.Integer(), nullable=False),
+    sa.Column('tickets_issued', sa.Integer(), nullable=False),
+    sa.Column('tickets_scanned', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['organizer_id'], ['organizers.id'], ),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_index(op.f('ix_event_sales_stats_organizer_id'), 'event_sales_stats', ['organizer_id'], unique=False)
+    op.create_table('event_sales_daily',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('organizer_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('purchases', sa.Integer(), nullable=False),
+    sa.Column('tickets_sold', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['organizer_id'], ['organizers.id'], ),
+    sa.PrimaryKeyConstraint('event_id', 'day')
+    )
+    op.create_index('ix_event_sales_daily_organizer_id_day', 'event_sales_daily', ['organizer_id', 'day'], unique=False)
+
+    # Backfill the rollups from the purchases and tickets written before they existed
+    op.execute(
+        "UPDATE ticket_types SET revenue = ("
+        "SELECT COALESCE(SUM(purchase_details.subtotal), 0) FROM purchase_details "
+        "WHERE purchase_details.ticket_type_id = ticket_types.id)"
+    )
+    op.execute(
+        "INSERT INTO event_sales_stats "
+        "(event_id, organizer_id, revenue, purchases, tickets_sold, tickets_issued, tickets_scanned) "
+        "SELECT events.id, events.organizer_id, "
+        "COALESCE((SELECT SUM(purchase_details.subtotal) FROM purchases JOIN purchase_details "
+        "ON purchase_details.purchase_id = purchases.id WHERE purchases.event_id = events.id), 0), "
+        "(SELECT COUNT(purchases.id) FROM purchases WHERE purchases.event_id = events.id), "
+        "COALESCE((SELECT SUM(purchase_details.quantity) FROM purchases JOIN purchase_details "
+        "ON purchase_details.purchase_id = purchases.id WHERE purchases.event_id = events.id), 0), "
+        "(SELECT COUNT(tickets.id) FROM purchases JOIN tickets "
+        "ON tickets.purchase_id = purchases.id WHERE purchases.event_id = events.id), "
+        "(SELECT COUNT(tickets.id) FROM purchases JOIN tickets "
+        "ON tickets.purchase_id = purchases.id WHERE purchases.event_id = events.id AND tickets.status = 'used') "
+        "FROM events"
+    )
+    op.execute(
+        "INSERT INTO event_sales_daily (event_id, day, organizer_id, revenue, purchases, tickets_sold) "
+        "SELECT purchases.event_id, DATE(purchases.purchase_date), events.organizer_id, "
+        "COALESCE(SUM(purchase_details.subtotal), 0), COUNT(DISTINCT purchases.id), "
+        "COALESCE(SUM(purchase_details.quantity), 0) "
+        "FROM purchases JOIN events ON events.id = purchases.event_id "
+        "LEFT OUTER JOIN purchase_details ON purchase_details.purchase_id = purchases.id "
+        "GROUP BY purchases.event_id, DATE(purchases.purchase_date), events.organizer_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_sales_daily_organizer_id_day', table_name='event_sales_daily')
+    op.drop_table('event_sales_daily')
+    op.drop_index(op.f('ix_event_sales_stats_organizer_id'), table_name='event_sales_stats')
+    op.drop_table('event_sales_stats')
+    with op.batch_alter_table('ticket_types') as batch_op:
+        batch_op.drop_column('revenue')
@@ -0,0 +1,49 @@
+"""per-minute check-in history
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 08:07:27.653343
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('checkin_minutes',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('minute', sa.DateTime(), nullable=False),
+    sa.Column('verifier_id', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['verifier_id'], ['verifiers.id'], ),
+    sa.PrimaryKeyConstraint('event_id', 'minute', 'verifier_id')
+    )
+
+    # Backfill the history from the tickets scanned before it existed
+    if op.get_bind().dialect.name == 'mysql':
+        minute = "DATE_FORMAT(tickets.used_at, '%Y-%m-%d %H:%i:00')"
+    else:
+        minute = "strftime('%Y-%m-%d %H:%M:00', tickets.used_at)"
+    op.execute(
+        "INSERT INTO checkin_minutes (event_id, minute, verifier_id, entries) "
+        f"SELECT purchases.event_id, {minute}, tickets.verifier_id, COUNT(tickets.id) "
+        "FROM tickets JOIN purchases ON purchases.id = tickets.purchase_id "
+        "WHERE tickets.status = 'used' AND tickets.used_at IS NOT NULL AND tickets.verifier_id IS NOT NULL "
+        f"GROUP BY purchases.event_id, {minute}, tickets.verifier_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('checkin_minutes')
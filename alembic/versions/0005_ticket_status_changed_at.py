@@ -0,0 +1,30 @@
+"""ticket status change time for delta manifests
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 10:12:04.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tickets', sa.Column('status_changed_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_tickets_status_changed_at', 'tickets', ['status_changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tickets_status_changed_at', table_name='tickets')
+    op.drop_column('tickets', 'status_changed_at')
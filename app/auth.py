@@ -1,28 +1,63 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from app.database import get_db, get_async_db
 from app.models import User
 from app.config import settings
+from app.cache import TTLCache
+from app.hashing import HashingPool, HashingPoolFull, hash_password, verify
+from app import schemas
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def hashing_queue_size() -> int:
+    """Backlog of the hashing pool, kept below the DB pool.
+
+    Every login still checks out a connection for its user lookup; with more
+    logins in flight than connections, they would queue on the DB pool (and
+    starve other requests) before the hashing pool could fail fast with 503.
+    """
+    connections = settings.db_pool_size + settings.db_max_overflow
+    return max(min(settings.password_hash_queue_size, connections - settings.password_hash_workers), 0)
+
+# Password hashing runs on a dedicated process pool (see app.hashing)
+hashing_pool = HashingPool(
+    workers=settings.password_hash_workers,
+    queue_size=hashing_queue_size(),
+)
 
 # JWT Security
 security = HTTPBearer()
 
+# Resolved principals keyed by token subject (email). Token signature and
+# expiry are still checked on every request; only the user lookup is cached.
+principal_cache = TTLCache(
+    max_entries=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+def _run_hashing(fn, *args):
+    try:
+        return hashing_pool.run(fn, *args)
+    except HashingPoolFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _run_hashing(verify, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _run_hashing(hash_password, password)
 
 def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+    user = db.execute(select(User.id, User.email, User.password).where(User.email == email)).first()
+    # Give the connection back to the pool before the slow bcrypt check
+    db.rollback()
     if not user:
         return False
     if not verify_password(password, user.password):
@@ -39,35 +74,96 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    # A new instance per raise: a shared one would carry one request's traceback into the next
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _token_subject(credentials: HTTPAuthorizationCredentials) -> str:
     try:
         token = credentials.credentials
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise credentials_exception()
     except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+        raise credentials_exception()
+    return email
+
+def _principal_statement(email: str):
+    return (
+        select(User)
+        .options(joinedload(User.role), joinedload(User.organizer), joinedload(User.verifier))
+        .where(User.email == email)
+    )
+
+def _principal_from_user(user: Optional[User]) -> Optional[schemas.Principal]:
     if user is None:
-        raise credentials_exception
-    return user
+        return None
+    return schemas.Principal.model_validate(user).model_copy(update={
+        "organizer_id": user.organizer.id if user.organizer else None,
+        "verifier_id": user.verifier.id if user.verifier else None,
+    })
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+def load_principal(db: Session, email: str) -> Optional[schemas.Principal]:
+    return _principal_from_user(db.scalars(_principal_statement(email)).first())
+
+async def load_principal_async(db, email: str) -> Optional[schemas.Principal]:
+    return _principal_from_user((await db.scalars(_principal_statement(email))).first())
+
+# Plain `def` dependencies: FastAPI runs them in the threadpool, so the
+# blocking user lookup never stalls the event loop.
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    email = _token_subject(credentials)
+    principal = principal_cache.get(email)
+    if principal is None:
+        generation = principal_cache.generation
+        principal = load_principal(db, email)
+        if principal is None:
+            raise credentials_exception()
+        principal_cache.set(email, principal, generation)
+    return principal
+
+# Async counterpart for the async routers (Settings.use_async_db)
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db = Depends(get_async_db)
+):
+    email = _token_subject(credentials)
+    principal = principal_cache.get(email)
+    if principal is None:
+        generation = principal_cache.generation
+        principal = await load_principal_async(db, email)
+        if principal is None:
+            raise credentials_exception()
+        principal_cache.set(email, principal, generation)
+    return principal
+
+def invalidate_principal(user_id: int):
+    """Drop the cached principal of a user whose profile, role or staff links changed"""
+    principal_cache.discard_where(lambda principal: principal.id == user_id)
+
+def get_current_active_user(current_user: schemas.Principal = Depends(get_current_user)):
     return current_user
 
 def require_role(required_roles: list):
-    def role_checker(current_user: User = Depends(get_current_active_user)):
+    def role_checker(current_user: schemas.Principal = Depends(get_current_active_user)):
+        if current_user.role.name not in required_roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        return current_user
+    return role_checker
+
+def require_role_async(required_roles: list):
+    async def role_checker(current_user: schemas.Principal = Depends(get_current_user_async)):
         if current_user.role.name not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -77,14 +173,17 @@ def require_role(required_roles: list):
     return role_checker
 
 # Role-specific dependencies
-def get_admin_user(current_user: User = Depends(require_role(["Administrador"]))):
+def get_admin_user(current_user: schemas.Principal = Depends(require_role(["Administrador"]))):
+    return current_user
+
+def get_organizer_user(current_user: schemas.Principal = Depends(require_role(["Organizador de Eventos"]))):
     return current_user
 
-def get_organizer_user(current_user: User = Depends(require_role(["Organizador de Eventos"]))):
+def get_buyer_user(current_user: schemas.Principal = Depends(require_role(["Comprador / Asistente"]))):
     return current_user
 
-def get_buyer_user(current_user: User = Depends(require_role(["Comprador / Asistente"]))):
+def get_verifier_user(current_user: schemas.Principal = Depends(require_role(["Verificador / Validador de Entrada"]))):
     return current_user
 
-def get_verifier_user(current_user: User = Depends(require_role(["Verificador / Validador de Entrada"]))):
+async def get_verifier_user_async(current_user: schemas.Principal = Depends(require_role_async(["Verificador / Validador de Entrada"]))):
     return current_user
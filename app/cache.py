@@ -0,0 +1,122 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+class ReferenceDataCache:
+    """Process-local cache of rarely changing reference data.
+
+    Entries are stored as pre-serialized JSON bytes together with a strong
+    ETag, so a hit costs neither a query nor a serialization pass and a
+    matching If-None-Match is answered with 304.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: Dict[Hashable, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable, adapter: TypeAdapter) -> Tuple[bytes, str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            version = self.version
+        body = adapter.dump_json(adapter.validate_python(loader(), from_attributes=True))
+        entry = (body, '"%d-%s"' % (version, hashlib.sha1(body).hexdigest()))
+        with self._lock:
+            # Drop the entry if an invalidation raced with the load
+            if version == self.version and len(self._entries) < self.max_entries:
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self, *names: str):
+        """Drop cached entries whose key (or key prefix) is in `names`, or everything"""
+        with self._lock:
+            self.version += 1
+            if not names:
+                self._entries.clear()
+                return
+            for key in list(self._entries):
+                name = key[0] if isinstance(key, tuple) else key
+                if name in names:
+                    del self._entries[key]
+
+    def respond(self, request: Request, key: Hashable, loader: Callable, adapter: TypeAdapter) -> Response:
+        body, etag = self.get(key, loader, adapter)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+reference_cache = ReferenceDataCache()
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries also expire after `ttl` seconds.
+
+    Every invalidation bumps `generation`; loaders pass the generation they
+    started from to `set`, so a value loaded before an invalidation is never
+    stored after it.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]):
+        with self._lock:
+            self.generation += 1
+            for key in [key for key, (_, value) in self._entries.items() if predicate(value)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
@@ -0,0 +1,254 @@
+"""Live check-in analytics: entries per minute per event and per verifier.
+
+Accepted scans are counted in a ring buffer of per-minute buckets for every
+event x verifier pair, so recording a scan is O(1) and never touches the
+database. A background thread flushes the counts to `checkin_minutes`,
+adding to the rows of other workers, so the history survives restarts and
+covers every uvicorn worker; reads combine that history with this worker's
+not yet flushed counts.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from app import models
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Minutes used for the current entry rate and to rank verifiers
+RECENT_MINUTES = 5
+
+def epoch_seconds(moment: datetime) -> float:
+    """Naive datetimes are UTC, like the rest of the API"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def minute_start(minute: int) -> datetime:
+    return datetime.utcfromtimestamp(minute * 60)
+
+class GateCounter:
+    """Ring buffer of per-minute entry counts for one event x verifier"""
+    __slots__ = ("minutes", "counts", "flushed", "last_scan", "sync_lag")
+
+    def __init__(self, size: int):
+        self.minutes = [-1] * size
+        self.counts = [0] * size
+        self.flushed = [0] * size
+        self.last_scan = 0.0
+        self.sync_lag = 0.0
+
+class CheckInMonitor:
+    def __init__(self, window_minutes: int = 60, flush_seconds: float = 30):
+        self.window_minutes = window_minutes
+        self.flush_seconds = flush_seconds
+        self._gates: Dict[Tuple[int, int], GateCounter] = {}
+        # Counts that fell out of (or arrived older than) the ring before being flushed
+        self._overflow: Dict[Tuple[int, int, int], int] = {}
+        # Counts taken by a flush that has not committed yet; still shown by snapshot()
+        self._in_flight: Dict[Tuple[int, int, int], int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, event_id: int, verifier_id: int, scanned_at: Optional[float] = None, now: Optional[float] = None):
+        """Count one entry admitted by a verifier; `scanned_at` for uploads of offline scans"""
+        now = time.time() if now is None else now
+        scanned_at = now if scanned_at is None else min(scanned_at, now)
+        minute = int(scanned_at // 60)
+        size = self.window_minutes
+        with self._lock:
+            gate = self._gates.get((event_id, verifier_id))
+            if gate is None:
+                gate = self._gates[(event_id, verifier_id)] = GateCounter(size)
+            gate.last_scan = max(gate.last_scan, scanned_at)
+            gate.sync_lag = now - scanned_at
+            if minute <= int(now // 60) - size:
+                key = (event_id, verifier_id, minute)
+                self._overflow[key] = self._overflow.get(key, 0) + 1
+                return
+            slot = minute % size
+            if gate.minutes[slot] != minute:
+                if gate.minutes[slot] > minute:
+                    # The slot already holds a newer minute
+                    key = (event_id, verifier_id, minute)
+                    self._overflow[key] = self._overflow.get(key, 0) + 1
+                    return
+                self._evict(event_id, verifier_id, gate, slot)
+                gate.minutes[slot] = minute
+            gate.counts[slot] += 1
+
+    def _evict(self, event_id: int, verifier_id: int, gate: GateCounter, slot: int):
+        pending = gate.counts[slot] - gate.flushed[slot]
+        if pending:
+            key = (event_id, verifier_id, gate.minutes[slot])
+            self._overflow[key] = self._overflow.get(key, 0) + pending
+        gate.counts[slot] = gate.flushed[slot] = 0
+
+    def pending(self) -> Dict[Tuple[int, int, int], int]:
+        """Take the counts not yet written out, as (event_id, verifier_id, minute) -> entries"""
+        with self._lock:
+            deltas, self._overflow = self._overflow, {}
+            stale = int(time.time() // 60) - self.window_minutes
+            for (event_id, verifier_id), gate in list(self._gates.items()):
+                for slot, minute in enumerate(gate.minutes):
+                    delta = gate.counts[slot] - gate.flushed[slot]
+                    if delta:
+                        key = (event_id, verifier_id, minute)
+                        deltas[key] = deltas.get(key, 0) + delta
+                        gate.flushed[slot] = gate.counts[slot]
+                if max(gate.minutes) <= stale:
+                    del self._gates[(event_id, verifier_id)]
+            self._in_flight = deltas
+        return deltas
+
+    def _settle(self, failed: bool):
+        with self._lock:
+            if failed:
+                # Put the counts back so the next flush retries them
+                for key, count in self._in_flight.items():
+                    self._overflow[key] = self._overflow.get(key, 0) + count
+            self._in_flight = {}
+
+    def flush(self, db: Session) -> int:
+        """Add the pending counts to checkin_minutes; returns the rows written"""
+        deltas = self.pending()
+        if not deltas:
+            return 0
+        try:
+            for (event_id, verifier_id, minute), entries in deltas.items():
+                _add_minute(db, event_id, verifier_id, minute_start(minute), entries)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            self._settle(failed=True)
+            raise
+        self._settle(failed=False)
+        return len(deltas)
+
+    def snapshot(self, event_id: int):
+        """This worker's unflushed counts and gate state for one event"""
+        with self._lock:
+            unflushed: Dict[Tuple[int, int], int] = {}
+            for (gate_event_id, verifier_id, minute), count in [*self._overflow.items(), *self._in_flight.items()]:
+                if gate_event_id == event_id:
+                    unflushed[(verifier_id, minute)] = unflushed.get((verifier_id, minute), 0) + count
+            gates = {}
+            for (gate_event_id, verifier_id), gate in self._gates.items():
+                if gate_event_id != event_id:
+                    continue
+                gates[verifier_id] = (gate.last_scan, gate.sync_lag)
+                for slot, minute in enumerate(gate.minutes):
+                    delta = gate.counts[slot] - gate.flushed[slot]
+                    if delta:
+                        unflushed[(verifier_id, minute)] = unflushed.get((verifier_id, minute), 0) + delta
+        return unflushed, gates
+
+    def start(self, session_factory):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(session_factory,), name="checkin-flush", daemon=True)
+        self._thread.start()
+
+    def shutdown(self, session_factory=None):
+        """Stop the flush thread, then write out what is left"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if session_factory is not None:
+            self._flush_with(session_factory)
+
+    def _run(self, session_factory):
+        while not self._stop.wait(self.flush_seconds):
+            self._flush_with(session_factory)
+
+    def _flush_with(self, session_factory):
+        db = session_factory()
+        try:
+            self.flush(db)
+        except SQLAlchemyError:
+            logger.exception("Check-in flush failed; will retry")
+        finally:
+            db.close()
+
+def _add_minute(db: Session, event_id: int, verifier_id: int, minute: datetime, entries: int):
+    history = models.CheckInMinute
+    add = (
+        update(history)
+        .where(history.event_id == event_id, history.verifier_id == verifier_id, history.minute == minute)
+        .values(entries=history.entries + entries)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(add).rowcount:
+        return
+    # Another worker may create the minute's row first
+    try:
+        with db.begin_nested():
+            db.execute(insert(history).values(event_id=event_id, verifier_id=verifier_id, minute=minute, entries=entries))
+    except IntegrityError:
+        db.execute(add)
+
+def event_checkins(db: Session, event_id: int, minutes: int, monitor: CheckInMonitor, now: Optional[float] = None) -> dict:
+    """Entries per minute of an event and of each of its verifiers over the last `minutes` minutes"""
+    now = time.time() if now is None else now
+    current = int(now // 60)
+    first = current - minutes + 1
+    history = models.CheckInMinute
+    counts: Dict[Tuple[int, int], int] = {}
+    for verifier_id, minute, entries in db.execute(
+        select(history.verifier_id, history.minute, history.entries)
+        .where(history.event_id == event_id, history.minute >= minute_start(first))
+    ):
+        key = (verifier_id, int(epoch_seconds(minute) // 60))
+        counts[key] = counts.get(key, 0) + entries
+    unflushed, gates = monitor.snapshot(event_id)
+    for key, count in unflushed.items():
+        counts[key] = counts.get(key, 0) + count
+
+    per_verifier: Dict[int, List[int]] = {verifier_id: [0] * minutes for verifier_id in gates}
+    for (verifier_id, minute), entries in counts.items():
+        if first <= minute <= current:
+            per_verifier.setdefault(verifier_id, [0] * minutes)[minute - first] += entries
+    last_minutes = {}
+    for (verifier_id, minute), entries in counts.items():
+        if entries and last_minutes.get(verifier_id, -1) < minute <= current:
+            last_minutes[verifier_id] = minute
+
+    recent = min(RECENT_MINUTES, minutes)
+    verifiers = []
+    for verifier_id, series in per_verifier.items():
+        last_scan, sync_lag = gates.get(verifier_id, (0.0, 0.0))
+        if verifier_id in last_minutes:
+            # Another worker (or an earlier process) may have seen a later scan
+            last_scan = max(last_scan, last_minutes[verifier_id] * 60)
+        verifiers.append({
+            "verifier_id": verifier_id,
+            "entries": sum(series),
+            "entries_per_minute": series,
+            "current_rate": round(sum(series[-recent:]) / recent, 2),
+            "last_scan_at": datetime.utcfromtimestamp(last_scan) if last_scan else None,
+            "idle_seconds": round(now - last_scan, 1) if last_scan else None,
+            "sync_lag_seconds": round(sync_lag, 1),
+        })
+    verifiers.sort(key=lambda verifier: (verifier["current_rate"], verifier["entries"]))
+
+    totals = [sum(column) for column in zip(*(verifier["entries_per_minute"] for verifier in verifiers))] or [0] * minutes
+    return {
+        "event_id": event_id,
+        "window_minutes": minutes,
+        "first_minute": minute_start(first),
+        "entries": sum(totals),
+        "entries_per_minute": totals,
+        "current_rate": round(sum(totals[-recent:]) / recent, 2),
+        "slowest_verifier_id": verifiers[0]["verifier_id"] if len(verifiers) > 1 else None,
+        "verifiers": verifiers,
+    }
+
+monitor = CheckInMonitor(settings.checkin_window_minutes, settings.checkin_flush_seconds)
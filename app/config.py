@@ -7,6 +7,22 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     environment: str = "development"
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 300
+    db_pool_pre_ping: bool = True
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: int = 60
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 16
+    fast_serialization: bool = False
+    checkin_window_minutes: int = 60
+    checkin_flush_seconds: float = 30
+    query_debug: bool = False
+    n_plus_one_threshold: int = 3
+    use_async_db: bool = False
+    async_database_url: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -1,20 +1,68 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Date, and_, bindparam, case, delete, func, insert, select, update
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
-from app import models, schemas
-from app.auth import get_password_hash
+from datetime import datetime, timedelta, timezone
+from app import checkin, models, schemas, search
+from app.auth import get_password_hash, invalidate_principal
+from app.pagination import paginate
 import secrets
-import string
+
+# Eager-loading strategies matching the nested response schemas, so that
+# serializing a list never lazy-loads relationships row by row.
+USER_WITH_ROLE = (joinedload(models.User.role),)
+PROVINCE_WITH_DEPARTMENT = (joinedload(models.Province.department),)
+ORGANIZER_WITH_USER = (joinedload(models.Organizer.user),)
+VERIFIER_WITH_DETAILS = (
+    joinedload(models.Verifier.user),
+    joinedload(models.Verifier.organizer),
+)
+EVENT_WITH_DETAILS = (
+    joinedload(models.Event.district),
+    joinedload(models.Event.category),
+    joinedload(models.Event.organizer),
+    selectinload(models.Event.rating_stats),
+)
+PURCHASE_WITH_DETAILS = (
+    joinedload(models.Purchase.event),
+    joinedload(models.Purchase.user),
+)
+PURCHASE_WITH_TICKETS = (
+    selectinload(models.Purchase.details),
+    selectinload(models.Purchase.tickets),
+)
+REPORT_WITH_USER = (joinedload(models.Report.user),)
+FAVORITE_WITH_EVENT = (joinedload(models.Favorite.event),)
+RATING_WITH_DETAILS = (
+    joinedload(models.Rating.user),
+    joinedload(models.Rating.event),
+)
+CLAIM_WITH_DISTRICT = (
+    joinedload(models.Claim.district)
+    .joinedload(models.District.province)
+    .joinedload(models.Province.department),
+)
+
+# Stable (sort_key, id) orderings used for keyset pagination of list endpoints
+USER_ORDER = (models.User.id,)
+EVENT_ORDER = (models.Event.start_date, models.Event.id)
+PURCHASE_ORDER = (models.Purchase.purchase_date, models.Purchase.id)
+TICKET_ORDER = (models.Ticket.id,)
+REPORT_ORDER = (models.Report.created_at, models.Report.id)
+CONTACT_US_ORDER = (models.ContactUs.created_at, models.ContactUs.id)
+CLAIM_ORDER = (models.Claim.created_at, models.Claim.id)
 
 # User CRUD
 def get_user(db: Session, user_id: int):
-    return db.query(models.User).filter(models.User.id == user_id).first()
+    return db.query(models.User).options(*USER_WITH_ROLE).filter(models.User.id == user_id).first()
 
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.User).options(*USER_WITH_ROLE)
+    return paginate(query, USER_ORDER, skip=skip, limit=limit, cursor=cursor).all()
 
 def create_user(db: Session, user: schemas.UserCreate):
     hashed_password = get_password_hash(user.password)
@@ -41,6 +89,7 @@ def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate):
             setattr(db_user, field, value)
         db.commit()
         db.refresh(db_user)
+        invalidate_principal(user_id)
     return db_user
 
 # Role CRUD
@@ -62,7 +111,7 @@ def get_departments(db: Session):
     return db.query(models.Department).all()
 
 def get_provinces(db: Session, department_id: Optional[int] = None):
-    query = db.query(models.Province)
+    query = db.query(models.Province).options(*PROVINCE_WITH_DEPARTMENT)
     if department_id:
         query = query.filter(models.Province.department_id == department_id)
     return query.all()
@@ -75,19 +124,20 @@ def get_districts(db: Session, province_id: Optional[int] = None):
 
 # Organizer CRUD
 def get_organizer(db: Session, organizer_id: int):
-    return db.query(models.Organizer).filter(models.Organizer.id == organizer_id).first()
+    return db.query(models.Organizer).options(*ORGANIZER_WITH_USER).filter(models.Organizer.id == organizer_id).first()
 
 def get_organizer_by_user(db: Session, user_id: int):
     return db.query(models.Organizer).filter(models.Organizer.user_id == user_id).first()
 
 def get_organizers(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Organizer).offset(skip).limit(limit).all()
+    return db.query(models.Organizer).options(*ORGANIZER_WITH_USER).offset(skip).limit(limit).all()
 
 def create_organizer(db: Session, organizer: schemas.OrganizerCreate):
     db_organizer = models.Organizer(**organizer.dict())
     db.add(db_organizer)
     db.commit()
     db.refresh(db_organizer)
+    invalidate_principal(db_organizer.user_id)
     return db_organizer
 
 def update_organizer(db: Session, organizer_id: int, organizer_update: schemas.OrganizerUpdate):
@@ -102,19 +152,20 @@ def update_organizer(db: Session, organizer_id: int, organizer_update: schemas.O
 
 # Verifier CRUD
 def get_verifier(db: Session, verifier_id: int):
-    return db.query(models.Verifier).filter(models.Verifier.id == verifier_id).first()
+    return db.query(models.Verifier).options(*VERIFIER_WITH_DETAILS).filter(models.Verifier.id == verifier_id).first()
 
 def get_verifier_by_user(db: Session, user_id: int):
     return db.query(models.Verifier).filter(models.Verifier.user_id == user_id).first()
 
 def get_verifiers(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Verifier).offset(skip).limit(limit).all()
+    return db.query(models.Verifier).options(*VERIFIER_WITH_DETAILS).offset(skip).limit(limit).all()
 
 def create_verifier(db: Session, verifier: schemas.VerifierCreate):
     db_verifier = models.Verifier(**verifier.dict())
     db.add(db_verifier)
     db.commit()
     db.refresh(db_verifier)
+    invalidate_principal(db_verifier.user_id)
     return db_verifier
 
 def update_verifier(db: Session, verifier_id: int, verifier_update: schemas.VerifierUpdate):
@@ -129,21 +180,69 @@ def update_verifier(db: Session, verifier_id: int, verifier_update: schemas.Veri
 
 # Event CRUD
 def get_event(db: Session, event_id: int):
-    return db.query(models.Event).filter(models.Event.id == event_id).first()
-
-def get_events(db: Session, skip: int = 0, limit: int = 100, category_id: Optional[int] = None, organizer_id: Optional[int] = None):
-    query = db.query(models.Event)
+    return db.query(models.Event).options(*EVENT_WITH_DETAILS).filter(models.Event.id == event_id).first()
+
+def filter_events(
+    query,
+    category_id: Optional[int] = None,
+    organizer_id: Optional[int] = None,
+    status: Optional[str] = None,
+    district_id: Optional[int] = None,
+    province_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    end_from: Optional[datetime] = None,
+    end_to: Optional[datetime] = None,
+):
+    """Apply the event listing filters to a select over events"""
     if category_id:
         query = query.filter(models.Event.category_id == category_id)
     if organizer_id:
         query = query.filter(models.Event.organizer_id == organizer_id)
-    return query.offset(skip).limit(limit).all()
+    if status:
+        query = query.filter(models.Event.status == status)
+    if district_id:
+        query = query.filter(models.Event.district_id == district_id)
+    # Province/department roll up to their districts, so the district index still applies
+    if province_id:
+        query = query.filter(models.Event.district_id.in_(
+            select(models.District.id).where(models.District.province_id == province_id)
+        ))
+    if department_id:
+        query = query.filter(models.Event.district_id.in_(
+            select(models.District.id)
+            .join(models.Province, models.District.province_id == models.Province.id)
+            .where(models.Province.department_id == department_id)
+        ))
+    if start_from:
+        query = query.filter(models.Event.start_date >= start_from)
+    if start_to:
+        query = query.filter(models.Event.start_date < start_to)
+    if end_from:
+        query = query.filter(models.Event.end_date >= end_from)
+    if end_to:
+        query = query.filter(models.Event.end_date < end_to)
+    return query
+
+def select_events(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, **filters):
+    """Build the event listing statement; shared by the sync and async crud"""
+    query = filter_events(select(models.Event).options(*EVENT_WITH_DETAILS), **filters)
+    return paginate(query, EVENT_ORDER, skip=skip, limit=limit, cursor=cursor)
+
+def get_events(db: Session, **filters):
+    return db.scalars(select_events(**filters)).all()
 
 def create_event(db: Session, event: schemas.EventCreate):
-    db_event = models.Event(**event.dict())
+    db_event = models.Event(
+        **event.dict(),
+        rating_stats=models.EventRatingStats(),
+        sales_stats=models.EventSalesStats(organizer_id=event.organizer_id),
+    )
     db.add(db_event)
     db.commit()
     db.refresh(db_event)
+    search.event_index.add(db_event)
     return db_event
 
 def update_event(db: Session, event_id: int, event_update: schemas.EventUpdate):
@@ -154,6 +253,7 @@ def update_event(db: Session, event_id: int, event_update: schemas.EventUpdate):
             setattr(db_event, field, value)
         db.commit()
         db.refresh(db_event)
+        search.event_index.add(db_event)
     return db_event
 
 def delete_event(db: Session, event_id: int):
@@ -161,8 +261,57 @@ def delete_event(db: Session, event_id: int):
     if db_event:
         db.delete(db_event)
         db.commit()
+        search.event_index.remove(event_id)
     return db_event
 
+def _search_events_fulltext(db: Session, q: str, category_id: Optional[int], district_id: Optional[int], date: Optional[str], skip: int, limit: int):
+    score = match(
+        models.Event.title, models.Event.description, models.Event.location_description,
+        against=q,
+    ).in_natural_language_mode()
+    bucket = case(
+        *[(models.Event.start_date < bound, name) for name, bound in search.date_bucket_bounds()],
+        else_="later",
+    )
+    conditions = [score > 0]
+    if category_id:
+        conditions.append(models.Event.category_id == category_id)
+    if district_id:
+        conditions.append(models.Event.district_id == district_id)
+    if date:
+        conditions.append(bucket == date)
+
+    def facet(column):
+        return dict(db.execute(select(column, func.count()).where(*conditions).group_by(column)).all())
+
+    facets = {
+        "categories": facet(models.Event.category_id),
+        "districts": facet(models.Event.district_id),
+        "dates": facet(bucket),
+    }
+    ranked = db.execute(
+        select(models.Event.id, score).where(*conditions)
+        .order_by(score.desc(), models.Event.id).offset(skip).limit(limit)
+    ).all()
+    return sum(facets["categories"].values()), [(row[0], float(row[1])) for row in ranked], facets
+
+def search_events(db: Session, q: str, category_id: Optional[int] = None, district_id: Optional[int] = None, date: Optional[str] = None, skip: int = 0, limit: int = 20):
+    """Rank events by relevance to `q`, returning (total, [(event, score)], facets)"""
+    if db.get_bind().dialect.name == "mysql":
+        total, ranked, facets = _search_events_fulltext(db, q, category_id, district_id, date, skip, limit)
+    else:
+        search.event_index.ensure_loaded(db)
+        total, ranked, facets = search.event_index.search(
+            q, category_id=category_id, district_id=district_id, date=date, skip=skip, limit=limit
+        )
+    events = {
+        db_event.id: db_event
+        for db_event in db.query(models.Event).options(*EVENT_WITH_DETAILS)
+        .filter(models.Event.id.in_([event_id for event_id, _ in ranked]))
+    }
+    hits = [(events[event_id], score) for event_id, score in ranked if event_id in events]
+    return total, hits, facets
+
 # EventVerifier CRUD
 def get_event_verifiers(db: Session, event_id: Optional[int] = None, verifier_id: Optional[int] = None):
     query = db.query(models.EventVerifier)
@@ -204,14 +353,44 @@ def create_ticket_type(db: Session, ticket_type: schemas.TicketTypeCreate):
     return db_ticket_type
 
 def update_ticket_type(db: Session, ticket_type_id: int, ticket_type_update: schemas.TicketTypeUpdate):
-    db_ticket_type = db.query(models.TicketType).filter(models.TicketType.id == ticket_type_id).first()
-    if db_ticket_type:
-        update_data = ticket_type_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_ticket_type, field, value)
+    """Update a ticket type with one conditional UPDATE.
+
+    A new capacity is checked against `sold` in the same statement, so a
+    reservation committed meanwhile cannot leave capacity below it. Returns
+    None when the capacity would not cover the tickets already sold.
+    """
+    ticket_type = models.TicketType
+    update_data = ticket_type_update.dict(exclude_unset=True)
+    if update_data:
+        statement = (
+            update(ticket_type)
+            .where(ticket_type.id == ticket_type_id)
+            .values(**update_data)
+            .execution_options(synchronize_session=False)
+        )
+        if update_data.get("capacity") is not None:
+            statement = statement.where(ticket_type.sold <= update_data["capacity"])
+        if db.execute(statement).rowcount != 1:
+            db.rollback()
+            return None
         db.commit()
-        db.refresh(db_ticket_type)
-    return db_ticket_type
+    return db.get(ticket_type, ticket_type_id, populate_existing=True)
+
+def reserve_tickets(db: Session, ticket_type_id: int, quantity: int, amount=0) -> bool:
+    """Atomically take `quantity` tickets from a ticket type's stock.
+
+    A single conditional UPDATE, so no row lock is held across Python code;
+    it only succeeds while enough tickets remain. `amount` is added to the
+    ticket type's revenue in the same statement. The caller commits.
+    """
+    ticket_type = models.TicketType
+    result = db.execute(
+        update(ticket_type)
+        .where(ticket_type.id == ticket_type_id, ticket_type.capacity - ticket_type.sold >= quantity)
+        .values(sold=ticket_type.sold + quantity, revenue=ticket_type.revenue + amount)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
 
 def delete_ticket_type(db: Session, ticket_type_id: int):
     db_ticket_type = db.query(models.TicketType).filter(models.TicketType.id == ticket_type_id).first()
@@ -222,38 +401,127 @@ def delete_ticket_type(db: Session, ticket_type_id: int):
 
 # Purchase CRUD
 def get_purchase(db: Session, purchase_id: int):
-    return db.query(models.Purchase).filter(models.Purchase.id == purchase_id).first()
+    return db.query(models.Purchase).options(*PURCHASE_WITH_DETAILS).filter(models.Purchase.id == purchase_id).first()
 
-def get_purchases(db: Session, user_id: Optional[int] = None, event_id: Optional[int] = None, skip: int = 0, limit: int = 100):
-    query = db.query(models.Purchase)
+def get_purchases(db: Session, user_id: Optional[int] = None, event_id: Optional[int] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Purchase).options(*PURCHASE_WITH_DETAILS)
     if user_id:
         query = query.filter(models.Purchase.user_id == user_id)
     if event_id:
         query = query.filter(models.Purchase.event_id == event_id)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, PURCHASE_ORDER, skip=skip, limit=limit, cursor=cursor).all()
 
 def create_purchase(db: Session, purchase: schemas.PurchaseCreate):
     db_purchase = models.Purchase(**purchase.dict())
     db.add(db_purchase)
+    db.flush()
+    record_sale(db, db_purchase.id, purchases=1)
     db.commit()
     db.refresh(db_purchase)
     return db_purchase
 
+def get_purchase_with_tickets(db: Session, purchase_id: int):
+    return db.query(models.Purchase).options(*PURCHASE_WITH_TICKETS).filter(models.Purchase.id == purchase_id).first()
+
+def checkout(db: Session, user_id: int, checkout: schemas.CheckoutCreate, ticket_types: dict):
+    """Write a purchase, its lines and its tickets in a single transaction.
+
+    Prices come from `ticket_types` (id -> TicketType of the event), never from
+    the client. Returns None, with nothing written, when any line is sold out.
+    """
+    quantities = {}
+    for item in checkout.items:
+        quantities[item.ticket_type_id] = quantities.get(item.ticket_type_id, 0) + item.quantity
+
+    # Reserve in id order so concurrent checkouts lock ticket types consistently
+    for ticket_type_id in sorted(quantities):
+        quantity = quantities[ticket_type_id]
+        if not reserve_tickets(db, ticket_type_id, quantity, ticket_types[ticket_type_id].price * quantity):
+            db.rollback()
+            return None
+
+    lines = [
+        {
+            "ticket_type_id": ticket_type_id,
+            "quantity": quantity,
+            "unit_price": ticket_types[ticket_type_id].price,
+            "subtotal": ticket_types[ticket_type_id].price * quantity,
+        }
+        for ticket_type_id, quantity in quantities.items()
+    ]
+    db_purchase = models.Purchase(
+        event_id=checkout.event_id,
+        user_id=user_id,
+        total_amount=sum(line["subtotal"] for line in lines),
+    )
+    db.add(db_purchase)
+    db.flush()
+
+    db.execute(insert(models.PurchaseDetail), [dict(line, purchase_id=db_purchase.id) for line in lines])
+    record_sale(db, db_purchase.id, revenue=db_purchase.total_amount, tickets=sum(quantities.values()), purchases=1)
+    issue_tickets(db, purchase_id=db_purchase.id, quantity=sum(quantities.values()))
+    db.commit()
+    return get_purchase_with_tickets(db, purchase_id=db_purchase.id)
+
 # PurchaseDetail CRUD
 def get_purchase_details(db: Session, purchase_id: int):
     return db.query(models.PurchaseDetail).filter(models.PurchaseDetail.purchase_id == purchase_id).all()
 
-def create_purchase_detail(db: Session, purchase_detail: schemas.PurchaseDetailCreate):
-    db_purchase_detail = models.PurchaseDetail(**purchase_detail.dict())
+def create_purchase_detail(db: Session, purchase_detail: schemas.PurchaseDetailCreate, ticket_type: models.TicketType):
+    """Create a purchase line priced from its ticket type, or return None when it is sold out"""
+    subtotal = ticket_type.price * purchase_detail.quantity
+    if not reserve_tickets(db, ticket_type.id, purchase_detail.quantity, subtotal):
+        db.rollback()
+        return None
+    db_purchase_detail = models.PurchaseDetail(
+        purchase_id=purchase_detail.purchase_id,
+        ticket_type_id=ticket_type.id,
+        quantity=purchase_detail.quantity,
+        unit_price=ticket_type.price,
+        subtotal=subtotal,
+    )
     db.add(db_purchase_detail)
+    record_sale(db, purchase_detail.purchase_id, revenue=subtotal, tickets=purchase_detail.quantity)
     db.commit()
     db.refresh(db_purchase_detail)
     return db_purchase_detail
 
 # Ticket CRUD
+QR_CODE_MIN = 10 ** 18
+QR_CODE_MAX = 2 ** 63
+QR_ISSUE_ATTEMPTS = 5
+
 def generate_qr_code():
-    """Generate a unique QR code string"""
-    return ''.join(secrets.choice(string.digits) for _ in range(12))
+    """Generate a random 19-digit QR code string.
+
+    Codes are drawn from [10^18, 2^63), about 8e18 values that always fit a
+    signed 64-bit integer, so collisions stay negligible at tens of millions
+    of tickets and no uniqueness probe is needed before inserting.
+    """
+    return str(QR_CODE_MIN + secrets.randbelow(QR_CODE_MAX - QR_CODE_MIN))
+
+def issue_tickets(db: Session, purchase_id: int, quantity: int) -> List[str]:
+    """Insert `quantity` active tickets for a purchase in one multi-row INSERT.
+
+    Instead of checking each code up front, a unique violation regenerates the
+    batch inside a savepoint. The caller commits. Returns the issued codes.
+    """
+    for attempt in range(QR_ISSUE_ATTEMPTS):
+        qr_codes = [generate_qr_code() for _ in range(quantity)]
+        try:
+            with db.begin_nested():
+                db.execute(insert(models.Ticket), [
+                    {"purchase_id": purchase_id, "qr_code": qr_code, "status": "active"}
+                    for qr_code in qr_codes
+                ])
+            db.execute(increment_sales_stats(
+                select(models.Purchase.event_id).where(models.Purchase.id == purchase_id).scalar_subquery(),
+                tickets_issued=quantity,
+            ))
+            return qr_codes
+        except IntegrityError:
+            if attempt == QR_ISSUE_ATTEMPTS - 1:
+                raise
 
 def get_ticket(db: Session, ticket_id: int):
     return db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
@@ -261,49 +529,252 @@ def get_ticket(db: Session, ticket_id: int):
 def get_ticket_by_qr(db: Session, qr_code: str):
     return db.query(models.Ticket).filter(models.Ticket.qr_code == qr_code).first()
 
-def get_tickets(db: Session, purchase_id: Optional[int] = None, user_id: Optional[int] = None, skip: int = 0, limit: int = 100):
+def get_tickets(db: Session, purchase_id: Optional[int] = None, user_id: Optional[int] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
     query = db.query(models.Ticket)
     if purchase_id:
         query = query.filter(models.Ticket.purchase_id == purchase_id)
     if user_id:
         query = query.join(models.Purchase).filter(models.Purchase.user_id == user_id)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, TICKET_ORDER, skip=skip, limit=limit, cursor=cursor).all()
+
+def unissued_tickets(db: Session, purchase_id: int) -> int:
+    """Tickets bought on a purchase (sum of its lines) that have not been issued yet.
+
+    Locks the purchase row first (SELECT ... FOR UPDATE), so concurrent
+    issuance for the same purchase is serialized. The caller commits.
+    """
+    db.execute(select(models.Purchase.id).where(models.Purchase.id == purchase_id).with_for_update())
+    bought = db.scalar(
+        select(func.coalesce(func.sum(models.PurchaseDetail.quantity), 0))
+        .where(models.PurchaseDetail.purchase_id == purchase_id)
+    )
+    issued = db.scalar(select(func.count(models.Ticket.id)).where(models.Ticket.purchase_id == purchase_id))
+    return bought - issued
 
 def create_ticket(db: Session, purchase_id: int):
-    qr_code = generate_qr_code()
-    # Ensure QR code is unique
-    while db.query(models.Ticket).filter(models.Ticket.qr_code == qr_code).first():
-        qr_code = generate_qr_code()
-    
-    db_ticket = models.Ticket(
-        purchase_id=purchase_id,
-        qr_code=qr_code,
-        status="active"
+    """Issue one ticket, or return None when every ticket bought is already issued"""
+    if unissued_tickets(db, purchase_id) < 1:
+        db.rollback()
+        return None
+    qr_code, = issue_tickets(db, purchase_id=purchase_id, quantity=1)
+    db.commit()
+    return get_ticket_by_qr(db, qr_code=qr_code)
+
+def create_tickets(db: Session, purchase_id: int, quantity: int):
+    """Issue `quantity` tickets, or return None when that exceeds the tickets bought and not yet issued"""
+    if unissued_tickets(db, purchase_id) < quantity:
+        db.rollback()
+        return None
+    qr_codes = issue_tickets(db, purchase_id=purchase_id, quantity=quantity)
+    db.commit()
+    return qr_codes
+
+SCAN_ACCEPTED = "accepted"
+SCAN_ALREADY_USED = "already_used"
+SCAN_INVALID = "invalid"
+
+def scan_ticket(db: Session, qr_code: str, verifier_id: int, event_id: Optional[int] = None, device_id: Optional[str] = None):
+    """Check a ticket in with one conditional UPDATE (active -> used).
+
+    Returns (result, repeat, ticket). Only one of several concurrent gates can
+    win the update. A repeat scan from the device that admitted the ticket
+    is reported as accepted again, so device retries are idempotent.
+    """
+    conditions = scan_conditions(qr_code, event_id)
+    result = db.execute(scan_statement(conditions, verifier_id, device_id))
+    if result.rowcount == 1:
+        db.execute(scan_stats_statement(qr_code))
+    db.commit()
+    db_ticket, ticket_event_id = db.execute(scan_lookup(conditions)).first() or (None, None)
+    if result.rowcount == 1:
+        checkin.monitor.record(ticket_event_id, verifier_id)
+    return scan_outcome(result.rowcount, db_ticket, verifier_id, device_id)
+
+def scan_conditions(qr_code: str, event_id: Optional[int] = None):
+    conditions = [models.Ticket.qr_code == qr_code]
+    if event_id:
+        conditions.append(models.Ticket.purchase_id.in_(
+            select(models.Purchase.id).where(models.Purchase.event_id == event_id)
+        ))
+    return conditions
+
+def scan_statement(conditions, verifier_id: int, device_id: Optional[str]):
+    # Stamped in naive UTC like offline scans; the DB clock (NOW()) is local time on MySQL
+    now = datetime.utcnow()
+    return (
+        update(models.Ticket)
+        .where(*conditions, models.Ticket.status == "active")
+        .values(status="used", used_at=now, status_changed_at=now, verifier_id=verifier_id, scan_device_id=device_id)
+        .execution_options(synchronize_session=False)
     )
-    db.add(db_ticket)
+
+def scan_lookup(conditions):
+    """The scanned ticket together with its event id"""
+    return (
+        select(models.Ticket, models.Purchase.event_id)
+        .join(models.Purchase, models.Ticket.purchase_id == models.Purchase.id)
+        .where(*conditions)
+    )
+
+def scan_stats_statement(qr_code: str):
+    """Count an accepted scan in the check-in totals of the ticket's event"""
+    return increment_sales_stats(
+        select(models.Purchase.event_id)
+        .join(models.Ticket, models.Ticket.purchase_id == models.Purchase.id)
+        .where(models.Ticket.qr_code == qr_code)
+        .scalar_subquery(),
+        tickets_scanned=1,
+    )
+
+def scan_outcome(rowcount: int, db_ticket, verifier_id: int, device_id: Optional[str]):
+    if rowcount == 1:
+        return SCAN_ACCEPTED, False, db_ticket
+    if db_ticket is None or db_ticket.status != "used":
+        return SCAN_INVALID, False, db_ticket
+    if device_id and db_ticket.scan_device_id == device_id and db_ticket.verifier_id == verifier_id:
+        return SCAN_ACCEPTED, True, db_ticket
+    return SCAN_ALREADY_USED, False, db_ticket
+
+def scan_tickets_batch(db: Session, event_id: int, verifier_id: int, scans: List[schemas.OfflineScan], device_id: Optional[str] = None):
+    """Apply a batch of offline scans for one event in a single transaction.
+
+    The event's scanned tickets are locked (SELECT ... FOR UPDATE), classified
+    in scan-time order so the earliest scan wins, and the accepted ones are
+    marked used with one executemany UPDATE. Returns one result per scan.
+    """
+    db_tickets = {
+        db_ticket.qr_code: db_ticket
+        for db_ticket in db.query(models.Ticket)
+        .join(models.Purchase, models.Ticket.purchase_id == models.Purchase.id)
+        .filter(models.Purchase.event_id == event_id, models.Ticket.qr_code.in_({scan.qr_code for scan in scans}))
+        .with_for_update()
+    }
+    results, accepted = [], {}
+    for scan in sorted(scans, key=lambda scan: scan.scanned_at):
+        db_ticket = db_tickets.get(scan.qr_code)
+        item = {"qr_code": scan.qr_code, "result": SCAN_INVALID}
+        if scan.qr_code in accepted:
+            item.update(result=SCAN_ALREADY_USED, verifier_id=verifier_id, used_at=accepted[scan.qr_code]["scanned_at"])
+        elif db_ticket is not None and db_ticket.status == "active":
+            accepted[scan.qr_code] = {"ticket_id": db_ticket.id, "scanned_at": scan.scanned_at}
+            item.update(result=SCAN_ACCEPTED, verifier_id=verifier_id, used_at=scan.scanned_at)
+        elif db_ticket is not None and db_ticket.status == "used":
+            repeat = bool(device_id) and db_ticket.scan_device_id == device_id and db_ticket.verifier_id == verifier_id
+            item.update(
+                result=SCAN_ACCEPTED if repeat else SCAN_ALREADY_USED, repeat=repeat,
+                verifier_id=db_ticket.verifier_id, used_at=db_ticket.used_at,
+            )
+        results.append(item)
+
+    if accepted:
+        tickets = models.Ticket.__table__
+        result = db.execute(
+            tickets.update()
+            .where(tickets.c.id == bindparam("ticket_id"), tickets.c.status == "active")
+            .values(
+                status="used", used_at=bindparam("scanned_at"), status_changed_at=datetime.utcnow(),
+                verifier_id=verifier_id, scan_device_id=device_id,
+            ),
+            list(accepted.values()),
+        )
+        if result.rowcount != len(accepted):
+            # A concurrent scan won some tickets (FOR UPDATE is a no-op on SQLite)
+            lost = lost_batch_scans(db, accepted, verifier_id, device_id)
+            for item in results:
+                if item["qr_code"] in lost:
+                    item.update(result=SCAN_ALREADY_USED, repeat=False, **lost[item["qr_code"]])
+            for qr_code in lost:
+                del accepted[qr_code]
+        if accepted:
+            db.execute(increment_sales_stats(event_id, tickets_scanned=len(accepted)))
     db.commit()
-    db.refresh(db_ticket)
-    return db_ticket
+    for scan in accepted.values():
+        checkin.monitor.record(event_id, verifier_id, scanned_at=checkin.epoch_seconds(scan["scanned_at"]))
+    return results
+
+def lost_batch_scans(db: Session, accepted: dict, verifier_id: int, device_id: Optional[str]) -> dict:
+    """Scans of a batch whose ticket was marked used by another scan first.
+
+    Returns qr_code -> the winning scan's verifier_id and used_at. A ticket
+    counts as this batch's when it carries its verifier, device and scan time
+    (to the second, as MySQL DATETIME stores it).
+    """
+    scanned_at = {scan["ticket_id"]: (qr_code, scan["scanned_at"]) for qr_code, scan in accepted.items()}
+    lost = {}
+    for ticket_id, winner_id, winner_device_id, used_at in db.execute(
+        select(models.Ticket.id, models.Ticket.verifier_id, models.Ticket.scan_device_id, models.Ticket.used_at)
+        .where(models.Ticket.id.in_(scanned_at))
+    ):
+        qr_code, ours = scanned_at[ticket_id]
+        if winner_id == verifier_id and winner_device_id == device_id and used_at is not None and abs((used_at - ours).total_seconds()) < 1:
+            continue
+        lost[qr_code] = {"verifier_id": winner_id, "used_at": used_at}
+    return lost
+
+# Status changes are re-sent for this long past a device's last sync, so a
+# change committed just after that sync's read, or stamped by a worker whose
+# clock lags, is not missed
+MANIFEST_CHANGE_OVERLAP = timedelta(minutes=1)
+
+def get_ticket_manifest(db: Session, event_id: int, since_id: int = 0, changed_since: Optional[datetime] = None):
+    """Active tickets of an event, or what changed since a device's last sync.
+
+    Returns (max ticket id, synced_at, added QR codes, removed QR codes).
+    Added are the active tickets issued after `since_id`; with
+    `changed_since` (the `synced_at` of the last sync) they also include
+    tickets made active again, and removed lists the tickets used or
+    invalidated since then.
+    """
+    synced_at = datetime.utcnow()
+    if changed_since is not None and changed_since.tzinfo is not None:
+        changed_since = changed_since.astimezone(timezone.utc).replace(tzinfo=None)
+    active = models.Ticket.status == "active"
+    wanted = active & (models.Ticket.id > since_id)
+    if changed_since is not None:
+        wanted = wanted | (models.Ticket.status_changed_at >= changed_since - MANIFEST_CHANGE_OVERLAP)
+    rows = db.execute(
+        select(models.Ticket.id, models.Ticket.qr_code, active)
+        .join(models.Purchase, models.Ticket.purchase_id == models.Purchase.id)
+        .where(models.Purchase.event_id == event_id, wanted)
+    ).all()
+    return (
+        max([since_id, *(ticket_id for ticket_id, _, _ in rows)]),
+        synced_at,
+        [qr_code for _, qr_code, is_active in rows if is_active],
+        [qr_code for _, qr_code, is_active in rows if not is_active],
+    )
 
 def update_ticket(db: Session, ticket_id: int, ticket_update: schemas.TicketUpdate):
-    db_ticket = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
+    # Locked so concurrent status changes count in the check-in totals once each
+    db_ticket = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).with_for_update().populate_existing().first()
     if db_ticket:
         update_data = ticket_update.dict(exclude_unset=True)
+        was_used = db_ticket.status == "used"
+        # Picked up by the delta manifests of offline verifiers
+        if update_data.get("status", db_ticket.status) != db_ticket.status:
+            db_ticket.status_changed_at = datetime.utcnow()
         for field, value in update_data.items():
             setattr(db_ticket, field, value)
+        entered = db_ticket.status == "used" and not was_used
+        if entered or (was_used and db_ticket.status != "used"):
+            event_id = db.scalar(select(models.Purchase.event_id).where(models.Purchase.id == db_ticket.purchase_id))
+            db.execute(increment_sales_stats(event_id, tickets_scanned=1 if entered else -1))
         db.commit()
         db.refresh(db_ticket)
+        if entered and db_ticket.verifier_id and db_ticket.used_at:
+            # Gate entries checked in through this legacy path count in the live rates too
+            checkin.monitor.record(event_id, db_ticket.verifier_id, scanned_at=checkin.epoch_seconds(db_ticket.used_at))
     return db_ticket
 
 # Report CRUD
 def get_report(db: Session, report_id: int):
-    return db.query(models.Report).filter(models.Report.id == report_id).first()
+    return db.query(models.Report).options(*REPORT_WITH_USER).filter(models.Report.id == report_id).first()
 
-def get_reports(db: Session, user_id: Optional[int] = None, skip: int = 0, limit: int = 100):
-    query = db.query(models.Report)
+def get_reports(db: Session, user_id: Optional[int] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Report).options(*REPORT_WITH_USER)
     if user_id:
         query = query.filter(models.Report.user_id == user_id)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, REPORT_ORDER, skip=skip, limit=limit, cursor=cursor).all()
 
 def create_report(db: Session, report: schemas.ReportCreate):
     db_report = models.Report(**report.dict())
@@ -326,8 +797,9 @@ def update_report(db: Session, report_id: int, report_update: schemas.ReportUpda
 def get_contact_us(db: Session, contact_id: int):
     return db.query(models.ContactUs).filter(models.ContactUs.id == contact_id).first()
 
-def get_contact_us_list(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.ContactUs).offset(skip).limit(limit).all()
+def get_contact_us_list(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.ContactUs)
+    return paginate(query, CONTACT_US_ORDER, skip=skip, limit=limit, cursor=cursor).all()
 
 def create_contact_us(db: Session, contact: schemas.ContactUsCreate):
     db_contact = models.ContactUs(**contact.dict())
@@ -353,7 +825,7 @@ def get_favorite(db: Session, user_id: int, event_id: int):
     ).first()
 
 def get_favorites(db: Session, user_id: int):
-    return db.query(models.Favorite).filter(models.Favorite.user_id == user_id).all()
+    return db.query(models.Favorite).options(*FAVORITE_WITH_EVENT).filter(models.Favorite.user_id == user_id).all()
 
 def create_favorite(db: Session, favorite: schemas.FavoriteCreate):
     db_favorite = models.Favorite(**favorite.dict())
@@ -376,26 +848,244 @@ def get_rating(db: Session, user_id: int, event_id: int):
     ).first()
 
 def get_ratings(db: Session, event_id: Optional[int] = None, user_id: Optional[int] = None):
-    query = db.query(models.Rating)
+    query = db.query(models.Rating).options(*RATING_WITH_DETAILS)
     if event_id:
         query = query.filter(models.Rating.event_id == event_id)
     if user_id:
         query = query.filter(models.Rating.user_id == user_id)
     return query.all()
 
+def _add_to_rating_stats(db: Session, event_id: int, score: int):
+    stats = models.EventRatingStats
+    score_column = getattr(stats, f"score_{score}")
+    result = db.execute(
+        update(stats)
+        .where(stats.event_id == event_id)
+        .values({
+            stats.rating_count: stats.rating_count + 1,
+            stats.rating_sum: stats.rating_sum + score,
+            score_column: score_column + 1,
+        })
+    )
+    # Events created before aggregates existed get their row on first rating
+    if result.rowcount == 0:
+        db.add(stats(event_id=event_id, rating_count=1, rating_sum=score, **{score_column.key: 1}))
+
 def create_rating(db: Session, rating: schemas.RatingCreate):
     db_rating = models.Rating(**rating.dict())
     db.add(db_rating)
+    _add_to_rating_stats(db, rating.event_id, rating.score)
     db.commit()
     db.refresh(db_rating)
     return db_rating
 
+def rebuild_rating_stats(db: Session, event_id: Optional[int] = None):
+    """Recompute rating aggregates from the ratings table"""
+    stats = models.EventRatingStats
+    aggregates = (
+        select(
+            models.Event.id,
+            func.count(models.Rating.id),
+            func.coalesce(func.sum(models.Rating.score), 0),
+            *[func.coalesce(func.sum(case((models.Rating.score == score, 1), else_=0)), 0) for score in range(1, 6)],
+        )
+        .outerjoin(models.Rating, models.Rating.event_id == models.Event.id)
+        .group_by(models.Event.id)
+    )
+    clear = delete(stats)
+    if event_id:
+        aggregates = aggregates.where(models.Event.id == event_id)
+        clear = clear.where(stats.event_id == event_id)
+    db.execute(clear)
+    db.execute(insert(stats).from_select(
+        ["event_id", "rating_count", "rating_sum", "score_1", "score_2", "score_3", "score_4", "score_5"],
+        aggregates,
+    ))
+    db.commit()
+
+# Sales rollups: read by the organizer dashboard, updated by the purchase,
+# purchase-detail, issuance and scan write paths in their own transactions
+def increment_sales_stats(event_id, **increments):
+    """UPDATE adding `increments` to an event's sales totals; `event_id` may be a scalar subquery"""
+    stats = models.EventSalesStats
+    return (
+        update(stats)
+        .where(stats.event_id == event_id)
+        .values({getattr(stats, name): getattr(stats, name) + value for name, value in increments.items()})
+        .execution_options(synchronize_session=False)
+    )
+
+def record_sale(db: Session, purchase_id: int, revenue=0, tickets: int = 0, purchases: int = 0):
+    """Add a sale to its event's totals and to the day of the purchase. The caller commits."""
+    event_id, organizer_id, day = db.execute(
+        select(models.Purchase.event_id, models.Event.organizer_id, func.date(models.Purchase.purchase_date, type_=Date))
+        .join(models.Event, models.Purchase.event_id == models.Event.id)
+        .where(models.Purchase.id == purchase_id)
+    ).one()
+    increments = {"revenue": revenue, "purchases": purchases, "tickets_sold": tickets}
+    db.execute(increment_sales_stats(event_id, **increments))
+
+    daily = models.EventSalesDaily
+    add_to_day = (
+        update(daily)
+        .where(daily.event_id == event_id, daily.day == day)
+        .values({getattr(daily, name): getattr(daily, name) + value for name, value in increments.items()})
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(add_to_day).rowcount:
+        return
+    # First sale of the day: a concurrent transaction may create the row first
+    try:
+        with db.begin_nested():
+            db.execute(insert(daily).values(event_id=event_id, day=day, organizer_id=organizer_id, **increments))
+    except IntegrityError:
+        db.execute(add_to_day)
+
+def rebuild_sales_stats(db: Session, event_id: Optional[int] = None):
+    """Recompute the ticket type counters and the sales rollups from purchases and tickets"""
+    ticket_type, detail, purchase, ticket = models.TicketType, models.PurchaseDetail, models.Purchase, models.Ticket
+    stats, daily = models.EventSalesStats, models.EventSalesDaily
+
+    def per_event(*columns, where=()):
+        return (
+            select(*columns)
+            .select_from(purchase)
+            .where(purchase.event_id == models.Event.id, *where)
+            .scalar_subquery()
+        )
+
+    counters = (
+        update(ticket_type)
+        .values(
+            sold=select(func.coalesce(func.sum(detail.quantity), 0)).where(detail.ticket_type_id == ticket_type.id).scalar_subquery(),
+            revenue=select(func.coalesce(func.sum(detail.subtotal), 0)).where(detail.ticket_type_id == ticket_type.id).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    totals = select(
+        models.Event.id,
+        models.Event.organizer_id,
+        func.coalesce(per_event(func.sum(detail.subtotal), where=(detail.purchase_id == purchase.id,)), 0),
+        per_event(func.count(purchase.id)),
+        func.coalesce(per_event(func.sum(detail.quantity), where=(detail.purchase_id == purchase.id,)), 0),
+        per_event(func.count(ticket.id), where=(ticket.purchase_id == purchase.id,)),
+        per_event(func.count(ticket.id), where=(ticket.purchase_id == purchase.id, ticket.status == "used")),
+    )
+    day = func.date(purchase.purchase_date)
+    days = (
+        select(
+            purchase.event_id,
+            day,
+            models.Event.organizer_id,
+            func.coalesce(func.sum(detail.subtotal), 0),
+            func.count(func.distinct(purchase.id)),
+            func.coalesce(func.sum(detail.quantity), 0),
+        )
+        .join(models.Event, purchase.event_id == models.Event.id)
+        .outerjoin(detail, detail.purchase_id == purchase.id)
+        .group_by(purchase.event_id, day, models.Event.organizer_id)
+    )
+    clear_totals, clear_days = delete(stats), delete(daily)
+    if event_id:
+        counters = counters.where(ticket_type.event_id == event_id)
+        totals = totals.where(models.Event.id == event_id)
+        days = days.where(purchase.event_id == event_id)
+        clear_totals = clear_totals.where(stats.event_id == event_id)
+        clear_days = clear_days.where(daily.event_id == event_id)
+
+    db.execute(counters)
+    db.execute(clear_totals)
+    db.execute(insert(stats).from_select(
+        ["event_id", "organizer_id", "revenue", "purchases", "tickets_sold", "tickets_issued", "tickets_scanned"],
+        totals,
+    ))
+    db.execute(clear_days)
+    db.execute(insert(daily).from_select(
+        ["event_id", "day", "organizer_id", "revenue", "purchases", "tickets_sold"],
+        days,
+    ))
+    db.commit()
+
+def rebuild_checkin_minutes(db: Session):
+    """Recompute the per-minute check-in history from the used tickets.
+
+    Counts still buffered in a running worker are added on top when it flushes,
+    so run it with the API stopped.
+    """
+    ticket, purchase = models.Ticket, models.Purchase
+    if db.get_bind().dialect.name == "mysql":
+        minute = func.date_format(ticket.used_at, "%Y-%m-%d %H:%i:00")
+    else:
+        minute = func.strftime("%Y-%m-%d %H:%M:00", ticket.used_at)
+    minutes = (
+        select(purchase.event_id, minute, ticket.verifier_id, func.count(ticket.id))
+        .join(purchase, ticket.purchase_id == purchase.id)
+        .where(ticket.status == "used", ticket.used_at.isnot(None), ticket.verifier_id.isnot(None))
+        .group_by(purchase.event_id, minute, ticket.verifier_id)
+    )
+    db.execute(delete(models.CheckInMinute))
+    db.execute(insert(models.CheckInMinute).from_select(
+        ["event_id", "minute", "verifier_id", "entries"],
+        minutes,
+    ))
+    db.commit()
+
+def get_organizer_dashboard(db: Session, organizer_id: int, days: int = 30):
+    """Sales and check-in figures of an organizer's events, read from the rollups only"""
+    stats, daily, ticket_type = models.EventSalesStats, models.EventSalesDaily, models.TicketType
+    figures = ("revenue", "purchases", "tickets_sold", "tickets_issued", "tickets_scanned")
+
+    events = db.execute(
+        select(
+            models.Event.id.label("event_id"), models.Event.title, models.Event.start_date, models.Event.status,
+            *[func.coalesce(getattr(stats, name), 0).label(name) for name in figures],
+        )
+        .outerjoin(stats, stats.event_id == models.Event.id)
+        .where(models.Event.organizer_id == organizer_id)
+        .order_by(*EVENT_ORDER)
+    ).mappings().all()
+    ticket_types = db.execute(
+        select(
+            ticket_type.id, ticket_type.event_id, ticket_type.name, ticket_type.price,
+            ticket_type.capacity, ticket_type.sold, ticket_type.revenue,
+        )
+        .where(ticket_type.event_id.in_(select(models.Event.id).where(models.Event.organizer_id == organizer_id)))
+        .order_by(ticket_type.event_id, ticket_type.id)
+    ).mappings().all()
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    sales_per_day = db.execute(
+        select(
+            daily.day,
+            func.sum(daily.revenue).label("revenue"),
+            func.sum(daily.purchases).label("purchases"),
+            func.sum(daily.tickets_sold).label("tickets_sold"),
+        )
+        .where(daily.organizer_id == organizer_id, daily.day >= since)
+        .group_by(daily.day)
+        .order_by(daily.day)
+    ).mappings().all()
+
+    by_event = {}
+    for row in ticket_types:
+        by_event.setdefault(row["event_id"], []).append(dict(row, remaining=row["capacity"] - row["sold"]))
+    events = [
+        dict(row, check_in_rate=_rate(row["tickets_scanned"], row["tickets_issued"]), ticket_types=by_event.get(row["event_id"], []))
+        for row in events
+    ]
+    totals = {name: sum((event[name] for event in events), 0) for name in figures}
+    totals["check_in_rate"] = _rate(totals["tickets_scanned"], totals["tickets_issued"])
+    return {"organizer_id": organizer_id, "totals": totals, "events": events, "sales_per_day": sales_per_day}
+
+def _rate(part: int, whole: int) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
 # Claim CRUD
 def get_claim(db: Session, claim_id: int):
-    return db.query(models.Claim).filter(models.Claim.id == claim_id).first()
+    return db.query(models.Claim).options(*CLAIM_WITH_DISTRICT).filter(models.Claim.id == claim_id).first()
 
-def get_claims(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Claim).offset(skip).limit(limit).all()
+def get_claims(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(models.Claim).options(*CLAIM_WITH_DISTRICT)
+    return paginate(query, CLAIM_ORDER, skip=skip, limit=limit, cursor=cursor).all()
 
 def create_claim(db: Session, claim: schemas.ClaimCreate):
     db_claim = models.Claim(**claim.dict())
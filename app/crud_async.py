@@ -0,0 +1,34 @@
+"""Async counterparts of the hot read and scan paths in `crud`.
+
+Only used by the async routers (Settings.use_async_db). The statements are
+shared with `crud`, so both stacks issue exactly the same SQL.
+"""
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import checkin, crud, models
+
+async def get_events(db: AsyncSession, **filters):
+    return (await db.scalars(crud.select_events(**filters))).all()
+
+async def get_event(db: AsyncSession, event_id: int):
+    return (await db.scalars(
+        select(models.Event).options(*crud.EVENT_WITH_DETAILS).filter(models.Event.id == event_id)
+    )).first()
+
+async def get_purchase(db: AsyncSession, purchase_id: int):
+    return (await db.scalars(
+        select(models.Purchase).options(*crud.PURCHASE_WITH_DETAILS).filter(models.Purchase.id == purchase_id)
+    )).first()
+
+async def scan_ticket(db: AsyncSession, qr_code: str, verifier_id: int, event_id: Optional[int] = None, device_id: Optional[str] = None):
+    """See `crud.scan_ticket`"""
+    conditions = crud.scan_conditions(qr_code, event_id)
+    result = await db.execute(crud.scan_statement(conditions, verifier_id, device_id))
+    if result.rowcount == 1:
+        await db.execute(crud.scan_stats_statement(qr_code))
+    await db.commit()
+    db_ticket, ticket_event_id = (await db.execute(crud.scan_lookup(conditions))).first() or (None, None)
+    if result.rowcount == 1:
+        checkin.monitor.record(ticket_event_id, verifier_id)
+    return crud.scan_outcome(result.rowcount, db_ticket, verifier_id, device_id)
@@ -0,0 +1,161 @@
+"""Streaming CSV/NDJSON exports.
+
+Every export is a single row-tuple select read through a server-side cursor
+(`stream_results`) in `yield_per` batches, encoded batch by batch, so memory
+use does not grow with the number of rows exported. The generator opens its
+own session: the request's `get_db` session is closed before a streamed body
+is sent.
+"""
+import csv
+import io
+from datetime import date, datetime
+from typing import Iterable, Optional
+from pydantic_core import to_json
+from sqlalchemy import select
+from app import crud, models
+from app.database import SessionLocal
+
+FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+BATCH_SIZE = 1000
+
+class ExportDataset:
+    """Columns, joins and filterable columns of one export.
+
+    Datasets without `event_column`/`organizer_column` are not tied to
+    events and cannot be filtered (or scoped to an organizer) by them.
+    """
+
+    def __init__(self, columns: list, order: tuple, date_column, joins: tuple = (), event_column=None, organizer_column=None):
+        self.columns = columns
+        self.order = order
+        self.date_column = date_column
+        self.joins = joins
+        self.event_column = event_column
+        self.organizer_column = organizer_column
+
+    def statement(
+        self,
+        event_id: Optional[int] = None,
+        organizer_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ):
+        query = select(*self.columns)
+        for target, onclause in self.joins:
+            query = query.join(target, onclause)
+        if event_id:
+            query = query.filter(self.event_column == event_id)
+        if organizer_id:
+            query = query.filter(self.organizer_column == organizer_id)
+        if date_from:
+            query = query.filter(self.date_column >= date_from)
+        if date_to:
+            query = query.filter(self.date_column < date_to)
+        return query.order_by(*self.order)
+
+def _columns(model, *names):
+    return [getattr(model, name) for name in names]
+
+DATASETS = {
+    "purchases": ExportDataset(
+        columns=[
+            *_columns(models.Purchase, "id", "purchase_date", "event_id"),
+            models.Event.title.label("event_title"),
+            models.Event.organizer_id,
+            models.Purchase.user_id,
+            models.User.email.label("user_email"),
+            models.Purchase.total_amount,
+        ],
+        order=crud.PURCHASE_ORDER,
+        date_column=models.Purchase.purchase_date,
+        joins=(
+            (models.Event, models.Purchase.event_id == models.Event.id),
+            (models.User, models.Purchase.user_id == models.User.id),
+        ),
+        event_column=models.Purchase.event_id,
+        organizer_column=models.Event.organizer_id,
+    ),
+    "tickets": ExportDataset(
+        columns=[
+            *_columns(models.Ticket, "id", "qr_code", "status", "created_at", "used_at", "verifier_id", "scan_device_id", "purchase_id"),
+            models.Purchase.event_id,
+            models.Event.organizer_id,
+            models.Purchase.user_id,
+        ],
+        order=crud.TICKET_ORDER,
+        date_column=models.Ticket.created_at,
+        joins=(
+            (models.Purchase, models.Ticket.purchase_id == models.Purchase.id),
+            (models.Event, models.Purchase.event_id == models.Event.id),
+        ),
+        event_column=models.Purchase.event_id,
+        organizer_column=models.Event.organizer_id,
+    ),
+    "claims": ExportDataset(
+        columns=_columns(
+            models.Claim, "id", "created_at", "status", "first_names", "last_names", "document_type",
+            "document_number", "address", "district_id", "home_phone", "mobile_phone", "email", "is_minor",
+            "claim_amount", "service_type", "product_service_description", "claim_type", "claim_detail",
+            "customer_request",
+        ),
+        order=crud.CLAIM_ORDER,
+        date_column=models.Claim.created_at,
+    ),
+    "contact": ExportDataset(
+        columns=_columns(
+            models.ContactUs, "id", "created_at", "status", "first_names", "last_names", "email", "phone",
+            "subject", "message",
+        ),
+        order=crud.CONTACT_US_ORDER,
+        date_column=models.ContactUs.created_at,
+    ),
+    "reports": ExportDataset(
+        columns=[
+            *_columns(models.Report, "id", "created_at", "status", "report_type", "description", "user_id"),
+            models.User.email.label("user_email"),
+        ],
+        order=crud.REPORT_ORDER,
+        date_column=models.Report.created_at,
+        joins=((models.User, models.Report.user_id == models.User.id),),
+    ),
+}
+
+# Spreadsheets evaluate a cell starting with one of these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # User-supplied text is exported as text, never as a formula
+        return "'" + value
+    return value
+
+def encode_csv(keys: list, batches: Iterable) -> Iterable[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(keys)
+    for rows in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def encode_ndjson(keys: list, batches: Iterable) -> Iterable[bytes]:
+    for rows in batches:
+        yield b"".join(to_json(dict(zip(keys, row))) + b"\n" for row in rows)
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson}
+
+def stream_export(statement, format: str, batch_size: int = BATCH_SIZE) -> Iterable[bytes]:
+    """Run the export on its own session and yield the encoded body chunk by chunk"""
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(stream_results=True, yield_per=batch_size))
+        yield from ENCODERS[format](list(result.keys()), result.partitions())
+    finally:
+        db.close()
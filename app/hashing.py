@@ -0,0 +1,64 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+class HashingPoolFull(Exception):
+    """Raised when the hashing pool already holds its maximum of pending jobs"""
+
+class HashingPool:
+    """Dedicated process pool for bcrypt work with a bounded backlog.
+
+    Hashing runs outside the request workers, so bursts of logins neither
+    hold the GIL nor pile up in the shared threadpool; once `workers +
+    queue_size` jobs are pending, new ones fail fast with HashingPoolFull.
+    With `workers` set to 0, hashing runs inline in the calling thread.
+
+    Workers are forked; call `start()` while the process is still
+    single-threaded (application startup) rather than on the first request.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(max(workers + queue_size, 1))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("fork"),
+                    )
+        return self._executor
+
+    def start(self):
+        # A fork-based executor launches all of its workers on the first submit
+        if self.workers > 0:
+            self._get_executor().submit(int).result()
+
+    def run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolFull()
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,204 @@
+"""Request metrics in Prometheus text format.
+
+The middleware records on the event loop thread only, so the counters need
+no locks; work done in the threadpool (queries, response validation) adds its
+time to a per-request accumulator that is shared through a context variable.
+Every uvicorn worker keeps its own numbers.
+"""
+import logging
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+import fastapi.routing
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.query_budget import repeated_statements
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Debug headers added when Settings.query_debug is on
+QUERY_COUNT_HEADER = "X-Query-Count"
+DB_TIME_HEADER = "X-DB-Time-Ms"
+N_PLUS_ONE_HEADER = "X-N-Plus-One"
+QUERY_DEBUG_HEADERS = [QUERY_COUNT_HEADER, DB_TIME_HEADER, N_PLUS_ONE_HEADER]
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+class RequestTimings:
+    """Time spent in the database and in response serialization by one request"""
+    __slots__ = ("db", "queries", "serialization", "statements")
+
+    def __init__(self, track_statements: bool = False):
+        self.db = 0.0
+        self.queries = 0
+        self.serialization = 0.0
+        self.statements = Counter() if track_statements else None
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+class MetricsRegistry:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str, str], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.serialization_time: Dict[Tuple[str, str], Histogram] = {}
+
+    def _histogram(self, series: dict, labels: tuple) -> Histogram:
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(self.buckets)
+        return histogram
+
+    def record(self, route: str, method: str, status: int, duration: float, timings: RequestTimings):
+        labels = (route, method, str(status))
+        self.requests[labels] = self.requests.get(labels, 0) + 1
+        self._histogram(self.latency, labels).observe(duration)
+        self._histogram(self.db_time, (route, method)).observe(timings.db)
+        self._histogram(self.serialization_time, (route, method)).observe(timings.serialization)
+
+    def render(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        lines = [
+            "# HELP http_requests_total Requests handled, by route template, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in list(self.requests.items()):
+            lines.append(f'http_requests_total{{route="{_escape(route)}",method="{method}",status="{status}"}} {count}')
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        self._render_histograms(lines, "http_request_duration_seconds", "Request latency.", self.latency, ("route", "method", "status"))
+        self._render_histograms(lines, "http_request_db_seconds", "Database time per request.", self.db_time, ("route", "method"))
+        self._render_histograms(
+            lines, "http_response_serialization_seconds", "Response validation and encoding time per request.",
+            self.serialization_time, ("route", "method"),
+        )
+        for name, value in (gauges or {}).items():
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def _render_histograms(self, lines: list, name: str, help_text: str, series: dict, label_names: tuple):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for labels, histogram in list(series.items()):
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{label_text}}} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+registry = MetricsRegistry()
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; labels requests by the matched route template"""
+
+    def __init__(self, app, registry: MetricsRegistry = registry, query_debug: Optional[bool] = None):
+        self.app = app
+        self.registry = registry
+        self.query_debug = settings.query_debug if query_debug is None else query_debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = RequestTimings(track_statements=self.query_debug)
+        token = current_timings.set(timings)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.query_debug:
+                    message = {**message, "headers": [*message.get("headers", []), *self._debug_headers(scope, timings)]}
+            await send(message)
+
+        self.registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            self.registry.in_flight -= 1
+            current_timings.reset(token)
+            route = scope.get("route")
+            self.registry.record(
+                route.path if route is not None else UNMATCHED_ROUTE, scope["method"], status, duration, timings
+            )
+
+    def _debug_headers(self, scope, timings: RequestTimings):
+        headers = [
+            (QUERY_COUNT_HEADER.encode(), str(timings.queries).encode()),
+            (DB_TIME_HEADER.encode(), f"{timings.db * 1000:.3f}".encode()),
+        ]
+        repeated = repeated_statements(timings.statements, settings.n_plus_one_threshold)
+        if repeated:
+            statement, count = next(iter(repeated.items()))
+            headers.append((N_PLUS_ONE_HEADER.encode(), str(count).encode()))
+            logger.warning(
+                "Likely N+1 on %s %s: statement run %d times: %s",
+                scope["method"], scope["path"], count, " ".join(statement.split())[:200],
+            )
+        return headers
+
+# Database time: cursor events fire in whichever thread runs the query and
+# add to the accumulator of the request that issued it.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    timings = current_timings.get()
+    if timings is not None:
+        timings.db += time.perf_counter() - start
+        timings.queries += 1
+        if timings.statements is not None:
+            timings.statements[statement] += 1
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+# Serialization time: FastAPI resolves `serialize_response` from its module
+# globals on every request, so wrapping it there covers every route.
+_serialize_response = fastapi.routing.serialize_response
+
+async def _timed_serialize_response(*args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return await _serialize_response(*args, **kwargs)
+    finally:
+        timings = current_timings.get()
+        if timings is not None:
+            timings.serialization += time.perf_counter() - start
+
+fastapi.routing.serialize_response = _timed_serialize_response
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Date, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Date, Numeric, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -103,6 +103,15 @@ class Verifier(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_start_date_id", "start_date", "id"),
+        Index("ix_events_status_start_date", "status", "start_date"),
+        Index("ix_events_district_id_start_date", "district_id", "start_date"),
+        Index(
+            "ix_events_fulltext", "title", "description", "location_description",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -125,6 +134,9 @@ class Event(Base):
     purchases = relationship("Purchase", back_populates="event")
     favorites = relationship("Favorite", back_populates="event")
     ratings = relationship("Rating", back_populates="event")
+    rating_stats = relationship("EventRatingStats", back_populates="event", uselist=False, cascade="all, delete-orphan")
+    sales_stats = relationship("EventSalesStats", back_populates="event", uselist=False, cascade="all, delete-orphan")
+    sales_daily = relationship("EventSalesDaily", back_populates="event", cascade="all, delete-orphan")
     event_verifiers = relationship("EventVerifier", back_populates="event")
 
 class EventVerifier(Base):
@@ -145,12 +157,22 @@ class TicketType(Base):
     name = Column(String(100), nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
     capacity = Column(Integer, nullable=False)
+    sold = Column(Integer, default=0, server_default="0", nullable=False)
+    revenue = Column(Numeric(12, 2), default=0, server_default="0", nullable=False)
     
     event = relationship("Event", back_populates="ticket_types")
     purchase_details = relationship("PurchaseDetail", back_populates="ticket_type")
+    
+    @property
+    def remaining(self):
+        return self.capacity - self.sold
 
 class Purchase(Base):
     __tablename__ = "purchases"
+    __table_args__ = (
+        Index("ix_purchases_purchase_date_id", "purchase_date", "id"),
+        Index("ix_purchases_user_id_purchase_date_id", "user_id", "purchase_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
@@ -178,6 +200,10 @@ class PurchaseDetail(Base):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Delta manifests: tickets used or invalidated since a device's last sync
+        Index("ix_tickets_status_changed_at", "status_changed_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     purchase_id = Column(Integer, ForeignKey("purchases.id"), nullable=False)
@@ -186,12 +212,18 @@ class Ticket(Base):
     used_at = Column(DateTime, nullable=True)
     status = Column(String(50), default="active", nullable=False)  # active, used, expired
     verifier_id = Column(Integer, ForeignKey("verifiers.id"), nullable=True)
+    scan_device_id = Column(String(100), nullable=True)
+    status_changed_at = Column(DateTime, nullable=True)
     
     purchase = relationship("Purchase", back_populates="tickets")
     verifier = relationship("Verifier", back_populates="tickets")
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        Index("ix_reports_created_at_id", "created_at", "id"),
+        Index("ix_reports_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -204,6 +236,9 @@ class Report(Base):
 
 class ContactUs(Base):
     __tablename__ = "contact_us"
+    __table_args__ = (
+        Index("ix_contact_us_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     first_names = Column(String(100), nullable=False)
@@ -237,8 +272,73 @@ class Rating(Base):
     user = relationship("User", back_populates="ratings")
     event = relationship("Event", back_populates="ratings")
 
+class EventRatingStats(Base):
+    """Per-event rating aggregate, maintained incrementally by crud.create_rating"""
+    __tablename__ = "event_rating_stats"
+    
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    rating_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    score_1 = Column(Integer, default=0, nullable=False)
+    score_2 = Column(Integer, default=0, nullable=False)
+    score_3 = Column(Integer, default=0, nullable=False)
+    score_4 = Column(Integer, default=0, nullable=False)
+    score_5 = Column(Integer, default=0, nullable=False)
+    
+    event = relationship("Event", back_populates="rating_stats")
+    
+    @property
+    def average(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+    
+    @property
+    def histogram(self):
+        return [self.score_1, self.score_2, self.score_3, self.score_4, self.score_5]
+
+class EventSalesStats(Base):
+    """Per-event sales and check-in totals, maintained incrementally by crud"""
+    __tablename__ = "event_sales_stats"
+    
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    organizer_id = Column(Integer, ForeignKey("organizers.id"), nullable=False, index=True)
+    revenue = Column(Numeric(12, 2), default=0, nullable=False)
+    purchases = Column(Integer, default=0, nullable=False)
+    tickets_sold = Column(Integer, default=0, nullable=False)
+    tickets_issued = Column(Integer, default=0, nullable=False)
+    tickets_scanned = Column(Integer, default=0, nullable=False)
+    
+    event = relationship("Event", back_populates="sales_stats")
+
+class EventSalesDaily(Base):
+    """Per-event sales by purchase date, maintained incrementally by crud"""
+    __tablename__ = "event_sales_daily"
+    __table_args__ = (
+        Index("ix_event_sales_daily_organizer_id_day", "organizer_id", "day"),
+    )
+    
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    organizer_id = Column(Integer, ForeignKey("organizers.id"), nullable=False)
+    revenue = Column(Numeric(12, 2), default=0, nullable=False)
+    purchases = Column(Integer, default=0, nullable=False)
+    tickets_sold = Column(Integer, default=0, nullable=False)
+    
+    event = relationship("Event", back_populates="sales_daily")
+
+class CheckInMinute(Base):
+    """Entries per minute by event and verifier, flushed from app.checkin"""
+    __tablename__ = "checkin_minutes"
+    
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    minute = Column(DateTime, primary_key=True)
+    verifier_id = Column(Integer, ForeignKey("verifiers.id"), primary_key=True)
+    entries = Column(Integer, default=0, nullable=False)
+
 class Claim(Base):
     __tablename__ = "claims"
+    __table_args__ = (
+        Index("ix_claims_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     first_names = Column(String(100), nullable=False)
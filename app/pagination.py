@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence
+from fastapi import HTTPException, Response
+from sqlalchemy import String, and_, or_, type_coerce
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else int(value)
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _same_value(column, value):
+    """`column = value`, matching whole-second datetimes in either SQLite text format.
+
+    SQLite keeps datetimes as text: server-default timestamps (CURRENT_TIMESTAMP)
+    are stored as 'YYYY-MM-DD HH:MM:SS', values bound from Python with a
+    '.ffffff' fraction, so a plain equality misses half of the ties. MySQL
+    compares the text form as the same DATETIME.
+    """
+    if isinstance(value, datetime) and not value.microsecond:
+        return or_(column == value, type_coerce(column, String) == value.strftime("%Y-%m-%d %H:%M:%S"))
+    return column == value
+
+def _after(columns: Sequence, values: Sequence):
+    # Expanded row-value comparison: (a, b) > (x, y) as a > x OR (a = x AND b > y)
+    head, value = columns[0], values[0]
+    if len(columns) == 1:
+        return head > value
+    return or_(head > value, and_(_same_value(head, value), _after(columns[1:], values[1:])))
+
+def paginate(query, columns: Sequence, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """Order a query by `columns` and page it by keyset when a cursor is given, by offset otherwise"""
+    query = query.order_by(*columns)
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns)))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+def set_next_cursor(response: Response, items: Sequence, limit: int, columns: Sequence):
+    """Advertise the cursor for the following page when this one came back full"""
+    if items and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in columns])
@@ -0,0 +1,62 @@
+"""Query counting helpers for spotting N+1 access patterns.
+
+`assert_max_queries` is meant for tests:
+
+    with assert_max_queries(2):
+        client.get("/events/")
+
+fails with the offending statements listed when the block runs more than two
+queries. It listens on every engine, so it also sees queries issued from
+TestClient's worker threads.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+def repeated_statements(statements: Counter, threshold: int) -> Dict[str, int]:
+    """Statement shapes run at least `threshold` times, most repeated first.
+
+    Statements are compared before parameter binding, so the same lookup run
+    once per parent row (the usual lazy-load N+1) shows up as one shape.
+    """
+    return {
+        statement: count
+        for statement, count in statements.most_common()
+        if count >= threshold
+    }
+
+class QueryLog:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> Dict[str, int]:
+        return repeated_statements(Counter(self.statements), threshold)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextmanager
+def count_queries():
+    log = QueryLog()
+    event.listen(Engine, "before_cursor_execute", log._record)
+    try:
+        yield log
+    finally:
+        event.remove(Engine, "before_cursor_execute", log._record)
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    with count_queries() as log:
+        yield log
+    if log.count > max_queries:
+        lines = [f"Expected at most {max_queries} queries, got {log.count}"]
+        for statement, count in log.repeated().items():
+            lines.append(f"  likely N+1, run {count} times: {' '.join(statement.split())[:200]}")
+        lines += [f"  {i}. {' '.join(statement.split())[:200]}" for i, statement in enumerate(log.statements, 1)]
+        raise AssertionError("\n".join(lines))
@@ -0,0 +1,38 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from app.cache import reference_cache
+from app import schemas, auth
+from app.auth import principal_cache
+from app.database import async_pool_metrics, pool_metrics
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.post("/cache/reference/invalidate")
+def invalidate_reference_cache(
+    names: Optional[List[str]] = Query(None),
+    current_user: schemas.User = Depends(auth.get_admin_user)
+):
+    # names: departments, provinces, districts, categories, roles (all when omitted)
+    reference_cache.invalidate(*(names or []))
+    return {"message": "Reference cache invalidated", "version": reference_cache.version}
+
+@router.post("/cache/principals/invalidate")
+def invalidate_principal_cache(
+    user_id: Optional[int] = None,
+    current_user: schemas.User = Depends(auth.get_admin_user)
+):
+    # Use after changing a user's role directly in the database
+    if user_id:
+        auth.invalidate_principal(user_id)
+    else:
+        principal_cache.clear()
+    return {"message": "Principal cache invalidated"}
+
+@router.get("/metrics")
+def read_metrics(current_user: schemas.User = Depends(auth.get_admin_user)):
+    return {
+        "principal_cache": principal_cache.stats(),
+        "reference_cache": {"version": reference_cache.version},
+        "db_pool": pool_metrics.stats(),
+        "async_db_pool": async_pool_metrics.stats() if async_pool_metrics else None,
+    }
@@ -37,6 +37,8 @@ def register_user(
             status_code=400,
             detail="Email already registered"
         )
+    # Release the connection while the password is hashed
+    db.rollback()
     return crud.create_user(db=db, user=user)
 
 @router.get("/me", response_model=schemas.UserWithRole)
@@ -1,11 +1,17 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.cache import reference_cache
 from app import crud, schemas
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+categories_adapter = TypeAdapter(List[schemas.Category])
+
 @router.get("/", response_model=List[schemas.Category])
-def read_categories(db: Session = Depends(get_db)):
-    return crud.get_categories(db)
+def read_categories(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.respond(
+        request, "categories", lambda: crud.get_categories(db), categories_adapter
+    )
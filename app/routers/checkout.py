@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app import crud, schemas, auth
+
+router = APIRouter(prefix="/checkout", tags=["checkout"])
+
+@router.post("/", response_model=schemas.PurchaseWithTickets)
+def checkout(
+    checkout: schemas.CheckoutCreate,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(auth.get_current_active_user)
+):
+    # Verify event exists
+    db_event = crud.get_event(db, event_id=checkout.event_id)
+    if not db_event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    ticket_types = {ticket_type.id: ticket_type for ticket_type in crud.get_ticket_types(db, event_id=checkout.event_id)}
+    missing = sorted({item.ticket_type_id for item in checkout.items} - ticket_types.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Ticket types not found for this event: {missing}")
+    
+    db_purchase = crud.checkout(db=db, user_id=current_user.id, checkout=checkout, ticket_types=ticket_types)
+    if db_purchase is None:
+        raise HTTPException(status_code=409, detail="Not enough tickets available")
+    return db_purchase
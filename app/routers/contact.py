@@ -1,19 +1,23 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import crud, schemas, auth
+from app import crud, schemas, auth, pagination
 
 router = APIRouter(prefix="/contact", tags=["contact"])
 
 @router.get("/", response_model=List[schemas.ContactUs])
 def read_contact_messages(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(auth.get_admin_user)
 ):
-    return crud.get_contact_us_list(db, skip=skip, limit=limit)
+    contacts = crud.get_contact_us_list(db, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor(response, contacts, limit, crud.CONTACT_US_ORDER)
+    return contacts
 
 @router.get("/{contact_id}", response_model=schemas.ContactUs)
 def read_contact_message(
@@ -1,20 +1,66 @@
+import hashlib
+import struct
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
-from app import crud, schemas, auth
+from app import checkin, crud, schemas, auth, pagination, search, serialization
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 @router.get("/", response_model=List[schemas.EventWithDetails])
 def read_events(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     category_id: Optional[int] = None,
     organizer_id: Optional[int] = None,
+    status: Optional[str] = None,
+    district_id: Optional[int] = None,
+    province_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    end_from: Optional[datetime] = None,
+    end_to: Optional[datetime] = None,
     db: Session = Depends(get_db)
 ):
-    return crud.get_events(db, skip=skip, limit=limit, category_id=category_id, organizer_id=organizer_id)
+    filters = dict(
+        category_id=category_id, organizer_id=organizer_id, status=status, district_id=district_id,
+        province_id=province_id, department_id=department_id,
+        start_from=start_from, start_to=start_to, end_from=end_from, end_to=end_to,
+    )
+    if settings.fast_serialization:
+        return serialization.events_response(db, skip=skip, limit=limit, cursor=cursor, **filters)
+    
+    events = crud.get_events(db, skip=skip, limit=limit, cursor=cursor, **filters)
+    pagination.set_next_cursor(response, events, limit, crud.EVENT_ORDER)
+    return events
+
+@router.get("/search", response_model=schemas.EventSearchResult)
+def search_events(
+    q: str = Query(..., min_length=1),
+    category_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    date: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    if date and date not in search.DATE_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"date must be one of: {', '.join(search.DATE_BUCKETS)}")
+    
+    total, hits, facets = crud.search_events(
+        db, q, category_id=category_id, district_id=district_id, date=date, skip=skip, limit=limit
+    )
+    return {
+        "total": total,
+        "items": [{"score": score, "event": db_event} for db_event, score in hits],
+        "facets": facets,
+    }
 
 @router.get("/{event_id}", response_model=schemas.EventWithDetails)
 def read_event(
@@ -26,18 +72,73 @@ def read_event(
         raise HTTPException(status_code=404, detail="Event not found")
     return db_event
 
+@router.get("/{event_id}/manifest", response_class=Response)
+def read_ticket_manifest(
+    event_id: int,
+    request: Request,
+    since_id: int = 0,
+    changed_since: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(auth.get_verifier_user)
+):
+    """Compact manifest of the event's valid QR codes for offline gate checks.
+
+    The body is sorted arrays of unsigned 64-bit little-endian integers (8
+    bytes per ticket): X-Manifest-Count codes to add, then
+    X-Manifest-Removed-Count codes to drop. For a delta, pass the returned
+    X-Manifest-Max-Id as `since_id` and X-Manifest-Synced-At as
+    `changed_since`: tickets issued since are added, and tickets used at
+    another gate or invalidated since are removed. The ETag can be sent as
+    If-None-Match to skip unchanged downloads.
+    """
+    if current_user.verifier_id is None or not crud.get_event_verifiers(db, event_id=event_id, verifier_id=current_user.verifier_id):
+        raise HTTPException(status_code=403, detail="Verifier is not assigned to this event")
+    
+    max_id, synced_at, added, removed = crud.get_ticket_manifest(db, event_id=event_id, since_id=since_id, changed_since=changed_since)
+    codes = sorted(int(qr_code) for qr_code in added if qr_code.isdigit())
+    removed_codes = sorted(int(qr_code) for qr_code in removed if qr_code.isdigit())
+    body = struct.pack(f"<{len(codes) + len(removed_codes)}Q", *codes, *removed_codes)
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+    headers = {
+        "ETag": etag,
+        "X-Manifest-Count": str(len(codes)),
+        "X-Manifest-Removed-Count": str(len(removed_codes)),
+        "X-Manifest-Max-Id": str(max_id),
+        "X-Manifest-Synced-At": synced_at.isoformat(),
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/octet-stream", headers=headers)
+
+@router.get("/{event_id}/checkins", response_model=schemas.EventCheckIns)
+def read_event_checkins(
+    event_id: int,
+    minutes: int = Query(60, ge=1, le=1440),
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(auth.get_current_active_user)
+):
+    """Live entries per minute, in total and per verifier, slowest verifier first"""
+    db_event = crud.get_event(db, event_id=event_id)
+    if db_event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    # Only admin or the event organizer can follow the doors
+    if current_user.role.name != "Administrador" and current_user.organizer_id != db_event.organizer_id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    return checkin.event_checkins(db, event_id=event_id, minutes=minutes, monitor=checkin.monitor)
+
 @router.post("/", response_model=schemas.Event)
 def create_event(
     event: schemas.EventCreate,
     db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(auth.get_organizer_user)
+    current_user: schemas.Principal = Depends(auth.get_organizer_user)
 ):
     # Ensure the organizer is creating events for themselves
-    organizer = crud.get_organizer_by_user(db, user_id=current_user.id)
-    if not organizer:
+    if current_user.organizer_id is None:
         raise HTTPException(status_code=400, detail="User is not an organizer")
     
-    if organizer.id != event.organizer_id:
+    if current_user.organizer_id != event.organizer_id:
         raise HTTPException(status_code=403, detail="Can only create events for your own organization")
     
     return crud.create_event(db=db, event=event)
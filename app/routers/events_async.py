@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db
+from app import crud, crud_async, schemas, pagination, serialization
+
+# Async versions of the public event reads, mounted ahead of `events.router`
+# when Settings.use_async_db is enabled
+router = APIRouter(prefix="/events", tags=["events"])
+
+@router.get("/", response_model=List[schemas.EventWithDetails])
+async def read_events(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    category_id: Optional[int] = None,
+    organizer_id: Optional[int] = None,
+    status: Optional[str] = None,
+    district_id: Optional[int] = None,
+    province_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    end_from: Optional[datetime] = None,
+    end_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    filters = dict(
+        category_id=category_id, organizer_id=organizer_id, status=status, district_id=district_id,
+        province_id=province_id, department_id=department_id,
+        start_from=start_from, start_to=start_to, end_from=end_from, end_to=end_to,
+    )
+    if settings.fast_serialization:
+        query = serialization.select_event_rows(skip=skip, limit=limit, cursor=cursor, **filters)
+        rows = (await db.execute(query)).all()
+        return serialization.json_list_response(serialization.EVENT_SHAPE, rows, limit, crud.EVENT_ORDER)
+    
+    events = await crud_async.get_events(db, skip=skip, limit=limit, cursor=cursor, **filters)
+    pagination.set_next_cursor(response, events, limit, crud.EVENT_ORDER)
+    return events
+
+@router.get("/{event_id:int}", response_model=schemas.EventWithDetails)
+async def read_event(
+    event_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_event = await crud_async.get_event(db, event_id=event_id)
+    if db_event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return db_event
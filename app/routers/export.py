@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from app import schemas, auth, export
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Datasets not tied to events (claims, contact, reports) are admin only
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = "csv",
+    event_id: Optional[int] = None,
+    organizer_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    current_user: schemas.Principal = Depends(auth.require_role(["Administrador", "Organizador de Eventos"]))
+):
+    export_spec = export.DATASETS.get(dataset)
+    if export_spec is None:
+        raise HTTPException(status_code=404, detail=f"dataset must be one of: {', '.join(export.DATASETS)}")
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(export.FORMATS)}")
+
+    # Organizers can only export the data of their own events
+    if current_user.role.name != "Administrador":
+        if export_spec.organizer_column is None:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        if current_user.organizer_id is None:
+            raise HTTPException(status_code=400, detail="User is not an organizer")
+        organizer_id = current_user.organizer_id
+
+    if (event_id or organizer_id) and export_spec.event_column is None:
+        raise HTTPException(status_code=400, detail=f"{dataset} cannot be filtered by event or organizer")
+
+    statement = export_spec.statement(event_id=event_id, organizer_id=organizer_id, date_from=date_from, date_to=date_to)
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%dT%H%M%S}.{format}"
+    return StreamingResponse(
+        export.stream_export(statement, format),
+        media_type=export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
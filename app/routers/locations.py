@@ -1,25 +1,41 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.cache import reference_cache
 from app import crud, schemas
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
+departments_adapter = TypeAdapter(List[schemas.Department])
+provinces_adapter = TypeAdapter(List[schemas.ProvinceWithDepartment])
+districts_adapter = TypeAdapter(List[schemas.District])
+
 @router.get("/departments", response_model=List[schemas.Department])
-def read_departments(db: Session = Depends(get_db)):
-    return crud.get_departments(db)
+def read_departments(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.respond(
+        request, "departments", lambda: crud.get_departments(db), departments_adapter
+    )
 
 @router.get("/provinces", response_model=List[schemas.ProvinceWithDepartment])
 def read_provinces(
+    request: Request,
     department_id: int = None,
     db: Session = Depends(get_db)
 ):
-    return crud.get_provinces(db, department_id=department_id)
+    return reference_cache.respond(
+        request, ("provinces", department_id),
+        lambda: crud.get_provinces(db, department_id=department_id), provinces_adapter
+    )
 
 @router.get("/districts", response_model=List[schemas.District])
 def read_districts(
+    request: Request,
     province_id: int = None,
     db: Session = Depends(get_db)
 ):
-    return crud.get_districts(db, province_id=province_id)
+    return reference_cache.respond(
+        request, ("districts", province_id),
+        lambda: crud.get_districts(db, province_id=province_id), districts_adapter
+    )
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import crud, schemas, auth
@@ -26,6 +26,22 @@ def read_organizer(
         raise HTTPException(status_code=404, detail="Organizer not found")
     return db_organizer
 
+@router.get("/{organizer_id}/dashboard", response_model=schemas.OrganizerDashboard)
+def read_organizer_dashboard(
+    organizer_id: int,
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(auth.get_current_active_user)
+):
+    # Only admin or the organizer themselves can see their sales
+    if current_user.role.name != "Administrador" and current_user.organizer_id != organizer_id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    if crud.get_organizer(db, organizer_id=organizer_id) is None:
+        raise HTTPException(status_code=404, detail="Organizer not found")
+    
+    return crud.get_organizer_dashboard(db, organizer_id=organizer_id, days=days)
+
 @router.post("/", response_model=schemas.Organizer)
 def create_organizer(
     organizer: schemas.OrganizerCreate,
@@ -36,4 +36,14 @@ def create_purchase_detail(
     if current_user.role.name != "Administrador" and db_purchase.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return crud.create_purchase_detail(db=db, purchase_detail=purchase_detail)
+    db_ticket_type = crud.get_ticket_type(db, ticket_type_id=purchase_detail.ticket_type_id)
+    if not db_ticket_type:
+        raise HTTPException(status_code=404, detail="Ticket type not found")
+    
+    if db_ticket_type.event_id != db_purchase.event_id:
+        raise HTTPException(status_code=400, detail="Ticket type does not belong to the purchase's event")
+    
+    db_purchase_detail = crud.create_purchase_detail(db=db, purchase_detail=purchase_detail, ticket_type=db_ticket_type)
+    if db_purchase_detail is None:
+        raise HTTPException(status_code=409, detail="Not enough tickets available")
+    return db_purchase_detail
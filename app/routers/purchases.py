@@ -1,15 +1,18 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
-from app import crud, schemas, auth
+from app import crud, schemas, auth, pagination, serialization
 
 router = APIRouter(prefix="/purchases", tags=["purchases"])
 
 @router.get("/", response_model=List[schemas.PurchaseWithDetails])
 def read_purchases(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[int] = None,
     event_id: Optional[int] = None,
     db: Session = Depends(get_db),
@@ -19,7 +22,12 @@ def read_purchases(
     if current_user.role.name not in ["Administrador"] and user_id != current_user.id:
         user_id = current_user.id
     
-    return crud.get_purchases(db, user_id=user_id, event_id=event_id, skip=skip, limit=limit)
+    if settings.fast_serialization:
+        return serialization.purchases_response(db, user_id=user_id, event_id=event_id, skip=skip, limit=limit, cursor=cursor)
+    
+    purchases = crud.get_purchases(db, user_id=user_id, event_id=event_id, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor(response, purchases, limit, crud.PURCHASE_ORDER)
+    return purchases
 
 @router.get("/{purchase_id}", response_model=schemas.PurchaseWithDetails)
 def read_purchase(
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app import crud_async, schemas, auth
+
+# Async purchase read, mounted ahead of `purchases.router` when Settings.use_async_db is enabled
+router = APIRouter(prefix="/purchases", tags=["purchases"])
+
+@router.get("/{purchase_id:int}", response_model=schemas.PurchaseWithDetails)
+async def read_purchase(
+    purchase_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(auth.get_current_user_async)
+):
+    db_purchase = await crud_async.get_purchase(db, purchase_id=purchase_id)
+    if db_purchase is None:
+        raise HTTPException(status_code=404, detail="Purchase not found")
+    
+    # Check if user can access this purchase
+    if current_user.role.name != "Administrador" and db_purchase.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    return db_purchase
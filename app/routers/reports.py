@@ -1,15 +1,17 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import crud, schemas, auth
+from app import crud, schemas, auth, pagination
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 @router.get("/", response_model=List[schemas.ReportWithUser])
 def read_reports(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(auth.get_current_active_user)
@@ -18,7 +20,9 @@ def read_reports(
     if current_user.role.name != "Administrador" and user_id != current_user.id:
         user_id = current_user.id
     
-    return crud.get_reports(db, user_id=user_id, skip=skip, limit=limit)
+    reports = crud.get_reports(db, user_id=user_id, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor(response, reports, limit, crud.REPORT_ORDER)
+    return reports
 
 @router.get("/{report_id}", response_model=schemas.ReportWithUser)
 def read_report(
@@ -1,11 +1,17 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.cache import reference_cache
 from app import crud, schemas
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
+roles_adapter = TypeAdapter(List[schemas.Role])
+
 @router.get("/", response_model=List[schemas.Role])
-def read_roles(db: Session = Depends(get_db)):
-    return crud.get_roles(db)
+def read_roles(request: Request, db: Session = Depends(get_db)):
+    return reference_cache.respond(
+        request, "roles", lambda: crud.get_roles(db), roles_adapter
+    )
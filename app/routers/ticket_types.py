@@ -56,7 +56,10 @@ def update_ticket_type(
     if current_user.role.name != "Administrador" and db_event.organizer_user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return crud.update_ticket_type(db=db, ticket_type_id=ticket_type_id, ticket_type_update=ticket_type_update)
+    db_ticket_type = crud.update_ticket_type(db=db, ticket_type_id=ticket_type_id, ticket_type_update=ticket_type_update)
+    if db_ticket_type is None:
+        raise HTTPException(status_code=400, detail="Capacity cannot be lower than tickets already sold")
+    return db_ticket_type
 
 @router.delete("/{ticket_type_id}")
 def delete_ticket_type(
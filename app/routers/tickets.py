@@ -1,15 +1,18 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
-from app import crud, schemas, auth
+from app import crud, schemas, auth, pagination, serialization
 
 router = APIRouter(prefix="/tickets", tags=["tickets"])
 
 @router.get("/", response_model=List[schemas.Ticket])
 def read_tickets(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     purchase_id: Optional[int] = None,
     user_id: Optional[int] = None,
     db: Session = Depends(get_db),
@@ -19,7 +22,12 @@ def read_tickets(
     if current_user.role.name not in ["Administrador", "Verificador / Validador de Entrada"] and user_id != current_user.id:
         user_id = current_user.id
     
-    return crud.get_tickets(db, purchase_id=purchase_id, user_id=user_id, skip=skip, limit=limit)
+    if settings.fast_serialization:
+        return serialization.tickets_response(db, purchase_id=purchase_id, user_id=user_id, skip=skip, limit=limit, cursor=cursor)
+    
+    tickets = crud.get_tickets(db, purchase_id=purchase_id, user_id=user_id, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor(response, tickets, limit, crud.TICKET_ORDER)
+    return tickets
 
 @router.get("/{ticket_id}", response_model=schemas.Ticket)
 def read_ticket(
@@ -50,6 +58,41 @@ def read_ticket_by_qr(
     
     return db_ticket
 
+@router.post("/scan", response_model=schemas.TicketScanResult)
+def scan_ticket(
+    scan: schemas.TicketScan,
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(auth.get_verifier_user)
+):
+    if current_user.verifier_id is None:
+        raise HTTPException(status_code=403, detail="User is not a verifier")
+    
+    result, repeat, db_ticket = crud.scan_ticket(
+        db, qr_code=scan.qr_code, verifier_id=current_user.verifier_id, event_id=scan.event_id, device_id=scan.device_id
+    )
+    return {"result": result, "repeat": repeat, "ticket": db_ticket}
+
+@router.post("/scan/batch", response_model=schemas.TicketScanBatchResult)
+def scan_tickets_batch(
+    batch: schemas.TicketScanBatch,
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(auth.get_verifier_user)
+):
+    if current_user.verifier_id is None:
+        raise HTTPException(status_code=403, detail="User is not a verifier")
+    
+    if not crud.get_event_verifiers(db, event_id=batch.event_id, verifier_id=current_user.verifier_id):
+        raise HTTPException(status_code=403, detail="Verifier is not assigned to this event")
+    
+    results = crud.scan_tickets_batch(
+        db, event_id=batch.event_id, verifier_id=current_user.verifier_id, scans=batch.scans, device_id=batch.device_id
+    )
+    return {
+        "accepted": sum(1 for item in results if item["result"] == crud.SCAN_ACCEPTED and not item.get("repeat")),
+        "double_scans": sum(1 for item in results if item["result"] == crud.SCAN_ALREADY_USED),
+        "results": results,
+    }
+
 @router.post("/", response_model=schemas.Ticket)
 def create_ticket(
     purchase_id: int,
@@ -65,7 +108,30 @@ def create_ticket(
     if current_user.role.name != "Administrador" and db_purchase.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    return crud.create_ticket(db=db, purchase_id=purchase_id)
+    db_ticket = crud.create_ticket(db=db, purchase_id=purchase_id)
+    if db_ticket is None:
+        raise HTTPException(status_code=400, detail="Every ticket of this purchase has already been issued")
+    return db_ticket
+
+@router.post("/bulk", response_model=schemas.TicketBulkResult)
+def create_tickets(
+    tickets: schemas.TicketBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: schemas.Principal = Depends(auth.require_role(["Administrador", "Organizador de Eventos"]))
+):
+    # Verify purchase exists
+    db_purchase = crud.get_purchase(db, purchase_id=tickets.purchase_id)
+    if not db_purchase:
+        raise HTTPException(status_code=404, detail="Purchase not found")
+    
+    # Organizers can only issue tickets for their own events
+    if current_user.role.name != "Administrador" and db_purchase.event.organizer_id != current_user.organizer_id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    qr_codes = crud.create_tickets(db=db, purchase_id=tickets.purchase_id, quantity=tickets.quantity)
+    if qr_codes is None:
+        raise HTTPException(status_code=400, detail="Quantity exceeds the tickets bought on this purchase and not yet issued")
+    return {"purchase_id": tickets.purchase_id, "quantity": len(qr_codes), "qr_codes": qr_codes}
 
 @router.patch("/{ticket_id}", response_model=schemas.Ticket)
 def update_ticket(
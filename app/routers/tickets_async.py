@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app import crud_async, schemas, auth
+
+# Async gate scan, mounted ahead of `tickets.router` when Settings.use_async_db is enabled
+router = APIRouter(prefix="/tickets", tags=["tickets"])
+
+@router.post("/scan", response_model=schemas.TicketScanResult)
+async def scan_ticket(
+    scan: schemas.TicketScan,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(auth.get_verifier_user_async)
+):
+    if current_user.verifier_id is None:
+        raise HTTPException(status_code=403, detail="User is not a verifier")
+    
+    result, repeat, db_ticket = await crud_async.scan_ticket(
+        db, qr_code=scan.qr_code, verifier_id=current_user.verifier_id, event_id=scan.event_id, device_id=scan.device_id
+    )
+    return {"result": result, "repeat": repeat, "ticket": db_ticket}
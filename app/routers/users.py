@@ -1,19 +1,22 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import crud, schemas, auth
+from app import crud, schemas, auth, pagination
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=List[schemas.UserWithRole])
 def read_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(auth.get_admin_user)
 ):
-    users = crud.get_users(db, skip=skip, limit=limit)
+    users = crud.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    pagination.set_next_cursor(response, users, limit, crud.USER_ORDER)
     return users
 
 @router.get("/{user_id}", response_model=schemas.UserWithRole)
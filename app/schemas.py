@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Optional, List, Dict
+from datetime import date, datetime, timezone
 from decimal import Decimal
 
 # Department schemas
@@ -92,6 +92,11 @@ class User(UserBase):
 class UserWithRole(User):
     role: Role
 
+class Principal(UserWithRole):
+    """Authenticated user as resolved (and cached) by auth.get_current_user"""
+    organizer_id: Optional[int] = None
+    verifier_id: Optional[int] = None
+
 # Organizer schemas
 class OrganizerBase(BaseModel):
     document_type: str
@@ -180,10 +185,53 @@ class Event(EventBase):
     class Config:
         from_attributes = True
 
+class EventRatingStats(BaseModel):
+    rating_count: int
+    rating_sum: int
+    average: Optional[float] = None
+    histogram: List[int]
+    
+    class Config:
+        from_attributes = True
+
 class EventWithDetails(Event):
     district: District
     category: Category
     organizer: Organizer
+    rating_stats: Optional[EventRatingStats] = None
+
+class EventSearchHit(BaseModel):
+    score: float
+    event: EventWithDetails
+
+class EventSearchFacets(BaseModel):
+    categories: Dict[int, int]
+    districts: Dict[int, int]
+    dates: Dict[str, int]
+
+class EventSearchResult(BaseModel):
+    total: int
+    items: List[EventSearchHit]
+    facets: EventSearchFacets
+
+class VerifierCheckIns(BaseModel):
+    verifier_id: int
+    entries: int
+    entries_per_minute: List[int]
+    current_rate: float
+    last_scan_at: Optional[datetime] = None
+    idle_seconds: Optional[float] = None
+    sync_lag_seconds: float
+
+class EventCheckIns(BaseModel):
+    event_id: int
+    window_minutes: int
+    first_minute: datetime
+    entries: int
+    entries_per_minute: List[int]
+    current_rate: float
+    slowest_verifier_id: Optional[int] = None
+    verifiers: List[VerifierCheckIns]
 
 # EventVerifier schemas
 class EventVerifierBase(BaseModel):
@@ -216,6 +264,8 @@ class TicketTypeUpdate(BaseModel):
 
 class TicketType(TicketTypeBase):
     id: int
+    sold: int
+    remaining: int
     
     class Config:
         from_attributes = True
@@ -244,12 +294,14 @@ class PurchaseWithDetails(Purchase):
 class PurchaseDetailBase(BaseModel):
     purchase_id: int
     ticket_type_id: int
-    quantity: int
+    quantity: int = Field(..., gt=0)
     unit_price: Decimal
     subtotal: Decimal
 
 class PurchaseDetailCreate(PurchaseDetailBase):
-    pass
+    # Priced from the ticket type on the server; values sent here are ignored
+    unit_price: Optional[Decimal] = None
+    subtotal: Optional[Decimal] = None
 
 class PurchaseDetail(PurchaseDetailBase):
     id: int
@@ -266,6 +318,15 @@ class TicketBase(BaseModel):
 class TicketCreate(TicketBase):
     pass
 
+class TicketBulkCreate(BaseModel):
+    purchase_id: int
+    quantity: int = Field(..., gt=0, le=100000)
+
+class TicketBulkResult(BaseModel):
+    purchase_id: int
+    quantity: int
+    qr_codes: List[str]
+
 class TicketUpdate(BaseModel):
     status: Optional[str] = None
     verifier_id: Optional[int] = None
@@ -280,6 +341,58 @@ class Ticket(TicketBase):
     class Config:
         from_attributes = True
 
+class TicketScan(BaseModel):
+    qr_code: str
+    event_id: Optional[int] = None
+    device_id: Optional[str] = Field(None, max_length=100)
+
+class TicketScanResult(BaseModel):
+    result: str  # accepted, already_used, invalid
+    repeat: bool = False
+    ticket: Optional[Ticket] = None
+
+class OfflineScan(BaseModel):
+    qr_code: str
+    scanned_at: datetime
+
+    @field_validator("scanned_at")
+    @classmethod
+    def scanned_at_naive_utc(cls, scanned_at: datetime) -> datetime:
+        # Devices may send offsets; scans are sorted and stored as naive UTC
+        if scanned_at.tzinfo is not None:
+            scanned_at = scanned_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return scanned_at
+
+class TicketScanBatch(BaseModel):
+    event_id: int
+    device_id: Optional[str] = Field(None, max_length=100)
+    scans: List[OfflineScan] = Field(..., min_length=1, max_length=5000)
+
+class TicketScanBatchItem(BaseModel):
+    qr_code: str
+    result: str
+    repeat: bool = False
+    verifier_id: Optional[int] = None
+    used_at: Optional[datetime] = None
+
+class TicketScanBatchResult(BaseModel):
+    accepted: int
+    double_scans: int
+    results: List[TicketScanBatchItem]
+
+# Checkout schemas
+class CheckoutItem(BaseModel):
+    ticket_type_id: int
+    quantity: int = Field(..., gt=0)
+
+class CheckoutCreate(BaseModel):
+    event_id: int
+    items: List[CheckoutItem] = Field(..., min_length=1)
+
+class PurchaseWithTickets(Purchase):
+    details: List[PurchaseDetail]
+    tickets: List[Ticket]
+
 # Report schemas
 class ReportBase(BaseModel):
     user_id: int
@@ -399,6 +512,43 @@ class Claim(ClaimBase):
 class ClaimWithDistrict(Claim):
     district: DistrictWithProvince
 
+# Organizer dashboard schemas
+class SalesTotals(BaseModel):
+    revenue: Decimal
+    purchases: int
+    tickets_sold: int
+    tickets_issued: int
+    tickets_scanned: int
+    check_in_rate: Optional[float] = None
+
+class TicketTypeSales(BaseModel):
+    id: int
+    name: str
+    price: Decimal
+    capacity: int
+    sold: int
+    remaining: int
+    revenue: Decimal
+
+class EventSales(SalesTotals):
+    event_id: int
+    title: str
+    start_date: datetime
+    status: str
+    ticket_types: List[TicketTypeSales]
+
+class DailySales(BaseModel):
+    day: date
+    revenue: Decimal
+    purchases: int
+    tickets_sold: int
+
+class OrganizerDashboard(BaseModel):
+    organizer_id: int
+    totals: SalesTotals
+    events: List[EventSales]
+    sales_per_day: List[DailySales]
+
 # Authentication schemas
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,339 @@
+import bisect
+import heapq
+import itertools
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models
+
+TOKEN_RE = re.compile(r"\w+")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+DATE_BUCKETS = ["past", "today", "this_week", "this_month", "later"]
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase, accent-insensitive word tokens"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return TOKEN_RE.findall(text)
+
+def date_bucket_bounds(now: Optional[datetime] = None) -> List[Tuple[str, datetime]]:
+    """Exclusive upper bound of every date bucket but the last ("later")"""
+    now = now or datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return [
+        ("past", today),
+        ("today", today + timedelta(days=1)),
+        ("this_week", today + timedelta(days=7)),
+        ("this_month", today + timedelta(days=30)),
+    ]
+
+def date_bucket(start_date: datetime, bounds: List[Tuple[str, datetime]]) -> str:
+    for name, bound in bounds:
+        if start_date < bound:
+            return name
+    return "later"
+
+# Matches scored one by one below this; above it the top hits come from the
+# impact-ordered postings (threshold algorithm) and stop early
+EXHAUSTIVE_MATCHES = 2000
+
+# Document norms use a reference average length, recomputed when the real
+# average drifts further than this so a write does not re-normalize the index
+LENGTH_DRIFT = 0.1
+
+def _overlaps(matches: set, groups: Dict[int, set]) -> Counter:
+    """How many of `matches` fall in each group that any of them falls in"""
+    counts = Counter()
+    for key, members in groups.items():
+        count = len(matches & members)
+        if count:
+            counts[key] = count
+    return counts
+
+class _Snapshot:
+    """One version of the index; never changed once published.
+
+    Searches read the current snapshot without locking. A write copies the
+    top-level maps into the next snapshot, copies only the postings and
+    facet groups it changes, and swaps it in. `ranked` (impact-ordered
+    postings per term) and `buckets` (events per date bucket for the current
+    day) are caches filled in on first use; a write patches the impact
+    orders of the terms it changes rather than dropping them.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.terms: Dict[int, Counter] = {}
+        self.lengths: Dict[int, int] = {}
+        self.norms: Dict[int, float] = {}
+        self.categories: Dict[int, int] = {}
+        self.districts: Dict[int, int] = {}
+        self.by_category: Dict[int, set] = {}
+        self.by_district: Dict[int, set] = {}
+        # Start dates in order, with the event of each
+        self.start_dates: List[datetime] = []
+        self.start_ids: List[int] = []
+        self.total_length = 0
+        self.reference_length = 0.0
+        self.ranked: Dict[str, List[Tuple[float, int]]] = {}
+        self.buckets: Optional[Tuple[tuple, List[set]]] = None
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple]) -> "_Snapshot":
+        snapshot, starts = cls(), []
+        for row in rows:
+            snapshot._add(*row[:6])
+            starts.append((row[6], row[0]))
+        starts.sort()
+        snapshot.start_dates = [start for start, _ in starts]
+        snapshot.start_ids = [event_id for _, event_id in starts]
+        snapshot._normalize()
+        return snapshot
+
+    def updated(self, changes: Dict[int, Optional[tuple]]) -> "_Snapshot":
+        """A new snapshot with events re-indexed from their rows, or removed when the row is None"""
+        new = _Snapshot()
+        new.postings, new.terms, new.lengths, new.norms = dict(self.postings), dict(self.terms), dict(self.lengths), dict(self.norms)
+        new.categories, new.districts = dict(self.categories), dict(self.districts)
+        new.by_category, new.by_district = dict(self.by_category), dict(self.by_district)
+        new.start_dates, new.start_ids = list(self.start_dates), list(self.start_ids)
+        new.total_length, new.reference_length = self.total_length, self.reference_length
+        new.ranked = dict(self.ranked)
+
+        copied = set()
+        for event_id, row in changes.items():
+            if event_id in new.terms:
+                new._remove(event_id, copied)
+                position = new.start_ids.index(event_id)
+                del new.start_dates[position], new.start_ids[position]
+            if row is not None:
+                new._add(*row[:6], copied=copied)
+                position = bisect.bisect_right(new.start_dates, row[6])
+                new.start_dates.insert(position, row[6])
+                new.start_ids.insert(position, event_id)
+        for kind, key in copied:
+            groups = {"term": new.postings, "category": new.by_category, "district": new.by_district}[kind]
+            if not groups[key]:
+                del groups[key]
+
+        average = new.total_length / len(new.lengths) if new.lengths else 0.0
+        if not new.reference_length or abs(average - new.reference_length) > LENGTH_DRIFT * new.reference_length:
+            new._normalize()
+            return new
+        for event_id in changes:
+            if event_id in new.lengths:
+                new.norms[event_id] = new._norm(new.lengths[event_id])
+        for kind, term in copied:
+            if kind == "term" and term in self.ranked:
+                new.ranked[term] = self._reranked(new, term, changes)
+        return new
+
+    def _reranked(self, new: "_Snapshot", term: str, changes) -> List[Tuple[float, int]]:
+        """This snapshot's impact order of `term` with the changed events moved to their place in `new`"""
+        ranked = list(self.ranked[term])
+        before, after = self.postings.get(term, {}), new.postings.get(term, {})
+        for event_id in changes:
+            if event_id in before:
+                del ranked[bisect.bisect_left(ranked, (-self._impact(event_id, before[event_id]), event_id))]
+            if event_id in after:
+                bisect.insort(ranked, (-new._impact(event_id, after[event_id]), event_id))
+        return ranked
+
+    @staticmethod
+    def _writable(groups: dict, kind: str, key, copied: Optional[set], empty):
+        # A group shared with the previous snapshot is copied before its first change;
+        # `copied` is None while building, when nothing is shared
+        value = groups.get(key)
+        if value is None or (copied is not None and (kind, key) not in copied):
+            value = groups[key] = type(empty)(value or empty)
+            if copied is not None:
+                copied.add((kind, key))
+        return value
+
+    def _add(self, event_id, title, description, location_description, category_id, district_id, copied=None):
+        terms = Counter(tokenize(title) + tokenize(description) + tokenize(location_description))
+        for term, frequency in terms.items():
+            self._writable(self.postings, "term", term, copied, {})[event_id] = frequency
+        self._writable(self.by_category, "category", category_id, copied, set()).add(event_id)
+        self._writable(self.by_district, "district", district_id, copied, set()).add(event_id)
+        length = sum(terms.values())
+        self.terms[event_id] = terms
+        self.lengths[event_id] = length
+        self.categories[event_id] = category_id
+        self.districts[event_id] = district_id
+        self.total_length += length
+
+    def _remove(self, event_id, copied: set):
+        for term in self.terms.pop(event_id):
+            self._writable(self.postings, "term", term, copied, {}).pop(event_id, None)
+        self._writable(self.by_category, "category", self.categories.pop(event_id), copied, set()).discard(event_id)
+        self._writable(self.by_district, "district", self.districts.pop(event_id), copied, set()).discard(event_id)
+        self.total_length -= self.lengths.pop(event_id)
+        self.norms.pop(event_id, None)
+
+    def _norm(self, length: int) -> float:
+        return K1 * (1 - B + B * length / self.reference_length)
+
+    def _normalize(self):
+        self.reference_length = (self.total_length / len(self.lengths)) if self.lengths else 0.0
+        self.norms = {event_id: self._norm(length) for event_id, length in self.lengths.items()} if self.reference_length else {}
+        self.ranked = {}
+
+    def _impact(self, event_id: int, frequency: int) -> float:
+        return frequency * (K1 + 1) / (frequency + self.norms[event_id])
+
+    def _ranked(self, term: str) -> List[Tuple[float, int]]:
+        """(-impact, event_id) postings of a term, highest impact first"""
+        ranked = self.ranked.get(term)
+        if ranked is None:
+            impact = self._impact
+            ranked = sorted((-impact(event_id, frequency), event_id) for event_id, frequency in self.postings[term].items())
+            self.ranked[term] = ranked
+        return ranked
+
+    def _buckets(self) -> List[set]:
+        """Events per date bucket, in DATE_BUCKETS order"""
+        bounds = tuple(bound for _, bound in date_bucket_bounds())
+        cached = self.buckets
+        if cached is None or cached[0] != bounds:
+            cuts = [0, *(bisect.bisect_left(self.start_dates, bound) for bound in bounds), len(self.start_ids)]
+            cached = self.buckets = (bounds, [set(self.start_ids[low:high]) for low, high in zip(cuts, cuts[1:])])
+        return cached[1]
+
+    def _score(self, event_id: int, weights: List[Tuple[float, Dict[int, int]]]) -> float:
+        score = 0.0
+        for idf, postings in weights:
+            frequency = postings.get(event_id)
+            if frequency:
+                score += idf * self._impact(event_id, frequency)
+        return score
+
+    def _top(self, weights, ranked, matches: set, count: int) -> List[Tuple[float, int]]:
+        """The `count` best (score, -event_id) among `matches`, walking the impact-ordered
+        postings of every term in step until no unseen event can beat the last of them"""
+        top, seen = [], set()
+        for depth in itertools.count():
+            threshold, exhausted = 0.0, True
+            for (idf, _), postings in zip(weights, ranked):
+                if depth >= len(postings):
+                    continue
+                exhausted = False
+                negative_impact, event_id = postings[depth]
+                threshold -= idf * negative_impact
+                if event_id in seen or event_id not in matches:
+                    continue
+                seen.add(event_id)
+                hit = (self._score(event_id, weights), -event_id)
+                if len(top) < count:
+                    heapq.heappush(top, hit)
+                elif hit > top[0]:
+                    heapq.heapreplace(top, hit)
+            if exhausted or (len(top) == count and top[0][0] > threshold):
+                return sorted(top, reverse=True)
+
+    def search(self, query, category_id, district_id, date, skip, limit):
+        terms, weights = [], []
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if postings:
+                idf = math.log(1 + (len(self.lengths) - len(postings) + 0.5) / (len(postings) + 0.5))
+                terms.append(term)
+                weights.append((idf, postings))
+
+        matches = set().union(*(postings for _, postings in weights))
+        if category_id:
+            matches &= self.by_category.get(category_id, set())
+        if district_id:
+            matches &= self.by_district.get(district_id, set())
+        buckets = self._buckets()
+        if date:
+            matches &= buckets[DATE_BUCKETS.index(date)]
+
+        facets = {
+            "categories": _overlaps(matches, self.by_category),
+            "districts": _overlaps(matches, self.by_district),
+            "dates": Counter({DATE_BUCKETS[index]: count for index, count in _overlaps(matches, dict(enumerate(buckets))).items()}),
+        }
+        count = skip + limit
+        if count <= 0 or not matches:
+            top = []
+        elif len(matches) <= EXHAUSTIVE_MATCHES:
+            top = heapq.nlargest(count, ((self._score(event_id, weights), -event_id) for event_id in matches))
+        else:
+            top = self._top(weights, [self._ranked(term) for term in terms], matches, count)
+        return len(matches), [(-event_id, score) for score, event_id in top[skip:]], facets
+
+class EventSearchIndex:
+    """In-process inverted index over event title, description and location.
+
+    Used when the database has no native full-text support (SQLite). It is
+    loaded lazily on the first search and then kept current by the event
+    write paths in `crud`. Writers serialize on a lock and publish immutable
+    snapshots; searches never wait for them.
+    """
+
+    def __init__(self):
+        self._snapshot = _Snapshot()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load(db.execute(select(
+                models.Event.id, models.Event.title, models.Event.description,
+                models.Event.location_description, models.Event.category_id,
+                models.Event.district_id, models.Event.start_date,
+            )))
+
+    def load(self, rows: Iterable[tuple]):
+        """Replace the index with (id, title, description, location, category_id, district_id, start_date) rows"""
+        with self._lock:
+            self._load(rows)
+
+    def _load(self, rows):
+        self._snapshot = _Snapshot.build(rows)
+        self._loaded = True
+
+    def add(self, event: models.Event):
+        """Index or re-index an event; a no-op until the index has been loaded"""
+        with self._lock:
+            if self._loaded:
+                self._snapshot = self._snapshot.updated({event.id: (
+                    event.id, event.title, event.description, event.location_description,
+                    event.category_id, event.district_id, event.start_date,
+                )})
+
+    def remove(self, event_id: int):
+        with self._lock:
+            if self._loaded:
+                self._snapshot = self._snapshot.updated({event_id: None})
+
+    def search(
+        self,
+        query: str,
+        category_id: Optional[int] = None,
+        district_id: Optional[int] = None,
+        date: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+    ):
+        """Return (total, [(event_id, score)], facets) ranked by BM25"""
+        return self._snapshot.search(query, category_id, district_id, date, skip, limit)
+
+event_index = EventSearchIndex()
@@ -0,0 +1,138 @@
+"""Fast serialization path for large list responses.
+
+The regular list endpoints load ORM objects, validate each one through the
+`from_attributes` schema and encode the result with the stdlib JSON encoder.
+Here the list is selected as plain row tuples in schema field order, mapped
+straight to dicts and encoded by pydantic-core, which writes `Decimal` and
+`datetime` exactly as the regular path does. Enabled with
+Settings.fast_serialization.
+"""
+from typing import Iterator, List, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import crud, models, schemas
+from app.pagination import NEXT_CURSOR_HEADER, encode_cursor, paginate
+
+class RowShape:
+    """Maps a flat row-tuple select onto the JSON shape of a response schema.
+
+    `nested` maps a schema field to the shape of the joined entity that fills
+    it; every other field is read from the column of the same name.
+    """
+
+    def __init__(self, schema, entity, nested: Optional[dict] = None):
+        self.entity = entity
+        self.nested = nested or {}
+        self.fields = list(schema.model_fields)
+
+    def columns(self, prefix: str = "") -> list:
+        columns = []
+        for name in self.fields:
+            if name in self.nested:
+                columns += self.nested[name].columns(f"{prefix}{name}__")
+            else:
+                columns.append(getattr(self.entity, name).label(f"{prefix}{name}"))
+        return columns
+
+    def build(self, values: Iterator) -> dict:
+        return {
+            name: self.nested[name].build(values) if name in self.nested else next(values)
+            for name in self.fields
+        }
+
+class RatingStatsShape:
+    """EventRatingStats from an outer join; mirrors the model's computed properties"""
+    SCORES = ("score_1", "score_2", "score_3", "score_4", "score_5")
+
+    def columns(self, prefix: str = "") -> list:
+        stats = models.EventRatingStats
+        return [
+            getattr(stats, name).label(f"{prefix}{name}")
+            for name in ("rating_count", "rating_sum", *self.SCORES)
+        ]
+
+    def build(self, values: Iterator) -> Optional[dict]:
+        rating_count, rating_sum, *histogram = (next(values) for _ in range(2 + len(self.SCORES)))
+        if rating_count is None:
+            return None
+        return {
+            "rating_count": rating_count,
+            "rating_sum": rating_sum,
+            "average": round(rating_sum / rating_count, 2) if rating_count else None,
+            "histogram": histogram,
+        }
+
+EVENT_SHAPE = RowShape(schemas.EventWithDetails, models.Event, {
+    "district": RowShape(schemas.District, models.District),
+    "category": RowShape(schemas.Category, models.Category),
+    "organizer": RowShape(schemas.Organizer, models.Organizer),
+    "rating_stats": RatingStatsShape(),
+})
+PURCHASE_SHAPE = RowShape(schemas.PurchaseWithDetails, models.Purchase, {
+    "event": RowShape(schemas.Event, models.Event),
+    "user": RowShape(schemas.User, models.User),
+})
+TICKET_SHAPE = RowShape(schemas.Ticket, models.Ticket)
+
+# Pre-built adapters for validating ORM lists outside FastAPI's per-request
+# model field handling (see benchmarks/serialization.py)
+EVENT_LIST = TypeAdapter(List[schemas.EventWithDetails])
+PURCHASE_LIST = TypeAdapter(List[schemas.PurchaseWithDetails])
+TICKET_LIST = TypeAdapter(List[schemas.Ticket])
+
+def dump_orm_list(adapter: TypeAdapter, items) -> bytes:
+    return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+def json_list_response(shape, rows, limit: int, order) -> Response:
+    """Encode the rows of a page; the cursor header goes on the returned Response"""
+    response = Response(to_json([shape.build(iter(row)) for row in rows]), media_type="application/json")
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in order])
+    return response
+
+def select_event_rows(skip: int = 0, limit: int = 100, cursor: Optional[str] = None, **filters):
+    """Row-tuple counterpart of crud.select_events; shared by the sync and async routers"""
+    query = (
+        select(*EVENT_SHAPE.columns())
+        .join(models.District, models.Event.district_id == models.District.id)
+        .join(models.Category, models.Event.category_id == models.Category.id)
+        .join(models.Organizer, models.Event.organizer_id == models.Organizer.id)
+        .outerjoin(models.EventRatingStats, models.EventRatingStats.event_id == models.Event.id)
+    )
+    return paginate(crud.filter_events(query, **filters), crud.EVENT_ORDER, skip=skip, limit=limit, cursor=cursor)
+
+def events_response(db: Session, limit: int = 100, **filters) -> Response:
+    rows = db.execute(select_event_rows(limit=limit, **filters)).all()
+    return json_list_response(EVENT_SHAPE, rows, limit, crud.EVENT_ORDER)
+
+def select_purchase_rows(user_id: Optional[int] = None, event_id: Optional[int] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = (
+        select(*PURCHASE_SHAPE.columns())
+        .join(models.Event, models.Purchase.event_id == models.Event.id)
+        .join(models.User, models.Purchase.user_id == models.User.id)
+    )
+    if user_id:
+        query = query.filter(models.Purchase.user_id == user_id)
+    if event_id:
+        query = query.filter(models.Purchase.event_id == event_id)
+    return paginate(query, crud.PURCHASE_ORDER, skip=skip, limit=limit, cursor=cursor)
+
+def purchases_response(db: Session, limit: int = 100, **filters) -> Response:
+    rows = db.execute(select_purchase_rows(limit=limit, **filters)).all()
+    return json_list_response(PURCHASE_SHAPE, rows, limit, crud.PURCHASE_ORDER)
+
+def select_ticket_rows(purchase_id: Optional[int] = None, user_id: Optional[int] = None, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = select(*TICKET_SHAPE.columns())
+    if purchase_id:
+        query = query.filter(models.Ticket.purchase_id == purchase_id)
+    if user_id:
+        query = query.join(models.Purchase, models.Ticket.purchase_id == models.Purchase.id).filter(models.Purchase.user_id == user_id)
+    return paginate(query, crud.TICKET_ORDER, skip=skip, limit=limit, cursor=cursor)
+
+def tickets_response(db: Session, limit: int = 100, **filters) -> Response:
+    rows = db.execute(select_ticket_rows(limit=limit, **filters)).all()
+    return json_list_response(TICKET_SHAPE, rows, limit, crud.TICKET_ORDER)
@@ -0,0 +1,103 @@
+"""
+Closed-loop HTTP load generator (stdlib only)
+"""
+import http.client
+import json
+import math
+import threading
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+def percentile(sorted_values, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize(latencies, outcomes: Counter, elapsed: float, errors: int) -> dict:
+    latencies = sorted(latencies)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(latencies[-1]) if latencies else None,
+        },
+        "outcomes": dict(outcomes),
+    }
+
+def run_load(
+    host: str,
+    port: int,
+    next_request: Callable,
+    concurrency: int,
+    duration: Optional[float] = None,
+    total_requests: Optional[int] = None,
+    classify: Optional[Callable] = None,
+    timeout: float = 60,
+) -> dict:
+    """Run `concurrency` workers, each sending one request at a time over a keep-alive connection.
+
+    `next_request(worker)` returns (method, path, body, headers), or None when
+    the scenario has nothing left to send. Stops after `duration` seconds or
+    `total_requests` requests, whichever comes first. `classify(status, body)`
+    labels each response for the outcome counts (the status code by default).
+    """
+    latencies, outcomes, lock = [], Counter(), threading.Lock()
+    errors = 0
+    remaining = [total_requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def take_slot() -> bool:
+        if remaining[0] is None:
+            return True
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(index: int):
+        nonlocal errors
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        local_latencies, local_outcomes = [], Counter()
+        while (deadline is None or time.perf_counter() < deadline) and take_slot():
+            request = next_request(index)
+            if request is None:
+                break
+            method, path, body, headers = request
+            payload = json.dumps(body).encode() if body is not None else None
+            headers = {"Content-Type": "application/json", **(headers or {})}
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=timeout)
+                continue
+            local_latencies.append(time.perf_counter() - start)
+            local_outcomes[classify(response.status, data) if classify else str(response.status)] += 1
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            outcomes.update(local_outcomes)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, outcomes, time.perf_counter() - start, errors)
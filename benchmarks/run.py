@@ -0,0 +1,119 @@
+"""
+Run the load benchmarks
+
+    python -m benchmarks.run --scale small --scenarios catalog,auth,scan
+    python -m benchmarks.run --db-stack both --compare benchmarks/results/<previous>.json
+
+Seeds a fresh SQLite database (or the database given with --database-url,
+which is wiped), starts uvicorn against it for every DB stack, runs the
+scenarios and writes the results as JSON under benchmarks/results/.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.server import ROOT
+
+DEFAULT_SCENARIOS = "catalog,auth,login,checkout,scan,issuance"
+
+def git_revision() -> dict:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+def run_stack(stack: str, args, env: dict) -> dict:
+    from benchmarks import seed
+    from benchmarks.load import run_load
+    from benchmarks.scenarios import SCENARIOS
+    from benchmarks.server import Server
+
+    print(f"[{stack}] seeding {args.scale} database...", flush=True)
+    start = time.perf_counter()
+    fixtures = seed.seed(args.scale, args.seed)
+    result = {"seed_seconds": round(time.perf_counter() - start, 2), "scenarios": {}}
+
+    server_env = {**env, "USE_ASYNC_DB": "true" if stack == "async" else "false"}
+    with Server(server_env, workers=args.workers) as server:
+        result["startup_seconds"] = round(server.startup_seconds, 3)
+        for name in args.scenarios.split(","):
+            scenario = SCENARIOS[name](fixtures, args.seed)
+            concurrency = scenario.concurrency or args.concurrency
+            print(f"[{stack}] {name}: {concurrency} workers...", flush=True)
+            stats = run_load(
+                server.host, server.port, scenario.next_request, concurrency,
+                duration=None if scenario.total_requests else args.duration,
+                total_requests=scenario.total_requests,
+                classify=scenario.classify,
+            )
+            stats["concurrency"] = concurrency
+            stats.update(scenario.verify())
+            result["scenarios"][name] = stats
+            latency = stats["latency_ms"]
+            print(
+                f"[{stack}] {name}: {stats['throughput_rps']} req/s, p50 {latency['p50']} ms, "
+                f"p95 {latency['p95']} ms, p99 {latency['p99']} ms, outcomes {stats['outcomes']}",
+                flush=True,
+            )
+    return result
+
+def compare(previous: dict, current: dict):
+    print(f"\nCompared with {previous['revision']['commit']} ({previous['timestamp']}):")
+    for stack, result in current["stacks"].items():
+        before_stack = previous["stacks"].get(stack, {}).get("scenarios", {})
+        for name, stats in result["scenarios"].items():
+            before = before_stack.get(name)
+            if not before:
+                continue
+            change = lambda new, old: f"{(new - old) / old * 100:+.1f}%" if new is not None and old else "n/a"
+            print(
+                f"  {stack:5} {name:9} throughput {change(stats['throughput_rps'], before['throughput_rps']):>8}"
+                f"  p99 {change(stats['latency_ms']['p99'], before['latency_ms']['p99']):>8}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Suyay Events load benchmarks")
+    parser.add_argument("--scale", default="small", choices=["small", "medium", "large"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per scenario")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--db-stack", default="sync", choices=["sync", "async", "both"])
+    parser.add_argument("--database-url", help="database to wipe and seed (default: a local SQLite file)")
+    parser.add_argument("--output-dir", default=os.path.join(ROOT, "benchmarks", "results"))
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    database_url = args.database_url or f"sqlite:///{os.path.join(args.output_dir, f'bench-{args.scale}.db')}"
+    env = {"DATABASE_URL": database_url, "SECRET_KEY": "benchmark", "ENVIRONMENT": "benchmark"}
+    # The seeding and token helpers import the app, which reads its settings from the environment
+    os.environ.update(env)
+
+    results = {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output_dir", "compare", "database_url")},
+        "stacks": {},
+    }
+    for stack in (["sync", "async"] if args.db_stack == "both" else [args.db_stack]):
+        results["stacks"][stack] = run_stack(stack, args, env)
+
+    path = os.path.join(args.output_dir, f"{results['timestamp'].replace(':', '')}-{results['revision']['commit']}.json")
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), results)
+
+if __name__ == "__main__":
+    main()
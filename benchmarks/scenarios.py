@@ -0,0 +1,158 @@
+"""
+Benchmark scenarios for the hot endpoints
+
+Each scenario builds its request generator from the seeded fixtures and may
+check the database afterwards (for example that a checkout burst never
+oversold).
+"""
+import itertools
+import json
+import random
+from datetime import timedelta
+from sqlalchemy import func, select
+
+from benchmarks.seed import PASSWORD
+
+def _token(email: str) -> dict:
+    from app.auth import create_access_token
+    token = create_access_token(data={"sub": email}, expires_delta=timedelta(hours=6))
+    return {"Authorization": f"Bearer {token}"}
+
+def _json_field(field: str):
+    def classify(status: int, body: bytes) -> str:
+        if status != 200:
+            return str(status)
+        return str(json.loads(body).get(field))
+    return classify
+
+class Scenario:
+    name = None
+    # Fixed request count (e.g. a one-off bulk job); duration-bound otherwise
+    total_requests = None
+    concurrency = None
+
+    def __init__(self, fixtures: dict, seed: int = 42):
+        self.fixtures = fixtures
+        self.rng = random.Random(seed)
+
+    def next_request(self, worker: int):
+        raise NotImplementedError
+
+    classify = None
+
+    def verify(self) -> dict:
+        return {}
+
+class Catalog(Scenario):
+    """Anonymous browsing: event listing and detail pages plus location lookups"""
+    name = "catalog"
+
+    def next_request(self, worker):
+        first, last = self.fixtures["event_ids"]
+        path = self.rng.choices(
+            [
+                f"/events/?limit=20&skip={self.rng.randint(0, 200)}",
+                f"/events/{self.rng.randint(first, last)}",
+                "/locations/departments",
+                "/locations/provinces",
+                "/locations/districts",
+            ],
+            weights=[30, 50, 5, 5, 10],
+        )[0]
+        return "GET", path, None, None
+
+class Auth(Scenario):
+    """Authenticated requests that only resolve the principal (auth overhead)"""
+    name = "auth"
+
+    def __init__(self, fixtures, seed=42):
+        super().__init__(fixtures, seed)
+        self.headers = [_token(email) for email in fixtures["buyer_emails"][:64]]
+
+    def next_request(self, worker):
+        return "GET", "/auth/me", None, self.rng.choice(self.headers)
+
+class Login(Scenario):
+    """Login storm; 503 is the expected fast-fail once the hashing pool is full"""
+    name = "login"
+
+    def next_request(self, worker):
+        email = self.rng.choice(self.fixtures["buyer_emails"])
+        return "POST", "/auth/login", {"email": email, "password": PASSWORD}, None
+
+class Checkout(Scenario):
+    """Burst of buyers racing for one limited ticket type; verifies nothing was oversold"""
+    name = "checkout"
+
+    def __init__(self, fixtures, seed=42):
+        super().__init__(fixtures, seed)
+        self.headers = [_token(email) for email in fixtures["buyer_emails"][:256]]
+
+    def next_request(self, worker):
+        return "POST", "/checkout/", {
+            "event_id": self.fixtures["hot_event_id"],
+            "items": [{"ticket_type_id": self.fixtures["hot_ticket_type_id"], "quantity": self.rng.randint(1, 4)}],
+        }, self.rng.choice(self.headers)
+
+    def verify(self):
+        from app import models
+        from app.database import SessionLocal
+        db = SessionLocal()
+        try:
+            ticket_type = db.get(models.TicketType, self.fixtures["hot_ticket_type_id"])
+            ordered = db.scalar(
+                select(func.coalesce(func.sum(models.PurchaseDetail.quantity), 0))
+                .where(models.PurchaseDetail.ticket_type_id == ticket_type.id)
+            )
+            return {
+                "capacity": ticket_type.capacity,
+                "sold": ticket_type.sold,
+                "ordered": ordered,
+                "oversold": max(0, ordered - ticket_type.capacity),
+            }
+        finally:
+            db.close()
+
+class Scan(Scenario):
+    """Doors-open gate scans: every code once, spread over the assigned verifiers"""
+    name = "scan"
+
+    def __init__(self, fixtures, seed=42):
+        super().__init__(fixtures, seed)
+        self.headers = [_token(email) for email in fixtures["verifier_emails"]]
+        self.codes = iter(fixtures["scan_qr_codes"])
+        self.device_ids = itertools.count()
+
+    def next_request(self, worker):
+        qr_code = next(self.codes, None)
+        if qr_code is None:
+            return None
+        return "POST", "/tickets/scan", {
+            "qr_code": qr_code,
+            "event_id": self.fixtures["scan_event_id"],
+            "device_id": f"gate-{worker}",
+        }, self.headers[worker % len(self.headers)]
+
+    classify = staticmethod(_json_field("result"))
+
+class Issuance(Scenario):
+    """One bulk issuance of the whole scan-ticket volume for a stadium-sized event"""
+    name = "issuance"
+    total_requests = 1
+    concurrency = 1
+
+    def __init__(self, fixtures, seed=42):
+        super().__init__(fixtures, seed)
+        self.headers = _token(fixtures["admin_email"])
+        self.quantity = min(fixtures["size"]["scan_tickets"], 100000)
+
+    def next_request(self, worker):
+        return "POST", "/tickets/bulk", {
+            "purchase_id": self.fixtures["issuance_purchase_id"],
+            "quantity": self.quantity,
+        }, self.headers
+
+    def verify(self):
+        return {"tickets_per_request": self.quantity}
+
+SCENARIOS = {scenario.name: scenario for scenario in (Catalog, Auth, Login, Checkout, Scan, Issuance)}
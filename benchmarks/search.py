@@ -0,0 +1,129 @@
+"""
+Latency of the in-process event search index (the SQLite search path)
+
+    python -m benchmarks.search --events 100000 --budget 50
+
+Builds an index over synthetic events whose words follow a Zipf
+distribution, so the most common terms match a large share of the catalog,
+and times ranked searches from the most common term down to rare ones,
+multi-term queries and filtered queries, then the first search after an
+event is re-indexed. Exits non-zero when the p99 of any query, or that
+search, goes over the budget. The first search of a term builds its impact
+order and is reported apart (`first_ms`).
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.run import git_revision
+from benchmarks.server import ROOT
+
+def synthetic_events(count: int, vocabulary: int, seed: int):
+    """(event_id, title, description, location, category_id, district_id, start_date) rows"""
+    rng = random.Random(seed)
+    words = [f"w{rank}" for rank in range(vocabulary)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary)))
+    now = datetime.utcnow()
+    for event_id in range(1, count + 1):
+        title = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(3, 8)))
+        description = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(20, 80)))
+        location = " ".join(rng.choices(words, cum_weights=cum_weights, k=3))
+        start = now + timedelta(hours=rng.randint(-24 * 365, 24 * 365))
+        yield event_id, title, description, location, rng.randint(1, 20), rng.randint(1, 50), start
+
+def queries() -> dict:
+    return {
+        "top term": {"query": "w0"},
+        "rank 10 term": {"query": "w10"},
+        "rank 100 term": {"query": "w100"},
+        "rank 1000 term": {"query": "w1000"},
+        "two terms": {"query": "w0 w50"},
+        "three terms": {"query": "w1 w7 w300"},
+        "top term, category": {"query": "w0", "category_id": 3},
+        "top term, date": {"query": "w0", "date": "this_month"},
+        "two terms, district, page 5": {"query": "w2 w20", "district_id": 7, "skip": 80},
+    }
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Suyay Events search index benchmark")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--budget", type=float, default=50.0, help="max p99 milliseconds of any query")
+    parser.add_argument("--output-dir", default=os.path.join(ROOT, "benchmarks", "results"))
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    from app.search import EventSearchIndex
+
+    index = EventSearchIndex()
+    start = time.perf_counter()
+    index.load(synthetic_events(args.events, args.vocabulary, args.seed))
+    load_seconds = time.perf_counter() - start
+
+    results = {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "events": args.events,
+        "vocabulary": args.vocabulary,
+        "load_seconds": round(load_seconds, 2),
+        "budget_ms": args.budget,
+        "queries": {},
+    }
+    for name, params in queries().items():
+        params = {"query": params.pop("query"), **params}
+        start = time.perf_counter()
+        total, _, _ = index.search(**params)
+        first = time.perf_counter() - start
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            index.search(**params)
+            samples.append(time.perf_counter() - start)
+        results["queries"][name] = {
+            "matches": total,
+            "first_ms": round(first * 1000, 2),
+            "p50_ms": round(statistics.median(samples) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        }
+        print(f"{name:32} {total:7} matches  first {first * 1000:7.2f} ms  p50 {results['queries'][name]['p50_ms']:7.2f} ms  p99 {results['queries'][name]['p99_ms']:7.2f} ms", flush=True)
+
+    # A write patches the cached impact orders; the next search must not pay for a rebuild
+    class Event:
+        def __init__(self, row):
+            self.id, self.title, self.description, self.location_description, self.category_id, self.district_id, self.start_date = row
+
+    row = next(synthetic_events(1, args.vocabulary, args.seed + 1))
+    start = time.perf_counter()
+    index.add(Event((args.events + 1, *row[1:])))
+    write = time.perf_counter() - start
+    start = time.perf_counter()
+    index.search("w0 w1")
+    after_write = time.perf_counter() - start
+    results["write_ms"] = round(write * 1000, 2)
+    results["first_search_after_write_ms"] = round(after_write * 1000, 2)
+    print(f"{'index one event':32} {write * 1000:7.2f} ms; next search {after_write * 1000:7.2f} ms", flush=True)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    path = os.path.join(args.output_dir, f"search-{results['timestamp'].replace(':', '')}-{results['revision']['commit']}.json")
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+    slowest = max([query["p99_ms"] for query in results["queries"].values()] + [results["first_search_after_write_ms"]])
+    if slowest > args.budget:
+        print(f"Slowest search p99 {slowest:.2f} ms exceeds the {args.budget:.2f} ms budget")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
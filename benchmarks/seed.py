@@ -0,0 +1,127 @@
+"""
+Seed a benchmark database at a given scale
+
+The bulk of the data comes from generate_data.py; on top of it this adds the
+fixtures the scenarios target: an admin, an on-sale event with a limited
+ticket type, an event with pre-issued tickets for gate scans and a purchase
+whose tickets are bought but not yet issued, for bulk issuance.
+"""
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import insert, select, text
+
+PASSWORD = "benchmark"
+
+SCALES = {
+    "small": {"verifiers": 4, "scan_tickets": 20000, "hot_capacity": 500},
+    "medium": {"verifiers": 16, "scan_tickets": 100000, "hot_capacity": 2000},
+    "large": {"verifiers": 64, "scan_tickets": 1000000, "hot_capacity": 10000},
+}
+
+CHUNK_SIZE = 5000
+
+def _insert_chunked(db, table, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(table), rows[start:start + CHUNK_SIZE])
+
+def seed(scale: str = "small", seed: int = 42) -> dict:
+    """Recreate the schema and fill it; returns the fixture ids the scenarios need.
+
+    Reads DATABASE_URL from the environment like the app, so set it first.
+    """
+    from app import crud, models
+    from app.database import SessionLocal, engine
+    import generate_data
+    import init_db
+
+    size = SCALES[scale]
+    rng = random.Random(seed)
+    models.Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    init_db.init_db()
+
+    db = SessionLocal()
+    try:
+        summary = generate_data.generate(db, scale=scale, seed=seed, password=PASSWORD)
+        roles = {role.name: role.id for role in db.query(models.Role)}
+        organizer_id, organizer_user_id = summary["organizers"][0]
+        now = datetime.utcnow().replace(microsecond=0)
+
+        admin_email = generate_data.user_email("admin", 0)
+        db.execute(insert(models.User), [{
+            "first_names": "Admin", "last_names": "Benchmark", "email": admin_email,
+            "password": db.scalar(select(models.User.password).limit(1)), "role_id": roles["Administrador"],
+        }])
+        admin_id = db.scalar(select(models.User.id).where(models.User.email == admin_email))
+
+        # The on-sale event, the scan target and the issuance target
+        db.execute(insert(models.Event), [
+            {
+                "title": f"Benchmark {name}", "description": f"Benchmark {name} event",
+                "start_date": now + timedelta(days=30), "end_date": now + timedelta(days=30, hours=4),
+                "district_id": db.scalar(select(models.District.id).limit(1)),
+                "category_id": db.scalar(select(models.Category.id).limit(1)),
+                "organizer_id": organizer_id, "organizer_user_id": organizer_user_id, "status": "active",
+            }
+            for name in ("on-sale", "gate", "issuance")
+        ])
+        hot_event_id, scan_event_id, issuance_event_id = db.scalars(
+            select(models.Event.id).order_by(models.Event.id.desc()).limit(3)
+        ).all()[::-1]
+        db.execute(insert(models.EventRatingStats), [{"event_id": event_id} for event_id in (hot_event_id, scan_event_id, issuance_event_id)])
+        db.execute(insert(models.TicketType), [{
+            "event_id": hot_event_id, "name": "General", "price": Decimal("50.00"),
+            "capacity": size["hot_capacity"], "sold": 0,
+        }])
+        hot_ticket_type_id = db.scalar(select(models.TicketType.id).where(models.TicketType.event_id == hot_event_id))
+        db.execute(insert(models.TicketType), [{
+            "event_id": issuance_event_id, "name": "General", "price": Decimal("0.00"),
+            "capacity": size["scan_tickets"], "sold": 0,
+        }])
+        issuance_ticket_type_id = db.scalar(select(models.TicketType.id).where(models.TicketType.event_id == issuance_event_id))
+
+        verifier_ids = db.scalars(select(models.Verifier.id).order_by(models.Verifier.id).limit(size["verifiers"])).all()
+        _insert_chunked(db, models.EventVerifier, [{"verifier_id": verifier_id, "event_id": scan_event_id} for verifier_id in verifier_ids])
+
+        db.execute(insert(models.Purchase), [
+            {"event_id": scan_event_id, "user_id": admin_id, "total_amount": Decimal("0.00")},
+            {"event_id": issuance_event_id, "user_id": admin_id, "total_amount": Decimal("0.00")},
+        ])
+        scan_purchase_id, issuance_purchase_id = db.scalars(
+            select(models.Purchase.id).order_by(models.Purchase.id.desc()).limit(2)
+        ).all()[::-1]
+        # Bulk issuance is capped by the quantity bought on the purchase
+        db.execute(insert(models.PurchaseDetail), [{
+            "purchase_id": issuance_purchase_id, "ticket_type_id": issuance_ticket_type_id,
+            "quantity": size["scan_tickets"], "unit_price": Decimal("0.00"), "subtotal": Decimal("0.00"),
+        }])
+        first_ticket_id = generate_data.next_id(db, models.Ticket)
+        qr_codes = [
+            f"{rng.randint(100000, 899999)}{ticket_id:013d}"
+            for ticket_id in range(first_ticket_id, first_ticket_id + size["scan_tickets"])
+        ]
+        _insert_chunked(db, models.Ticket, [
+            {"id": first_ticket_id + index, "purchase_id": scan_purchase_id, "qr_code": qr_code, "status": "active"}
+            for index, qr_code in enumerate(qr_codes)
+        ])
+        db.commit()
+        crud.rebuild_sales_stats(db)
+    finally:
+        db.close()
+
+    return {
+        "scale": scale,
+        "seed": seed,
+        "size": size,
+        "admin_email": admin_email,
+        "buyer_emails": [generate_data.user_email("buyer", index) for index in range(min(summary["buyers"], 1000))],
+        "verifier_emails": [generate_data.user_email("verifier", index) for index in range(len(verifier_ids))],
+        "event_ids": list(summary["event_ids"]),
+        "hot_event_id": hot_event_id,
+        "hot_ticket_type_id": hot_ticket_type_id,
+        "scan_event_id": scan_event_id,
+        "scan_qr_codes": qr_codes,
+        "issuance_purchase_id": issuance_purchase_id,
+    }
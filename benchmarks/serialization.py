@@ -0,0 +1,122 @@
+"""
+Micro-benchmark of the list serialization paths
+
+    python -m benchmarks.serialization --scale small --limit 100 --repeat 30
+
+Seeds a fresh SQLite database and, for every list endpoint, times full
+in-process requests with Settings.fast_serialization off and on, after
+checking that both return the same JSON. It also times the encoding step
+alone: ORM objects through a pre-built TypeAdapter against row tuples
+mapped to dicts.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+
+from benchmarks.run import git_revision
+from benchmarks.server import ROOT
+
+ENDPOINTS = ("/events/", "/purchases/", "/tickets/")
+
+def median_ms(func, repeat: int) -> float:
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1000, 3)
+
+def encoding_only(path: str, limit: int, repeat: int) -> dict:
+    """Encoding cost without the request cycle, on rows fetched once"""
+    from pydantic_core import to_json
+    from app import crud, serialization
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if path == "/events/":
+            adapter, shape = serialization.EVENT_LIST, serialization.EVENT_SHAPE
+            items = crud.get_events(db, limit=limit)
+            rows = db.execute(serialization.select_event_rows(limit=limit)).all()
+        elif path == "/purchases/":
+            adapter, shape = serialization.PURCHASE_LIST, serialization.PURCHASE_SHAPE
+            items = crud.get_purchases(db, limit=limit)
+            rows = db.execute(serialization.select_purchase_rows(limit=limit)).all()
+        else:
+            adapter, shape = serialization.TICKET_LIST, serialization.TICKET_SHAPE
+            items = crud.get_tickets(db, limit=limit)
+            rows = db.execute(serialization.select_ticket_rows(limit=limit)).all()
+        return {
+            "adapter_ms": median_ms(lambda: serialization.dump_orm_list(adapter, items), repeat),
+            "rows_ms": median_ms(lambda: to_json([shape.build(iter(row)) for row in rows]), repeat),
+        }
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Suyay Events serialization micro-benchmark")
+    parser.add_argument("--scale", default="small")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--output-dir", default=os.path.join(ROOT, "benchmarks", "results"))
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(args.output_dir, 'bench-serialization.db')}",
+        "SECRET_KEY": "benchmark",
+        "ENVIRONMENT": "benchmark",
+    })
+    from fastapi.testclient import TestClient
+    from benchmarks import seed
+    from benchmarks.scenarios import _token
+    from app.config import settings
+    import main as app_main
+
+    fixtures = seed.seed(args.scale)
+    client = TestClient(app_main.app)
+    headers = _token(fixtures["admin_email"])
+
+    results = {}
+    for path in ENDPOINTS:
+        url = f"{path}?limit={args.limit}"
+        bodies, timings = {}, {}
+        for mode, enabled in (("current", False), ("fast", True)):
+            settings.fast_serialization = enabled
+            response = client.get(url, headers=headers)
+            response.raise_for_status()
+            bodies[mode] = (response.json(), response.headers.get("x-next-cursor"))
+            timings[f"{mode}_ms"] = median_ms(lambda: client.get(url, headers=headers), args.repeat)
+        settings.fast_serialization = False
+        if bodies["current"] != bodies["fast"]:
+            raise SystemExit(f"{path}: fast path response differs from the current one")
+
+        result = {"rows": len(bodies["current"][0]), **timings, **encoding_only(path, args.limit, args.repeat)}
+        result["speedup"] = round(result["current_ms"] / result["fast_ms"], 2)
+        results[path] = result
+        print(
+            f"{path:<12} rows={result['rows']:<4} request current={result['current_ms']}ms fast={result['fast_ms']}ms "
+            f"(x{result['speedup']})  encode adapter={result['adapter_ms']}ms rows={result['rows_ms']}ms",
+            flush=True,
+        )
+
+    report = {
+        "benchmark": "serialization",
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "scale": args.scale,
+        "limit": args.limit,
+        "repeat": args.repeat,
+        "endpoints": results,
+    }
+    path = os.path.join(args.output_dir, f"{datetime.utcnow():%Y%m%dT%H%M%S}-{report['git']['commit']}-serialization.json")
+    with open(path, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"results written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Run the API under uvicorn in a subprocess for the benchmarks
+"""
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class Server:
+    """Context manager that starts `uvicorn main:app` and waits for /health"""
+
+    def __init__(self, env: dict, workers: int = 1, port: int = None, startup_timeout: float = 60):
+        self.env = env
+        self.workers = workers
+        self.host = "127.0.0.1"
+        self.port = port or free_port()
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.startup_seconds = None
+
+    def __enter__(self):
+        command = [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", self.host, "--port", str(self.port),
+            "--workers", str(self.workers), "--log-level", "warning", "--no-access-log",
+        ]
+        start = time.perf_counter()
+        # Own process group, so the hashing pool's forked workers go down with the server
+        self.process = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **self.env}, start_new_session=True)
+        deadline = start + self.startup_timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}")
+            try:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=1)
+                connection.request("GET", "/health")
+                if connection.getresponse().status == 200:
+                    self.startup_seconds = time.perf_counter() - start
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        self.__exit__(None, None, None)
+        raise RuntimeError("Server did not become healthy in time")
+
+    def __exit__(self, *exc):
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                pass
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.process.wait()
@@ -0,0 +1,92 @@
+"""
+Measure cold start: app import time, boot-to-healthy and first-request latency
+
+    python -m benchmarks.startup --budget 3
+
+Exits non-zero when boot plus the first catalog request takes longer than
+the budget, so it can gate autoscaling-sensitive changes.
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.run import git_revision
+from benchmarks.server import ROOT, Server
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+
+def measure_import(env: dict, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env={**os.environ, **env},
+            capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+def timed_get(server: Server, path: str) -> float:
+    connection = http.client.HTTPConnection(server.host, server.port, timeout=30)
+    start = time.perf_counter()
+    connection.request("GET", path)
+    response = connection.getresponse()
+    response.read()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"GET {path} returned {response.status}")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Suyay Events cold start benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=3.0, help="max seconds from process start to the first /events/ response")
+    parser.add_argument("--database-url", help="migrated database to boot against (default: a freshly seeded SQLite file)")
+    parser.add_argument("--output-dir", default=os.path.join(ROOT, "benchmarks", "results"))
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    database_url = args.database_url or f"sqlite:///{os.path.join(args.output_dir, 'bench-startup.db')}"
+    env = {"DATABASE_URL": database_url, "SECRET_KEY": "benchmark", "ENVIRONMENT": "benchmark"}
+    os.environ.update(env)
+    if not args.database_url:
+        from benchmarks import seed
+        seed.seed("small")
+
+    imports = measure_import(env, args.repeat)
+    boots, ready, first_requests, cold_starts = [], [], [], []
+    for _ in range(args.repeat):
+        with Server(env) as server:
+            boots.append(server.startup_seconds)
+            ready.append(timed_get(server, "/ready"))
+            first_requests.append(timed_get(server, "/events/?limit=20"))
+            cold_starts.append(boots[-1] + ready[-1] + first_requests[-1])
+
+    ms = lambda samples: {"median": round(statistics.median(samples) * 1000, 1), "max": round(max(samples) * 1000, 1)}
+    results = {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "budget_ms": args.budget * 1000,
+        "import_ms": ms(imports),
+        "boot_to_healthy_ms": ms(boots),
+        "first_ready_ms": ms(ready),
+        "first_events_request_ms": ms(first_requests),
+        "cold_start_ms": ms(cold_starts),
+    }
+    path = os.path.join(args.output_dir, f"startup-{results['timestamp'].replace(':', '')}-{results['revision']['commit']}.json")
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if max(cold_starts) > args.budget:
+        print(f"Cold start {max(cold_starts):.2f}s exceeds the {args.budget:.2f}s budget", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
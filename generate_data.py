@@ -0,0 +1,285 @@
+"""
+Generate synthetic, referentially consistent data at production scale
+
+    python generate_data.py --scale medium --seed 42
+
+Runs init_db for the reference data, then bulk inserts users, organizers,
+verifiers, events, ticket types, purchases, purchase details, tickets,
+ratings, favorites, reports, contact messages and claims in chunks. The same
+seed always yields the same rows. Ids are assigned here (continuing after
+the current maximum), so nothing is read back between chunks.
+"""
+import argparse
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import func, select
+from app.database import SessionLocal
+from app import crud, models
+from app.hashing import hash_password
+
+DEFAULT_PASSWORD = "password123"
+EMAIL_DOMAIN = "suyay.pe"
+
+SCALES = {
+    "small": {"organizers": 20, "buyers": 2000, "events": 1000, "purchases": 20000},
+    "medium": {"organizers": 200, "buyers": 20000, "events": 10000, "purchases": 500000},
+    "large": {"organizers": 2000, "buyers": 200000, "events": 100000, "purchases": 10000000},
+}
+
+VERIFIERS_PER_ORGANIZER = 2
+
+FIRST_NAMES = ["María", "José", "Luis", "Ana", "Carlos", "Rosa", "Jorge", "Lucía", "Miguel", "Carmen", "Diego", "Valeria"]
+LAST_NAMES = ["Quispe", "Flores", "Sánchez", "Rodríguez", "García", "Mamani", "Huamán", "Torres", "Chávez", "Ramírez"]
+EVENT_WORDS = ["Festival", "Concierto", "Feria", "Congreso", "Maratón", "Noche", "Encuentro", "Gran", "Expo", "Taller"]
+EVENT_TOPICS = ["Rock", "Salsa", "Criolla", "Gastronómica", "Tecnología", "Andina", "Jazz", "Teatro", "Arte", "Ciencia"]
+TICKET_TYPES = [("General", Decimal("40.00"), 800), ("Preferencial", Decimal("90.00"), 300), ("VIP", Decimal("180.00"), 80)]
+
+def user_email(kind: str, index: int) -> str:
+    """Deterministic login of the index-th generated user of a kind (organizer, verifier, buyer)"""
+    return f"{kind}{index}@{EMAIL_DOMAIN}"
+
+class ChunkedInserter:
+    """Buffers rows per table and writes them with one executemany per chunk.
+
+    When any buffer fills up, every buffer is written in the order its table
+    was first used, so parent rows always reach the database before the rows
+    that reference them.
+    """
+
+    def __init__(self, db, chunk_size: int):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, model, row: dict):
+        buffer = self.buffers.setdefault(model, [])
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        for model, rows in self.buffers.items():
+            if rows:
+                self.db.execute(model.__table__.insert(), rows)
+                self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+                rows.clear()
+        self.db.commit()
+
+def next_id(db, model) -> int:
+    return (db.scalar(select(func.max(model.id))) or 0) + 1
+
+def generate(
+    db,
+    scale: str = "small",
+    seed: int = 42,
+    chunk_size: int = 5000,
+    password: str = DEFAULT_PASSWORD,
+    reference_date: Optional[datetime] = None,
+    **sizes
+) -> dict:
+    """Insert a dataset of the given scale; `sizes` overrides single counts of the preset.
+
+    Event and purchase dates are spread around `reference_date` (today by
+    default); pass a fixed date to reproduce the same dataset.
+    """
+    size = {**SCALES[scale], **sizes}
+    rng = random.Random(seed)
+    writer = ChunkedInserter(db, chunk_size)
+    now = (reference_date or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+
+    roles = {role.name: role.id for role in db.query(models.Role)}
+    category_ids = [category.id for category in db.query(models.Category).order_by(models.Category.id)]
+    district_ids = [district.id for district in db.query(models.District).order_by(models.District.id)]
+    # bcrypt is deliberately slow; every generated user shares one hash
+    password_hash = hash_password(password)
+
+    def person():
+        return rng.choice(FIRST_NAMES), f"{rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    def add_user(kind: str, index: int, role: str) -> int:
+        user_id = ids["user"]
+        ids["user"] += 1
+        first_names, last_names = person()
+        writer.add(models.User, {
+            "id": user_id, "first_names": first_names, "last_names": last_names,
+            "email": user_email(kind, index), "password": password_hash,
+            "phone": f"9{rng.randrange(10**8):08d}", "role_id": roles[role],
+            "gender": rng.choice(["F", "M"]),
+        })
+        return user_id
+
+    ids = {
+        "user": next_id(db, models.User), "organizer": next_id(db, models.Organizer),
+        "verifier": next_id(db, models.Verifier), "event": next_id(db, models.Event),
+        "ticket_type": next_id(db, models.TicketType), "purchase": next_id(db, models.Purchase),
+        "ticket": next_id(db, models.Ticket),
+    }
+    first_event_id = ids["event"]
+
+    # Organizers with their verifiers
+    organizers = []
+    verifier_indexes = itertools.count()
+    for index in range(size["organizers"]):
+        user_id = add_user("organizer", index, "Organizador de Eventos")
+        organizer_id = ids["organizer"]
+        ids["organizer"] += 1
+        writer.add(models.Organizer, {
+            "id": organizer_id, "user_id": user_id, "document_type": "RUC",
+            "document_number": str(20100000000 + organizer_id), "ruc": str(20100000000 + organizer_id),
+            "business_name": f"Producciones {rng.choice(LAST_NAMES)} {organizer_id} S.A.C.",
+            "is_approved": rng.random() < 0.9, "approval_date": now - timedelta(days=rng.randint(30, 720)),
+        })
+        verifier_ids = []
+        for _ in range(VERIFIERS_PER_ORGANIZER):
+            verifier_user_id = add_user("verifier", next(verifier_indexes), "Verificador / Validador de Entrada")
+            writer.add(models.Verifier, {"id": ids["verifier"], "user_id": verifier_user_id, "organizer_id": organizer_id})
+            verifier_ids.append(ids["verifier"])
+            ids["verifier"] += 1
+        organizers.append((organizer_id, user_id, verifier_ids))
+
+    buyer_ids = [add_user("buyer", index, "Comprador / Asistente") for index in range(size["buyers"])]
+    writer.flush()
+
+    # Events, their ticket types and verifier assignments
+    events = []  # (event_id, start_date, verifier_ids, [[ticket_type_id, price, capacity, sold]])
+    for _ in range(size["events"]):
+        organizer_id, organizer_user_id, verifier_ids = rng.choice(organizers)
+        start = now + timedelta(days=rng.randint(-365, 365), hours=rng.choice([10, 15, 18, 20, 21]))
+        event_id = ids["event"]
+        ids["event"] += 1
+        title = f"{rng.choice(EVENT_WORDS)} {rng.choice(EVENT_TOPICS)} {event_id}"
+        writer.add(models.Event, {
+            "id": event_id, "title": title, "description": f"{title}: una experiencia única para toda la familia.",
+            "start_date": start, "end_date": start + timedelta(hours=rng.randint(2, 10)),
+            "district_id": rng.choice(district_ids), "location_description": f"Av. {rng.choice(LAST_NAMES)} {rng.randint(100, 2000)}",
+            "category_id": rng.choice(category_ids), "organizer_id": organizer_id,
+            "organizer_user_id": organizer_user_id, "status": "active" if start > now - timedelta(days=30) else "finished",
+        })
+        for verifier_id in verifier_ids:
+            writer.add(models.EventVerifier, {"verifier_id": verifier_id, "event_id": event_id})
+        ticket_types = []
+        for name, price, capacity in TICKET_TYPES[:rng.randint(1, len(TICKET_TYPES))]:
+            writer.add(models.TicketType, {
+                "id": ids["ticket_type"], "event_id": event_id, "name": name,
+                "price": price, "capacity": capacity, "sold": 0,
+            })
+            ticket_types.append([ids["ticket_type"], price, capacity, 0])
+            ids["ticket_type"] += 1
+        events.append((event_id, start, verifier_ids, ticket_types))
+    writer.flush()
+
+    # Purchases with their details and tickets; popular events sell more
+    cum_weights = list(itertools.accumulate(rng.paretovariate(1.2) for _ in events))
+    for _ in range(size["purchases"]):
+        event_id, start, verifier_ids, ticket_types = rng.choices(events, cum_weights=cum_weights)[0]
+        purchase_date = min(start, now) - timedelta(days=rng.randint(0, 60), minutes=rng.randint(0, 1440))
+        past = start < now
+        details = []
+        for ticket_type in rng.sample(ticket_types, rng.randint(1, len(ticket_types))):
+            ticket_type_id, price, capacity, sold = ticket_type
+            quantity = min(rng.choice([1, 1, 2, 2, 2, 3, 4]), capacity - sold)
+            if quantity > 0:
+                ticket_type[3] += quantity
+                details.append((ticket_type_id, price, quantity))
+        if not details:
+            continue
+        
+        purchase_id = ids["purchase"]
+        ids["purchase"] += 1
+        writer.add(models.Purchase, {
+            "id": purchase_id, "event_id": event_id, "user_id": rng.choice(buyer_ids),
+            "total_amount": sum(price * quantity for _, price, quantity in details), "purchase_date": purchase_date,
+        })
+        for ticket_type_id, price, quantity in details:
+            writer.add(models.PurchaseDetail, {
+                "purchase_id": purchase_id, "ticket_type_id": ticket_type_id,
+                "quantity": quantity, "unit_price": price, "subtotal": price * quantity,
+            })
+            for _ in range(quantity):
+                used = past and rng.random() < 0.85
+                writer.add(models.Ticket, {
+                    "id": ids["ticket"], "purchase_id": purchase_id,
+                    # Unique by construction: a random 6-digit prefix followed by the ticket id
+                    "qr_code": f"{rng.randint(100000, 899999)}{ids['ticket']:013d}",
+                    "created_at": purchase_date, "status": "used" if used else ("expired" if past else "active"),
+                    "used_at": start + timedelta(minutes=rng.randint(-60, 90)) if used else None,
+                    "verifier_id": rng.choice(verifier_ids) if used else None,
+                })
+                ids["ticket"] += 1
+        if past and rng.random() < 0.3:
+            writer.add(models.Rating, {
+                "user_id": rng.choice(buyer_ids), "event_id": event_id,
+                "score": rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 5, 10, 12])[0],
+                "comment": rng.choice([None, "Muy bueno", "Excelente organización", "Regular"]),
+            })
+        if rng.random() < 0.2:
+            writer.add(models.Favorite, {"user_id": rng.choice(buyer_ids), "event_id": event_id})
+    writer.flush()
+
+    for _ in range(max(1, size["buyers"] // 50)):
+        user_id = rng.choice(buyer_ids)
+        writer.add(models.Report, {
+            "user_id": user_id, "report_type": rng.choice(["Evento", "Pago", "Cuenta"]),
+            "description": "Reporte generado para pruebas de carga.",
+            "created_at": now - timedelta(days=rng.randint(0, 365)), "status": rng.choice(["pending", "resolved"]),
+        })
+        first_names, last_names = person()
+        writer.add(models.ContactUs, {
+            "first_names": first_names, "last_names": last_names, "email": user_email("contact", user_id),
+            "subject": "Consulta", "message": "Mensaje generado para pruebas de carga.",
+            "created_at": now - timedelta(days=rng.randint(0, 365)),
+        })
+        writer.add(models.Claim, {
+            "first_names": first_names, "last_names": last_names, "document_type": "DNI",
+            "document_number": f"{rng.randrange(10**8):08d}", "address": f"Jr. {rng.choice(LAST_NAMES)} {rng.randint(100, 999)}",
+            "district_id": rng.choice(district_ids), "mobile_phone": f"9{rng.randrange(10**8):08d}",
+            "email": user_email("claim", user_id), "claim_amount": Decimal(rng.randint(20, 500)),
+            "service_type": "Entrada", "product_service_description": "Entrada a evento",
+            "claim_type": rng.choice(["Reclamo", "Queja"]), "claim_detail": "Reclamo generado para pruebas de carga.",
+            "customer_request": "Devolución", "created_at": now - timedelta(days=rng.randint(0, 365)),
+        })
+    writer.flush()
+
+    # Bring the inventory counters and rollups in line with the rows written above
+    crud.rebuild_rating_stats(db)
+    crud.rebuild_sales_stats(db)
+    crud.rebuild_checkin_minutes(db)
+    return {
+        "counts": writer.counts,
+        "event_ids": (first_event_id, ids["event"] - 1),
+        "organizers": [(organizer_id, user_id) for organizer_id, user_id, _ in organizers],
+        "buyers": size["buyers"],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Suyay Events data")
+    parser.add_argument("--scale", default="small", choices=list(SCALES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password of every generated user")
+    parser.add_argument("--reference-date", type=datetime.fromisoformat, help="date the data is generated around (default: today)")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"override the number of {name}")
+    args = parser.parse_args()
+
+    import init_db
+    init_db.init_db()
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        summary = generate(
+            db, scale=args.scale, seed=args.seed, chunk_size=args.chunk_size, password=args.password,
+            reference_date=args.reference_date,
+            **{name: getattr(args, name) for name in SCALES["small"] if getattr(args, name) is not None},
+        )
+        for table, count in summary["counts"].items():
+            print(f"{table}: {count}")
+        print(f"Data generated in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
@@ -1,19 +1,26 @@
 """
 Initialize database with basic data
 """
+import os
+from alembic import command
+from alembic.config import Config
 from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine
-from app.models import Base, Role, Category, Department, Province, District
+from app.database import MIGRATIONS_DIR, SessionLocal
+from app.models import Role, Category, Department, Province, District
 from app import crud, schemas
 
+def upgrade_schema():
+    """Apply the Alembic migrations (same as `alembic upgrade head`)"""
+    config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    command.upgrade(config, "head")
+
 def init_db():
     """Initialize database with basic data"""
+    upgrade_schema()
     db = SessionLocal()
     
     try:
-        # Create tables
-        Base.metadata.create_all(bind=engine)
-        
         # Initialize Roles
         roles = [
             "Administrador",
@@ -1,23 +1,43 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine
-from app.models import Base
+from contextlib import asynccontextmanager
+from app.auth import hashing_pool
+from app.config import settings
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.checkin import monitor as checkin_monitor
+from app.database import SessionLocal, async_engine, get_db, pool_metrics, schema_head
+from app.metrics import MetricsMiddleware, QUERY_DEBUG_HEADERS, registry
+from app.pagination import NEXT_CURSOR_HEADER
 from app.routers import (
     auth, users, locations, categories, roles, organizers, 
     verifiers, events, event_verifiers, ticket_types, 
     purchases, purchase_details, tickets, reports, 
-    contact, favorites, ratings, claims
+    contact, favorites, ratings, claims, checkout, admin, export,
+    events_async, purchases_async, tickets_async
 )
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    hashing_pool.start()
+    checkin_monitor.start(SessionLocal)
+    yield
+    checkin_monitor.shutdown(SessionLocal)
+    hashing_pool.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 app = FastAPI(
     title="Suyay Events API",
     description="API for Suyay Events - Event Management Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -25,9 +45,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, *QUERY_DEBUG_HEADERS],
 )
 
 # Include routers
+if settings.use_async_db:
+    # Registered first so they take precedence over the sync routes they shadow
+    app.include_router(events_async.router)
+    app.include_router(purchases_async.router)
+    app.include_router(tickets_async.router)
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(locations.router)
@@ -46,6 +73,9 @@ app.include_router(contact.router)
 app.include_router(favorites.router)
 app.include_router(ratings.router)
 app.include_router(claims.router)
+app.include_router(checkout.router)
+app.include_router(admin.router)
+app.include_router(export.router)
 
 @app.get("/")
 def read_root():
@@ -60,6 +90,29 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+def readiness_check(db: Session = Depends(get_db)):
+    # The schema is managed by Alembic (`alembic upgrade head`), never at startup
+    try:
+        revision = db.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except SQLAlchemyError:
+        raise HTTPException(status_code=503, detail="Database unavailable or not migrated")
+    if revision != schema_head():
+        raise HTTPException(status_code=503, detail=f"Database schema is at {revision}, expected {schema_head()}")
+    return {"status": "ready", "schema": revision}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    pool = pool_metrics.stats()
+    return registry.render({
+        "db_pool_checked_out": pool.get("checked_out", 0),
+        "db_pool_overflow": pool.get("overflow", 0),
+        "db_pool_checkouts_total": pool["checkouts"],
+        "db_pool_wait_seconds_total": pool["wait_seconds_total"],
+        "db_pool_timeouts_total": pool["timeouts"],
+        "db_pool_invalidations_total": pool["invalidations"],
+    })
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
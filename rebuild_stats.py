@@ -0,0 +1,24 @@
+"""
+Rebuild denormalized statistics from their source tables
+"""
+from app.database import SessionLocal
+from app import crud
+
+def rebuild_stats():
+    """Recompute every incrementally maintained aggregate from scratch"""
+    db = SessionLocal()
+    
+    try:
+        crud.rebuild_rating_stats(db)
+        crud.rebuild_sales_stats(db)
+        crud.rebuild_checkin_minutes(db)
+        print("Statistics rebuilt successfully!")
+        
+    except Exception as e:
+        print(f"Error rebuilding statistics: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_stats()
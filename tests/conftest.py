@@ -0,0 +1,66 @@
+"""
+Shared test fixtures
+
+The app reads its settings from the environment when it is imported, so the
+test database (a SQLite file in a temporary directory) is configured here,
+before any test module imports it.
+"""
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="suyay-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}",
+    "SECRET_KEY": "test",
+    "ENVIRONMENT": "test",
+    # Keep the check-in flush thread out of the query counts
+    "CHECKIN_FLUSH_SECONDS": "3600",
+})
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+ADMIN_EMAIL = "admin@tests.suyay.pe"
+
+def auth_headers(email: str) -> dict:
+    from app.auth import create_access_token
+    token = create_access_token(data={"sub": email}, expires_delta=timedelta(hours=1))
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture(scope="session")
+def dataset():
+    """A small generated dataset plus an admin; returns generate_data's summary"""
+    import generate_data
+    import init_db
+    from app import models
+    from app.database import SessionLocal
+
+    init_db.init_db()
+    db = SessionLocal()
+    try:
+        summary = generate_data.generate(
+            db, seed=7, reference_date=datetime(2026, 1, 15),
+            organizers=3, buyers=200, events=24, purchases=300,
+        )
+        db.execute(insert(models.User), [{
+            "first_names": "Admin", "last_names": "Tests", "email": ADMIN_EMAIL,
+            "password": db.scalar(select(models.User.password).limit(1)),
+            "role_id": db.scalar(select(models.Role.id).where(models.Role.name == "Administrador")),
+        }])
+        db.commit()
+    finally:
+        db.close()
+    return summary
+
+@pytest.fixture(scope="session")
+def client(dataset):
+    import main
+    with TestClient(main.app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def admin_headers(dataset):
+    return auth_headers(ADMIN_EMAIL)
@@ -0,0 +1,61 @@
+"""
+Login and principal resolution for bearer tokens
+"""
+import time
+from app import auth
+from app.config import settings
+from app.database import engine
+import generate_data
+from tests.conftest import auth_headers
+
+def test_rejected_tokens_get_a_fresh_401(client, dataset):
+    for headers in ({"Authorization": "Bearer not-a-jwt"}, auth_headers("nobody@tests.suyay.pe")):
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+    assert auth.credentials_exception() is not auth.credentials_exception()
+
+def test_valid_token_resolves_the_principal(client, admin_headers):
+    response = client.get("/auth/me", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["role"]["name"] == "Administrador"
+
+def _login(client, email=generate_data.user_email("buyer", 0)):
+    return client.post("/auth/login", json={"email": email, "password": generate_data.DEFAULT_PASSWORD})
+
+def test_login_hashes_without_holding_a_connection(client, dataset, monkeypatch):
+    checked_out = []
+
+    def verify_password(plain_password, hashed_password):
+        checked_out.append(engine.pool.checkedout())
+        return original(plain_password, hashed_password)
+
+    original = auth.verify_password
+    monkeypatch.setattr(auth, "verify_password", verify_password)
+    response = _login(client)
+    assert response.status_code == 200
+    assert checked_out == [0]
+
+def test_login_fails_fast_when_the_hashing_pool_is_full(client, dataset):
+    pool = auth.hashing_pool
+    slots = pool.workers + pool.queue_size
+    for _ in range(slots):
+        assert pool._slots.acquire(blocking=False)
+    try:
+        start = time.perf_counter()
+        response = _login(client)
+        elapsed = time.perf_counter() - start
+    finally:
+        for _ in range(slots):
+            pool._slots.release()
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert elapsed < 0.5
+    assert _login(client).status_code == 200
+
+def test_hashing_backlog_fits_in_the_db_pool(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 5)
+    monkeypatch.setattr(settings, "db_max_overflow", 2)
+    assert auth.hashing_queue_size() == 7 - settings.password_hash_workers
+    monkeypatch.setattr(settings, "db_pool_size", 100)
+    assert auth.hashing_queue_size() == settings.password_hash_queue_size
@@ -0,0 +1,104 @@
+"""
+Checkout under contention: parallel buyers racing for one limited ticket type
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import func, select, update
+from app import crud, models
+from app.database import SessionLocal
+import generate_data
+from tests.conftest import auth_headers
+
+CAPACITY = 10
+BUYERS = 40
+
+def _limited_ticket_type(capacity: int):
+    """A fresh on-sale event with a single ticket type; returns (event_id, ticket_type_id)"""
+    db = SessionLocal()
+    try:
+        organizer = db.scalars(select(models.Organizer).limit(1)).first()
+        start = datetime.utcnow() + timedelta(days=30)
+        db_event = models.Event(
+            title="Checkout race", description="Checkout race", start_date=start, end_date=start + timedelta(hours=3),
+            district_id=db.scalar(select(models.District.id).limit(1)),
+            category_id=db.scalar(select(models.Category.id).limit(1)),
+            organizer_id=organizer.id, organizer_user_id=organizer.user_id, status="active",
+            rating_stats=models.EventRatingStats(), sales_stats=models.EventSalesStats(organizer_id=organizer.id),
+        )
+        db.add(db_event)
+        db.flush()
+        db_ticket_type = models.TicketType(event_id=db_event.id, name="General", price=Decimal("50.00"), capacity=capacity, sold=0)
+        db.add(db_ticket_type)
+        db.commit()
+        return db_event.id, db_ticket_type.id
+    finally:
+        db.close()
+
+def test_parallel_checkouts_never_oversell(client, dataset):
+    event_id, ticket_type_id = _limited_ticket_type(CAPACITY)
+    headers = [auth_headers(generate_data.user_email("buyer", index)) for index in range(BUYERS)]
+    # Resolve every principal first, so the race is on the checkout itself
+    for buyer_headers in headers:
+        client.get("/auth/me", headers=buyer_headers).raise_for_status()
+
+    start = threading.Barrier(BUYERS)
+
+    def buy(buyer_headers):
+        start.wait()
+        return client.post("/checkout/", headers=buyer_headers, json={
+            "event_id": event_id, "items": [{"ticket_type_id": ticket_type_id, "quantity": 1}],
+        }).status_code
+
+    with ThreadPoolExecutor(max_workers=BUYERS) as executor:
+        statuses = list(executor.map(buy, headers))
+
+    assert statuses.count(200) == CAPACITY
+    assert statuses.count(409) == BUYERS - CAPACITY
+
+    db = SessionLocal()
+    try:
+        sold = db.scalar(select(models.TicketType.sold).where(models.TicketType.id == ticket_type_id))
+        issued = db.scalar(
+            select(func.count(models.Ticket.id))
+            .join(models.Purchase, models.Ticket.purchase_id == models.Purchase.id)
+            .where(models.Purchase.event_id == event_id)
+        )
+        stats = db.get(models.EventSalesStats, event_id)
+    finally:
+        db.close()
+    assert sold <= CAPACITY
+    assert sold == issued == CAPACITY
+    assert stats.tickets_sold == stats.tickets_issued == CAPACITY
+
+def test_capacity_cannot_drop_below_a_sale_committed_after_the_check(client, admin_headers, monkeypatch):
+    _, ticket_type_id = _limited_ticket_type(CAPACITY)
+    read_ticket_type = crud.get_ticket_type
+
+    def read_then_sell(db, ticket_type_id):
+        # A checkout commits right after the endpoint has read `sold`
+        db_ticket_type = read_ticket_type(db, ticket_type_id=ticket_type_id)
+        other = SessionLocal()
+        try:
+            other.execute(update(models.TicketType).where(models.TicketType.id == ticket_type_id).values(sold=6))
+            other.commit()
+        finally:
+            other.close()
+        return db_ticket_type
+
+    monkeypatch.setattr(crud, "get_ticket_type", read_then_sell)
+    response = client.patch(f"/ticket-types/{ticket_type_id}", headers=admin_headers, json={"capacity": 5, "name": "Reduced"})
+    assert response.status_code == 400
+
+    monkeypatch.undo()
+    db = SessionLocal()
+    try:
+        db_ticket_type = db.get(models.TicketType, ticket_type_id)
+        assert (db_ticket_type.capacity, db_ticket_type.sold, db_ticket_type.name) == (CAPACITY, 6, "General")
+    finally:
+        db.close()
+
+    response = client.patch(f"/ticket-types/{ticket_type_id}", headers=admin_headers, json={"capacity": 6})
+    assert response.status_code == 200
+    assert (response.json()["capacity"], response.json()["sold"]) == (6, 6)
@@ -0,0 +1,34 @@
+"""
+Streaming exports
+"""
+import csv
+import io
+import json
+from sqlalchemy import insert
+from app import models
+from app.database import SessionLocal
+
+FORMULAS = ["=HYPERLINK(\"http://evil.example\")", "+51 999", "-2+3", "@SUM(A1)", "\tcmd", "\rcmd"]
+
+def test_csv_export_neutralizes_formulas(client, admin_headers):
+    db = SessionLocal()
+    try:
+        contact_id = db.scalar(insert(models.ContactUs).values(
+            first_names=FORMULAS[0], last_names=FORMULAS[1], email="formula@tests.suyay.pe",
+            phone=FORMULAS[2], subject=FORMULAS[3], message=FORMULAS[4] + FORMULAS[5],
+        ).returning(models.ContactUs.id))
+        db.commit()
+    finally:
+        db.close()
+    fields = ("first_names", "last_names", "phone", "subject", "message")
+
+    response = client.get("/export/contact", headers=admin_headers)
+    assert response.status_code == 200
+    row = next(row for row in csv.DictReader(io.StringIO(response.text, newline="")) if row["id"] == str(contact_id))
+    assert [row[field] for field in fields] == ["'" + FORMULAS[0], "'" + FORMULAS[1], "'" + FORMULAS[2], "'" + FORMULAS[3], "'" + FORMULAS[4] + FORMULAS[5]]
+    assert row["email"] == "formula@tests.suyay.pe"
+
+    # NDJSON is data, not a spreadsheet: values are exported as stored
+    response = client.get("/export/contact", headers=admin_headers, params={"format": "ndjson"})
+    item = next(item for item in map(json.loads, response.text.splitlines()) if item["id"] == contact_id)
+    assert [item[field] for field in fields] == [FORMULAS[0], FORMULAS[1], FORMULAS[2], FORMULAS[3], FORMULAS[4] + FORMULAS[5]]
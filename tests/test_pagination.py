@@ -0,0 +1,36 @@
+"""
+Keyset pagination over sort keys shared by several rows
+"""
+from datetime import timedelta
+from sqlalchemy import insert, select
+from app import models
+from app.database import SessionLocal
+from app.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+def _contact(index: int, **values) -> dict:
+    return {
+        "first_names": "Tie", "last_names": str(index), "email": f"tie{index}@tests.suyay.pe",
+        "subject": "Tie", "message": "Same second", **values,
+    }
+
+def test_cursor_keeps_rows_tied_on_the_timestamp(client, admin_headers):
+    db = SessionLocal()
+    try:
+        # One statement: every row gets the same server-default timestamp, stored without a fraction
+        ids = db.scalars(insert(models.ContactUs).values([_contact(index) for index in range(5)]).returning(models.ContactUs.id)).all()
+        created_at = db.scalar(select(models.ContactUs.created_at).where(models.ContactUs.id == ids[0]))
+        # The same instant bound from Python is stored with a '.000000' fraction
+        ids += db.scalars(insert(models.ContactUs).returning(models.ContactUs.id), [_contact(index, created_at=created_at) for index in (5, 6)]).all()
+        db.commit()
+    finally:
+        db.close()
+
+    seen, cursor = [], encode_cursor([created_at - timedelta(seconds=1), 0])
+    for _ in range(len(ids)):
+        if not cursor:
+            break
+        response = client.get("/contact/", headers=admin_headers, params={"limit": 2, "cursor": cursor})
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    assert [contact_id for contact_id in seen if contact_id in ids] == sorted(ids)
@@ -0,0 +1,53 @@
+"""
+Legacy purchase line endpoint: prices and revenue come from the ticket type
+"""
+from decimal import Decimal
+from sqlalchemy import select
+from app import models
+from app.database import SessionLocal
+import generate_data
+from tests.conftest import auth_headers
+
+def _event_ticket_types():
+    """Two ticket types of different events with stock left, and a buyer's id and email"""
+    db = SessionLocal()
+    try:
+        in_stock = select(models.TicketType).where(models.TicketType.capacity - models.TicketType.sold >= 10).order_by(models.TicketType.id)
+        ticket_type = db.scalars(in_stock).first()
+        other_ticket_type = db.scalars(in_stock.where(models.TicketType.event_id != ticket_type.event_id)).first()
+        email = generate_data.user_email("buyer", 1)
+        user_id = db.scalar(select(models.User.id).where(models.User.email == email))
+        return ticket_type, other_ticket_type, user_id, email
+    finally:
+        db.close()
+
+def _revenue(event_id: int) -> Decimal:
+    db = SessionLocal()
+    try:
+        return db.get(models.EventSalesStats, event_id).revenue
+    finally:
+        db.close()
+
+def test_purchase_line_is_priced_on_the_server(client, dataset):
+    ticket_type, other_ticket_type, user_id, email = _event_ticket_types()
+    headers = auth_headers(email)
+    purchase = client.post("/purchases/", headers=headers, json={
+        "event_id": ticket_type.event_id, "user_id": user_id, "total_amount": "0.01",
+    }).json()
+    revenue_before = _revenue(ticket_type.event_id)
+
+    response = client.post("/purchase-details/", headers=headers, json={
+        "purchase_id": purchase["id"], "ticket_type_id": ticket_type.id, "quantity": 2,
+        "unit_price": "0.01", "subtotal": "0.01",
+    })
+    assert response.status_code == 200
+    line = response.json()
+    assert Decimal(line["unit_price"]) == ticket_type.price
+    assert Decimal(line["subtotal"]) == ticket_type.price * 2
+    assert _revenue(ticket_type.event_id) == revenue_before + ticket_type.price * 2
+
+    # A ticket type of another event cannot be added to the purchase
+    response = client.post("/purchase-details/", headers=headers, json={
+        "purchase_id": purchase["id"], "ticket_type_id": other_ticket_type.id, "quantity": 1,
+    })
+    assert response.status_code == 400
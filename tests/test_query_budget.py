@@ -0,0 +1,73 @@
+"""
+Query budgets of the list endpoints
+
+A page costs a fixed number of statements however many rows it returns and
+however many nested objects each row serializes; a lazy load per row (N+1)
+breaks the budget. The principal is resolved (and cached) by a first
+request, so the counted request only runs the endpoint's own queries.
+"""
+import pytest
+from sqlalchemy import func, select
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.query_budget import assert_max_queries
+
+# path -> statements per page; events also load their rating stats in one selectin query
+LIST_BUDGETS = {
+    "/events/": 2,
+    "/purchases/": 1,
+    "/tickets/": 1,
+    "/ratings/": 1,
+    "/reports/": 1,
+    "/claims/": 1,
+    "/contact/": 1,
+    "/users/": 1,
+    "/organizers/": 1,
+    "/verifiers/": 1,
+    "/event-verifiers/": 1,
+    "/ticket-types/": 1,
+}
+
+FAST_BUDGETS = {
+    "/events/": 1,
+    "/purchases/": 1,
+    "/tickets/": 1,
+}
+
+def _most_common(column):
+    """The value of `column` shared by the most rows, so the page has several"""
+    db = SessionLocal()
+    try:
+        return db.scalar(select(column).group_by(column).order_by(func.count().desc()).limit(1))
+    finally:
+        db.close()
+
+def _assert_budget(client, headers, url, max_queries):
+    client.get(url, headers=headers).raise_for_status()
+    with assert_max_queries(max_queries):
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) > 1
+
+@pytest.mark.parametrize("path", LIST_BUDGETS)
+def test_list_query_budget(client, admin_headers, path):
+    _assert_budget(client, admin_headers, f"{path}?limit=100", LIST_BUDGETS[path])
+
+@pytest.mark.parametrize("path", FAST_BUDGETS)
+def test_fast_list_query_budget(client, admin_headers, monkeypatch, path):
+    monkeypatch.setattr(settings, "fast_serialization", True)
+    _assert_budget(client, admin_headers, f"{path}?limit=100", FAST_BUDGETS[path])
+
+def test_favorites_query_budget(client, admin_headers):
+    user_id = _most_common(models.Favorite.user_id)
+    _assert_budget(client, admin_headers, f"/favorites/?user_id={user_id}", 1)
+
+def test_purchase_details_query_budget(client, admin_headers):
+    purchase_id = _most_common(models.PurchaseDetail.purchase_id)
+    # The purchase is loaded first for the permission check
+    _assert_budget(client, admin_headers, f"/purchase-details/?purchase_id={purchase_id}", 2)
+
+def test_budget_does_not_grow_with_page_size(client, admin_headers):
+    for limit in (5, 100):
+        _assert_budget(client, admin_headers, f"/events/?limit={limit}", LIST_BUDGETS["/events/"])
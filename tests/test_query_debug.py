@@ -0,0 +1,54 @@
+"""
+N+1 detection: the test-side query budget and the QUERY_DEBUG response headers
+"""
+import re
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models
+from app.database import SessionLocal, get_db
+from app.metrics import MetricsMiddleware, MetricsRegistry
+from app.query_budget import assert_max_queries, count_queries
+
+def _purchase_buyers(db: Session, limit: int = 10):
+    # Lazy-loads each purchase's user: one extra query per purchase
+    return [purchase.user.email for purchase in db.scalars(select(models.Purchase).limit(limit))]
+
+def test_assert_max_queries_reports_the_repeated_statement(dataset):
+    db = SessionLocal()
+    try:
+        with pytest.raises(AssertionError) as failure:
+            with assert_max_queries(2):
+                _purchase_buyers(db)
+    finally:
+        db.close()
+    message = str(failure.value)
+    assert message.startswith("Expected at most 2 queries, got ")
+    assert re.search(r"likely N\+1, run \d+ times: SELECT users\.id", message)
+
+def test_count_queries_counts_each_statement(dataset):
+    db = SessionLocal()
+    try:
+        with count_queries() as log:
+            buyers = _purchase_buyers(db, limit=5)
+    finally:
+        db.close()
+    # Users already in the session's identity map are not loaded again
+    assert log.count == 1 + len(set(buyers))
+    assert list(log.repeated().values()) == [len(set(buyers))]
+
+def test_query_debug_headers_flag_n_plus_one(dataset):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=MetricsRegistry(), query_debug=True)
+
+    @app.get("/buyers")
+    def buyers(db: Session = Depends(get_db)):
+        return _purchase_buyers(db)
+
+    response = TestClient(app).get("/buyers")
+    assert response.status_code == 200
+    assert int(response.headers["x-query-count"]) > 3
+    assert int(response.headers["x-n-plus-one"]) >= 3
+    assert float(response.headers["x-db-time-ms"]) >= 0
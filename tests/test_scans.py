@@ -0,0 +1,164 @@
+"""
+Offline scan uploads and the verifier manifest
+"""
+import struct
+from datetime import datetime
+from sqlalchemy import case, event, func, select
+from sqlalchemy.engine import Engine
+from app import checkin, crud, models
+from app.database import SessionLocal
+from tests.conftest import auth_headers
+
+def _gate(min_tickets: int = 6):
+    """An event with at least `min_tickets` active tickets and one of its verifiers.
+
+    Returns (event_id, verifier_id, verifier headers, active QR codes), each
+    call on a different event so tests do not see each other's scans.
+    """
+    db = SessionLocal()
+    try:
+        # Events whose tickets are all still active: no other test has scanned there
+        event_id = db.scalars(
+            select(models.Purchase.event_id)
+            .join(models.Ticket, models.Ticket.purchase_id == models.Purchase.id)
+            .group_by(models.Purchase.event_id)
+            .having(
+                func.count(models.Ticket.id) >= min_tickets,
+                func.sum(case((models.Ticket.status == "active", 0), else_=1)) == 0,
+            )
+            .order_by(models.Purchase.event_id)
+        ).first()
+        verifier_id, email = db.execute(
+            select(models.Verifier.id, models.User.email)
+            .join(models.EventVerifier, models.EventVerifier.verifier_id == models.Verifier.id)
+            .join(models.User, models.User.id == models.Verifier.user_id)
+            .where(models.EventVerifier.event_id == event_id)
+        ).first()
+        qr_codes = db.scalars(
+            select(models.Ticket.qr_code)
+            .join(models.Purchase, models.Ticket.purchase_id == models.Purchase.id)
+            .where(models.Purchase.event_id == event_id, models.Ticket.status == "active")
+            .order_by(models.Ticket.id)
+        ).all()
+        return event_id, verifier_id, auth_headers(email), qr_codes
+    finally:
+        db.close()
+
+def test_batch_accepts_mixed_timezone_timestamps(client, dataset):
+    event_id, _, headers, qr_codes = _gate()
+    first, second = qr_codes[:2]
+    response = client.post("/tickets/scan/batch", headers=headers, json={
+        "event_id": event_id, "device_id": "gate-tz",
+        "scans": [
+            # The same ticket at two gates: 09:30 naive UTC beats 10:00Z
+            {"qr_code": first, "scanned_at": "2026-01-15T10:00:00Z"},
+            {"qr_code": first, "scanned_at": "2026-01-15T09:30:00"},
+            {"qr_code": second, "scanned_at": "2026-01-15T04:45:00-05:00"},
+        ],
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accepted"] == 2
+    assert body["double_scans"] == 1
+    by_time = {item["used_at"]: item["result"] for item in body["results"] if item["qr_code"] == second}
+    assert by_time == {"2026-01-15T09:45:00": "accepted"}
+    first_results = [item for item in body["results"] if item["qr_code"] == first]
+    assert [item["result"] for item in first_results] == ["accepted", "already_used"]
+    assert all(item["used_at"] == "2026-01-15T09:30:00" for item in first_results)
+
+def _tickets_scanned(event_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.get(models.EventSalesStats, event_id).tickets_scanned
+    finally:
+        db.close()
+
+def test_batch_scan_lost_to_a_concurrent_scan_is_already_used(client, dataset):
+    event_id, verifier_id, headers, qr_codes = _gate()
+    raced, *others = qr_codes[:3]
+    scanned_before = _tickets_scanned(event_id)
+    raced_once = []
+
+    def concurrent_scan(conn, cursor, statement, parameters, context, executemany):
+        # Another gate marks one ticket used between the batch's read and its UPDATE
+        if executemany and statement.startswith("UPDATE tickets") and not raced_once:
+            raced_once.append(True)
+            cursor.execute(
+                "UPDATE tickets SET status = 'used', used_at = '2026-01-15 09:00:00.000000', verifier_id = ? WHERE qr_code = ?",
+                (verifier_id + 1, raced),
+            )
+
+    event.listen(Engine, "before_cursor_execute", concurrent_scan)
+    try:
+        response = client.post("/tickets/scan/batch", headers=headers, json={
+            "event_id": event_id, "device_id": "gate-race",
+            "scans": [{"qr_code": qr_code, "scanned_at": "2026-01-15T09:10:00"} for qr_code in (raced, *others)],
+        })
+    finally:
+        event.remove(Engine, "before_cursor_execute", concurrent_scan)
+
+    assert response.status_code == 200
+    body = response.json()
+    results = {item["qr_code"]: item for item in body["results"]}
+    assert results[raced]["result"] == "already_used"
+    assert results[raced]["verifier_id"] == verifier_id + 1
+    assert results[raced]["used_at"] == "2026-01-15T09:00:00"
+    assert all(results[qr_code]["result"] == "accepted" for qr_code in others)
+    assert body["accepted"] == len(others)
+    assert body["double_scans"] == 1
+    assert _tickets_scanned(event_id) == scanned_before + len(others)
+
+def _manifest(client, headers, event_id, **params):
+    response = client.get(f"/events/{event_id}/manifest", headers=headers, params=params)
+    assert response.status_code == 200
+    added, removed = int(response.headers["x-manifest-count"]), int(response.headers["x-manifest-removed-count"])
+    codes = [str(code) for code in struct.unpack(f"<{added + removed}Q", response.content)]
+    return response.headers, codes[:added], codes[added:]
+
+def test_delta_manifest_removes_used_and_invalidated_tickets(client, admin_headers):
+    event_id, _, headers, qr_codes = _gate()
+    synced, added, removed = _manifest(client, headers, event_id)
+    assert sorted(added) == sorted(qr_codes)
+    assert removed == []
+
+    scanned, invalidated = qr_codes[:2]
+    assert client.post("/tickets/scan", headers=headers, json={"qr_code": scanned, "event_id": event_id}).json()["result"] == "accepted"
+    ticket = client.get(f"/tickets/qr/{invalidated}", headers=headers).json()
+    assert client.patch(f"/tickets/{ticket['id']}", headers=admin_headers, json={"status": "invalid"}).status_code == 200
+
+    _, added, removed = _manifest(
+        client, headers, event_id,
+        since_id=synced["x-manifest-max-id"], changed_since=synced["x-manifest-synced-at"],
+    )
+    assert added == []
+    assert sorted(removed) == sorted([scanned, invalidated])
+
+    # Without changed_since the delta only carries newly issued tickets
+    _, added, removed = _manifest(client, headers, event_id, since_id=synced["x-manifest-max-id"])
+    assert added == removed == []
+
+def test_online_scans_land_in_the_same_minute_live_and_rebuilt(client, dataset):
+    event_id, verifier_id, headers, qr_codes = _gate()
+    before = datetime.utcnow()
+    assert client.post("/tickets/scan", headers=headers, json={"qr_code": qr_codes[0], "event_id": event_id}).json()["result"] == "accepted"
+    after = datetime.utcnow()
+    live, _ = checkin.monitor.snapshot(event_id)
+
+    db = SessionLocal()
+    try:
+        used_at = db.scalar(select(models.Ticket.used_at).where(models.Ticket.qr_code == qr_codes[0]))
+        crud.rebuild_checkin_minutes(db)
+        rebuilt = {
+            (row.verifier_id, int(checkin.epoch_seconds(row.minute) // 60)): row.entries
+            for row in db.scalars(select(models.CheckInMinute).where(models.CheckInMinute.event_id == event_id))
+        }
+    finally:
+        db.close()
+    # Stored in naive UTC, like the offline scans and the monitor's clock
+    assert before <= used_at <= after
+    minute = int(checkin.epoch_seconds(used_at) // 60)
+    assert rebuilt == {(verifier_id, minute): 1}
+    # The monitor stamps the entry a moment after the UPDATE, possibly past a minute boundary
+    [((live_verifier_id, live_minute), entries)] = live.items()
+    assert (live_verifier_id, entries) == (verifier_id, 1)
+    assert live_minute - minute in (0, 1)
@@ -0,0 +1,120 @@
+"""
+The in-process search index against a brute-force BM25 ranking
+"""
+import math
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select
+from app import models, search
+from app.database import SessionLocal
+
+WORDS = [f"w{rank}" for rank in range(40)]
+
+def _rows(count: int, seed: int = 3, first_id: int = 1):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        (
+            event_id,
+            " ".join(rng.choices(WORDS, weights=[1 / (rank + 1) for rank in range(len(WORDS))], k=rng.randint(2, 6))),
+            " ".join(rng.choices(WORDS, k=rng.randint(0, 12))),
+            None,
+            rng.randint(1, 4), rng.randint(1, 6), now + timedelta(days=rng.randint(-60, 60)),
+        )
+        for event_id in range(first_id, first_id + count)
+    ]
+
+def _expected(rows, query, reference_length, category_id=None, district_id=None, date=None, skip=0, limit=20):
+    """(total, [(event_id, score)], facets) by scoring every event"""
+    docs = {row[0]: (Counter(search.tokenize(row[1]) + search.tokenize(row[2]) + search.tokenize(row[3])), row) for row in rows}
+    bounds = search.date_bucket_bounds()
+    hits, facets = [], {"categories": Counter(), "districts": Counter(), "dates": Counter()}
+    for event_id, (terms, row) in docs.items():
+        score = 0.0
+        for term in set(search.tokenize(query)):
+            if terms[term]:
+                frequency = sum(1 for other, _ in docs.values() if other[term])
+                idf = math.log(1 + (len(docs) - frequency + 0.5) / (frequency + 0.5))
+                norm = search.K1 * (1 - search.B + search.B * sum(terms.values()) / reference_length)
+                score += idf * terms[term] * (search.K1 + 1) / (terms[term] + norm)
+        bucket = search.date_bucket(row[6], bounds)
+        if not score or (category_id and row[4] != category_id) or (district_id and row[5] != district_id) or (date and bucket != date):
+            continue
+        facets["categories"][row[4]] += 1
+        facets["districts"][row[5]] += 1
+        facets["dates"][bucket] += 1
+        hits.append((score, -event_id))
+    top = sorted(hits, reverse=True)[skip:skip + limit]
+    return len(hits), [(-event_id, score) for score, event_id in top], facets
+
+QUERIES = [
+    {"query": "w0"},
+    {"query": "w0 w1"},
+    {"query": "w3 w17 w39"},
+    {"query": "w0 w2", "category_id": 2},
+    {"query": "w1", "district_id": 3, "skip": 5, "limit": 7},
+    {"query": "w0 w5", "date": "past"},
+    {"query": "w0", "skip": 300, "limit": 20},
+    {"query": "nothing"},
+]
+
+def _assert_matches(index, rows, params):
+    total, ranked, facets = index.search(**params)
+    expected_total, expected_ranked, expected_facets = _expected(rows, reference_length=index._snapshot.reference_length, **params)
+    assert total == expected_total
+    assert [event_id for event_id, _ in ranked] == [event_id for event_id, _ in expected_ranked]
+    assert [score for _, score in ranked] == pytest.approx([score for _, score in expected_ranked])
+    assert facets == expected_facets
+
+@pytest.mark.parametrize("exhaustive_matches", [0, search.EXHAUSTIVE_MATCHES])
+@pytest.mark.parametrize("params", QUERIES)
+def test_search_ranks_like_brute_force(monkeypatch, exhaustive_matches, params):
+    # 0 sends every query through the early-terminating threshold walk
+    monkeypatch.setattr(search, "EXHAUSTIVE_MATCHES", exhaustive_matches)
+    rows = _rows(400)
+    index = search.EventSearchIndex()
+    index.load(rows)
+    _assert_matches(index, rows, params)
+
+def test_writes_publish_a_new_snapshot(monkeypatch):
+    monkeypatch.setattr(search, "EXHAUSTIVE_MATCHES", 0)
+    rows = _rows(400)
+    index = search.EventSearchIndex()
+    index.load(rows)
+    before = index._snapshot
+    before_results = before.search("w0 w1", None, None, None, 0, 50)
+
+    class Event:
+        def __init__(self, row):
+            self.id, self.title, self.description, self.location_description, self.category_id, self.district_id, self.start_date = row
+
+    changed = [(7, "w39 w39 w0", "", "w1", 1, 1, datetime.utcnow())] + _rows(5, seed=11, first_id=401)
+    for row in changed:
+        index.add(Event(row))
+    index.remove(12)
+    rows = [row for row in rows if row[0] not in (7, 12)] + changed
+
+    # Searches holding the previous snapshot keep seeing the index as it was
+    assert before.search("w0 w1", None, None, None, 0, 50) == before_results
+    for params in QUERIES:
+        _assert_matches(index, rows, params)
+    # Impact orders patched by the writes match ones sorted from scratch
+    snapshot = index._snapshot
+    assert {"w0", "w1"} <= set(snapshot.ranked)
+    for term, ranked in list(snapshot.ranked.items()):
+        del snapshot.ranked[term]
+        assert snapshot._ranked(term) == ranked
+
+def test_search_endpoint_uses_the_index(client, dataset):
+    db = SessionLocal()
+    try:
+        title = db.scalar(select(models.Event.title).order_by(models.Event.id).limit(1))
+    finally:
+        db.close()
+    response = client.get("/events/search", params={"q": title, "limit": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] > 0
+    assert sum(body["facets"]["categories"].values()) == body["total"]
@@ -0,0 +1,27 @@
+"""
+Rebuilding the denormalized statistics from their source tables
+"""
+from sqlalchemy import func, select
+from app import crud, models
+from app.database import SessionLocal
+
+def test_rebuild_checkin_minutes_counts_every_used_ticket(dataset):
+    db = SessionLocal()
+    try:
+        crud.rebuild_checkin_minutes(db)
+        by_event = dict(db.execute(
+            select(models.CheckInMinute.event_id, func.sum(models.CheckInMinute.entries))
+            .group_by(models.CheckInMinute.event_id)
+        ).all())
+        used = dict(db.execute(
+            select(models.Purchase.event_id, func.count(models.Ticket.id))
+            .join(models.Ticket, models.Ticket.purchase_id == models.Purchase.id)
+            .where(models.Ticket.status == "used", models.Ticket.used_at.isnot(None), models.Ticket.verifier_id.isnot(None))
+            .group_by(models.Purchase.event_id)
+        ).all())
+        minutes = db.scalars(select(models.CheckInMinute.minute)).all()
+    finally:
+        db.close()
+    assert used
+    assert by_event == used
+    assert all(minute.second == 0 and minute.microsecond == 0 for minute in minutes)
@@ -0,0 +1,144 @@
+"""
+Ticket issuance, capped by the quantity bought, and status changes through PATCH
+"""
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, select
+from app import checkin, crud, models
+from app.database import SessionLocal
+import generate_data
+from tests.conftest import auth_headers
+
+def _unissued_purchase(quantity: int):
+    """A purchase with one line of `quantity` tickets and no tickets issued; returns (purchase_id, buyer_email)"""
+    db = SessionLocal()
+    try:
+        ticket_type = db.scalars(select(models.TicketType).order_by(models.TicketType.id).limit(1)).first()
+        buyer_email = generate_data.user_email("buyer", 0)
+        db_purchase = models.Purchase(
+            event_id=ticket_type.event_id,
+            user_id=db.scalar(select(models.User.id).where(models.User.email == buyer_email)),
+            total_amount=ticket_type.price * quantity,
+        )
+        db.add(db_purchase)
+        db.flush()
+        db.add(models.PurchaseDetail(
+            purchase_id=db_purchase.id, ticket_type_id=ticket_type.id, quantity=quantity,
+            unit_price=ticket_type.price, subtotal=ticket_type.price * quantity,
+        ))
+        db.commit()
+        return db_purchase.id, buyer_email
+    finally:
+        db.close()
+
+def _issued(purchase_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.count(models.Ticket.id)).where(models.Ticket.purchase_id == purchase_id))
+    finally:
+        db.close()
+
+def test_buyer_cannot_bulk_issue(client, dataset):
+    purchase_id, buyer_email = _unissued_purchase(3)
+    response = client.post("/tickets/bulk", headers=auth_headers(buyer_email), json={"purchase_id": purchase_id, "quantity": 500})
+    assert response.status_code == 403
+    assert _issued(purchase_id) == 0
+
+def test_bulk_issue_is_capped_by_quantity_bought(client, admin_headers):
+    purchase_id, _ = _unissued_purchase(3)
+
+    response = client.post("/tickets/bulk", headers=admin_headers, json={"purchase_id": purchase_id, "quantity": 500})
+    assert response.status_code == 400
+    assert _issued(purchase_id) == 0
+
+    response = client.post("/tickets/bulk", headers=admin_headers, json={"purchase_id": purchase_id, "quantity": 2})
+    assert response.status_code == 200
+    assert response.json()["quantity"] == 2
+
+    # Existing tickets count against the cap
+    response = client.post("/tickets/bulk", headers=admin_headers, json={"purchase_id": purchase_id, "quantity": 2})
+    assert response.status_code == 400
+    response = client.post("/tickets/bulk", headers=admin_headers, json={"purchase_id": purchase_id, "quantity": 1})
+    assert response.status_code == 200
+    assert _issued(purchase_id) == 3
+
+def test_single_issue_is_capped_by_quantity_bought(client, dataset):
+    purchase_id, buyer_email = _unissued_purchase(1)
+    headers = auth_headers(buyer_email)
+    assert client.post(f"/tickets/?purchase_id={purchase_id}", headers=headers).status_code == 200
+    assert client.post(f"/tickets/?purchase_id={purchase_id}", headers=headers).status_code == 400
+    assert _issued(purchase_id) == 1
+
+def test_organizer_bulk_issues_only_for_own_events(client, dataset):
+    purchase_id, _ = _unissued_purchase(2)
+    db = SessionLocal()
+    try:
+        event_organizer_id = db.scalar(
+            select(models.Event.organizer_id)
+            .join(models.Purchase, models.Purchase.event_id == models.Event.id)
+            .where(models.Purchase.id == purchase_id)
+        )
+        owner_email, other_email = (
+            db.scalar(select(models.User.email).join(models.Organizer, models.Organizer.user_id == models.User.id).where(condition))
+            for condition in (models.Organizer.id == event_organizer_id, models.Organizer.id != event_organizer_id)
+        )
+    finally:
+        db.close()
+
+    body = {"purchase_id": purchase_id, "quantity": 2}
+    assert client.post("/tickets/bulk", headers=auth_headers(other_email), json=body).status_code == 403
+    assert client.post("/tickets/bulk", headers=auth_headers(owner_email), json=body).status_code == 200
+    assert _issued(purchase_id) == 2
+
+def _event_with_active_ticket():
+    """(event_id, ticket_id) of an active ticket"""
+    db = SessionLocal()
+    try:
+        return db.execute(
+            select(models.Purchase.event_id, models.Ticket.id)
+            .join(models.Purchase, models.Ticket.purchase_id == models.Purchase.id)
+            .where(models.Ticket.status == "active")
+            .order_by(models.Ticket.id.desc())
+        ).first()
+    finally:
+        db.close()
+
+def _scanned_and_rebuilt(event_id: int):
+    """tickets_scanned as maintained by the write paths, then as recomputed from the tickets"""
+    db = SessionLocal()
+    try:
+        scanned = db.get(models.EventSalesStats, event_id).tickets_scanned
+        crud.rebuild_sales_stats(db, event_id)
+        return scanned, db.get(models.EventSalesStats, event_id).tickets_scanned
+    finally:
+        db.close()
+
+def test_patching_ticket_status_keeps_the_scan_count(client, admin_headers):
+    event_id, ticket_id = _event_with_active_ticket()
+    scanned, _ = _scanned_and_rebuilt(event_id)
+
+    assert client.patch(f"/tickets/{ticket_id}", headers=admin_headers, json={"status": "used"}).status_code == 200
+    assert _scanned_and_rebuilt(event_id) == (scanned + 1, scanned + 1)
+    # Other fields leave the count alone
+    assert client.patch(f"/tickets/{ticket_id}", headers=admin_headers, json={"status": "used", "used_at": "2026-01-15T10:00:00"}).status_code == 200
+    assert _scanned_and_rebuilt(event_id) == (scanned + 1, scanned + 1)
+    assert client.patch(f"/tickets/{ticket_id}", headers=admin_headers, json={"status": "active"}).status_code == 200
+    assert _scanned_and_rebuilt(event_id) == (scanned, scanned)
+
+def test_patching_a_ticket_to_used_counts_a_live_entry(client, admin_headers):
+    event_id, ticket_id = _event_with_active_ticket()
+    db = SessionLocal()
+    try:
+        verifier_id = db.scalar(select(models.EventVerifier.verifier_id).where(models.EventVerifier.event_id == event_id))
+    finally:
+        db.close()
+    used_at = datetime.utcnow().replace(microsecond=0)
+    before, _ = checkin.monitor.snapshot(event_id)
+
+    response = client.patch(f"/tickets/{ticket_id}", headers=admin_headers, json={
+        "status": "used", "verifier_id": verifier_id, "used_at": used_at.isoformat(),
+    })
+    assert response.status_code == 200
+    after, _ = checkin.monitor.snapshot(event_id)
+    minute = int(checkin.epoch_seconds(used_at) // 60)
+    assert after.get((verifier_id, minute), 0) == before.get((verifier_id, minute), 0) + 1